@@ -2,17 +2,41 @@
 """RSS Creator - 主程序入口"""
 
 import argparse
+import contextvars
 import logging
 import sys
+import threading
 import time
-from typing import Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Sequence
 
-import schedule
 import yaml
 
+from src.http_client import pooled_sessions
 from src.jobs import JobRunner
-from src.runtime import setup_logging
+from src.metrics import REGISTRY, metrics_options, start_metrics_server
+from src.precompress import precompress_feeds, precompress_options
+from src.run_report import REPORT_FILENAME, RunReport
+from src.runtime import ConfigWatcher, setup_logging
+from src.scheduler import (
+    DEFAULT_MAX_WORKERS,
+    SCHEDULE_STATE_FILENAME,
+    AdaptiveIntervals,
+    JobPlan,
+    Scheduler,
+    build_plans,
+    item_fingerprint,
+)
+from src.sharding import Shard, export_shard, merge_manifests, snapshot_files, write_manifest
 from src.site_index import generate_site_index
+from src.tracing import Tracer, tracing_scope
+from src.work_queue import DEFAULT_POLL_INTERVAL, Worker, open_work_queue
+
+# 常驻模式下检查配置文件变化的间隔（秒），可用 update.reload_interval 覆盖。
+DEFAULT_RELOAD_INTERVAL = 5.0
+# 启动时读取一次的 update 设置，热更新不生效。
+RESTART_ONLY_SETTINGS = ("max_workers", "job_deadline", "reload_interval")
 
 
 def load_config(config_path: str = "config.yaml") -> dict:
@@ -21,7 +45,7 @@ def load_config(config_path: str = "config.yaml") -> dict:
         return yaml.safe_load(file) or {}
 
 
-def _run_jobs(config: dict, feeds_dir: str) -> dict[str, bool]:
+def _run_jobs(config: dict, feeds_dir: str, state_dir: str | None = None) -> dict[str, bool]:
     jobs_config = config.get("jobs", [])
     if not jobs_config:
         return {}
@@ -32,18 +56,93 @@ def _run_jobs(config: dict, feeds_dir: str) -> dict[str, bool]:
         return {}
 
     logging.info(f"开始执行 {len(enabled_jobs)} 个 jobs")
-    runner = JobRunner(feeds_dir=feeds_dir)
-    return runner.run_jobs(enabled_jobs)
+    runner = JobRunner(feeds_dir=feeds_dir, state_dir=state_dir, job_deadline=_job_deadline(config))
+    results = runner.run_jobs(enabled_jobs)
+    _write_run_report(runner.last_report, state_dir)
+    return results
 
 
-def run_once(config: dict, feeds_dir: str) -> bool:
-    """运行一次 RSS 生成"""
-    results = _run_jobs(config, feeds_dir)
+def _write_run_report(report: RunReport, state_dir: str | None, *, log_slowest: bool = True):
+    """输出最慢的 job，并把计时报告写入 ``<state_dir>/run-report.json``。"""
+    if log_slowest:
+        report.log_slowest()
+    if not state_dir:
+        return
+    try:
+        path = report.write(Path(state_dir) / REPORT_FILENAME)
+        logging.info(f"运行报告已写入: {path}")
+    except OSError as exc:
+        logging.error(f"写入运行报告失败: {exc}")
+
+
+def _job_deadline(config: dict) -> float | None:
+    deadline = (config.get("update") or {}).get("job_deadline")
+    return float(deadline) if deadline else None
+
+
+def _publish_site(config: dict, feeds_dir: str):
+    """生成部署首页并预压缩输出；失败只记录日志，不影响任务结果。"""
     try:
         generate_site_index(config, feeds_dir)
     except Exception as exc:
         logging.error(f"生成部署首页失败: {exc}")
 
+    # 预压缩放在首页之后，使 index.html 也有 .gz/.br 副本。
+    precompress = precompress_options(config)
+    if precompress is not None:
+        try:
+            precompress_feeds(feeds_dir, **precompress)
+        except Exception as exc:
+            logging.error(f"预压缩 feeds 失败: {exc}")
+
+
+@contextmanager
+def _metrics_export(config: dict) -> Iterator[None]:
+    """按顶层 ``metrics`` 配置在运行期间提供 ``/metrics``，结束时写入 textfile。"""
+    options = metrics_options(config) or {}
+    server = None
+    if options.get("port") is not None:
+        try:
+            server = start_metrics_server(options["port"], options["host"])
+        except OSError as exc:
+            logging.error(f"启动指标服务失败: {exc}")
+    try:
+        yield
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if options.get("textfile"):
+            try:
+                path = REGISTRY.write_textfile(options["textfile"])
+                logging.info(f"指标已写入: {path}")
+            except OSError as exc:
+                logging.error(f"写入指标文件失败: {exc}")
+
+
+@contextmanager
+def _trace_export(path: str | None) -> Iterator[None]:
+    """指定 ``--trace`` 时记录 tracing span，结束时写出 Chrome trace-event JSON。"""
+    if not path:
+        yield
+        return
+    tracer = Tracer()
+    try:
+        with tracing_scope(tracer):
+            yield
+    finally:
+        try:
+            tracer.write_chrome(path)
+            logging.info(f"trace 已写入: {path}（{len(tracer.spans)} 个 span，可用 chrome://tracing 或 Perfetto 打开）")
+        except OSError as exc:
+            logging.error(f"写入 trace 失败: {exc}")
+
+
+def run_once(config: dict, feeds_dir: str, state_dir: str | None = None) -> bool:
+    """运行一次 RSS 生成"""
+    results = _run_jobs(config, feeds_dir, state_dir)
+    _publish_site(config, feeds_dir)
+
     if not results:
         logging.warning("配置文件中没有定义任何可执行任务")
         return False
@@ -56,33 +155,268 @@ def run_once(config: dict, feeds_dir: str) -> bool:
     return True
 
 
-def run_scheduler(config: dict, feeds_dir: str) -> int:
-    """运行定时任务"""
+def run_shard(
+    config: dict,
+    feeds_dir: str,
+    state_dir: str | None,
+    shard: Shard,
+    output_dir: str | None = None,
+) -> bool:
+    """
+    只运行本分片负责的 job 并写入分片清单；首页与压缩副本在 merge 时统一生成
+
+    Args:
+        output_dir: 指定时把本分片写入的文件与清单复制到该目录，供上传后合并
+    """
+    jobs = shard.select(config.get("jobs") or [])
+    logging.info(f"分片 {shard.label}: 负责 {len(jobs)} 个 job")
+    before = snapshot_files(feeds_dir)
+    results: dict[str, bool] = {}
+    if jobs:
+        runner = JobRunner(feeds_dir=feeds_dir, state_dir=state_dir, job_deadline=_job_deadline(config))
+        results = runner.run_jobs(jobs)
+        _write_run_report(runner.last_report, state_dir)
+    manifest = write_manifest(feeds_dir, shard, results, before)
+    if output_dir:
+        copied = export_shard(feeds_dir, manifest, output_dir)
+        logging.info(f"分片 {shard.label}: 已复制 {copied} 个文件到 {output_dir}")
+
+    failed_tasks = [name for name, success in results.items() if not success]
+    if failed_tasks:
+        logging.error(f"以下任务失败: {', '.join(failed_tasks)}")
+        return False
+    return True
+
+
+def run_merge(config: dict, feeds_dir: str) -> int:
+    """合并各分片结果，统一生成首页与压缩副本。"""
+    report = merge_manifests(feeds_dir)
+    if report is None:
+        logging.error(f"{feeds_dir} 中没有分片清单，请先运行 --shard i/N")
+        return 2
+
+    for problem in report.problems:
+        logging.error(f"分片合并: {problem}")
+    if report.missing_shards:
+        logging.error(f"缺少分片: {', '.join(map(str, report.missing_shards))}")
+    _publish_site(config, feeds_dir)
+
+    failed_tasks = [name for name, success in report.results.items() if not success]
+    if failed_tasks:
+        logging.error(f"以下任务失败: {', '.join(failed_tasks)}")
+    logging.info(f"分片合并完成: {len(report.results) - len(failed_tasks)}/{len(report.results)} 个 job 成功")
+    return 0 if report.ok else 1
+
+
+def _describe_plan(plan: JobPlan) -> str:
+    if plan.adaptive:
+        cadence = f"自适应 {plan.adaptive.min_interval:g}~{plan.adaptive.max_interval:g} 秒"
+    elif plan.cron:
+        cadence = f"cron {plan.cron.text}"
+    else:
+        cadence = f"每 {plan.interval:g} 秒"
+    extras = (f"，偏移 {plan.offset:.0f} 秒" if plan.offset else "") + (f"，抖动 {plan.jitter:g} 秒" if plan.jitter else "")
+    return f"{cadence}{extras}"
+
+
+def _reload_plans(scheduler: Scheduler, watcher: ConfigWatcher, current: dict):
+    """配置文件变化时按 job 名称增量更新调度计划；新配置有误时沿用旧配置。"""
+    config = watcher.poll()
+    if config is None:
+        return
+    try:
+        plans = build_plans(config)
+    except ValueError as exc:
+        logging.error(f"新配置调度错误，继续使用旧配置: {exc}")
+        return
+
+    previous_update = current["config"].get("update") or {}
+    update_config = config.get("update") or {}
+    for key in RESTART_ONLY_SETTINGS:
+        if previous_update.get(key) != update_config.get(key):
+            logging.warning(f"update.{key} 的修改需重启后生效，当前仍使用启动时的设置")
+
+    current["config"] = config
+    added, removed, changed = scheduler.update_plans(plans)
+    by_name = {plan.name: plan for plan in plans}
+    for name in added:
+        logging.info(f"新增调度 {name}: {_describe_plan(by_name[name])}")
+    for name in changed:
+        logging.info(f"更新调度 {name}: {_describe_plan(by_name[name])}")
+    for name in removed:
+        logging.info(f"移除调度 {name}")
+    logging.info(f"配置已重新加载：新增 {len(added)}、更新 {len(changed)}、移除 {len(removed)} 个 job")
+
+
+def run_scheduler(
+    config: dict,
+    feeds_dir: str,
+    state_dir: str | None = None,
+    *,
+    config_path: str | None = None,
+) -> int:
+    """
+    运行定时任务：每个 job 按各自的 interval / cron 调度
+
+    进程内复用 HTTP 会话（连接池）；传入 ``config_path`` 时为常驻模式，
+    配置文件变化后按 job 名称热更新调度，未变化的 job 保留排期与状态。
+    """
+    try:
+        plans = build_plans(config)
+    except ValueError as exc:
+        logging.error(f"调度配置错误: {exc}")
+        return 2
+    if not plans and config_path is None:
+        logging.warning("配置文件中没有定义任何可执行任务")
+        return 1
+
+    runner = JobRunner(feeds_dir=feeds_dir, state_dir=state_dir, job_deadline=_job_deadline(config))
+    publish_lock = threading.Lock()
+    current = {"config": config}
+    # 常驻期间的报告保留每个 job 最近一次运行，每次运行后覆盖写入。
+    report = RunReport(started_at=time.time())
+
+    def run_job(job_config: dict) -> str | None:
+        results = runner.run_jobs([job_config], report=report)
+        # 多个 job 可能同时完成，首页、压缩副本与运行报告串行重建。
+        with publish_lock:
+            _publish_site(current["config"], feeds_dir)
+            _write_run_report(report, state_dir, log_slowest=False)
+        if not results or not all(results.values()):
+            return None
+        # 自适应间隔依据输出条目集合是否变化来调整抓取频率。
+        return item_fingerprint(feeds_dir, job_config)
+
     update_config = config.get("update", {})
-    interval = update_config.get("interval", 3600)
+    adaptive = AdaptiveIntervals(Path(state_dir) / SCHEDULE_STATE_FILENAME if state_dir else None)
+    scheduler = Scheduler(
+        plans,
+        run_job,
+        max_workers=update_config.get("max_workers", DEFAULT_MAX_WORKERS),
+        adaptive=adaptive,
+    )
+    for plan in plans:
+        logging.info(f"调度 {plan.name}: {_describe_plan(plan)}")
+
+    watcher = ConfigWatcher(config_path, load_config) if config_path else None
+    reload_interval = float(update_config.get("reload_interval", DEFAULT_RELOAD_INTERVAL))
+
+    with pooled_sessions() as session_pool:
+        # 在当前上下文中运行调度线程，使会话池对所有 job 可见。
+        thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(scheduler.run_forever,),
+            name="scheduler",
+            daemon=True,
+        )
+        logging.info(f"定时任务已启动，共 {len(plans)} 个 job" + ("，监听配置文件变化" if watcher else ""))
+        thread.start()
+        try:
+            while thread.is_alive():
+                thread.join(reload_interval)
+                if watcher is not None:
+                    _reload_plans(scheduler, watcher, current)
+        except KeyboardInterrupt:
+            scheduler.stop()
+            logging.info("定时任务已停止")
+        thread.join()
+        if session_pool.hits:
+            logging.info(f"HTTP 会话复用 {session_pool.hits} 次")
+    report.log_slowest()
+    return 0
+
+
+def run_worker(config: dict, feeds_dir: str, state_dir: str | None = None, *, drain: bool = False) -> int:
+    """从工作队列租用并执行 job；可同时启动任意多个 worker 扩容。"""
+    try:
+        queue = open_work_queue(config, state_dir)
+    except (ValueError, RuntimeError) as exc:
+        logging.error(f"打开工作队列失败: {exc}")
+        return 2
+
+    runner = JobRunner(feeds_dir=feeds_dir, state_dir=state_dir, job_deadline=_job_deadline(config))
+    report = RunReport(started_at=time.time())
+
+    def run_job(job_config: dict) -> tuple[bool, str]:
+        results = runner.run_jobs([job_config], report=report)
+        _write_run_report(report, state_dir, log_slowest=False)
+        failed_tasks = [name for name, success in results.items() if not success]
+        if not results:
+            return False, "job 未执行"
+        return not failed_tasks, f"失败: {', '.join(failed_tasks)}" if failed_tasks else ""
+
+    queue_config = config.get("queue") or {}
+    worker = Worker(queue, run_job, poll_interval=queue_config.get("poll_interval", DEFAULT_POLL_INTERVAL))
+    logging.info(f"worker {worker.worker_id} 已启动" + ("，队列为空时退出" if drain else ""))
+    with pooled_sessions():
+        try:
+            worker.run(drain=drain)
+        except KeyboardInterrupt:
+            worker.stop()
+            logging.info("worker 已停止")
+    queue.close()
+    report.log_slowest()
+    return 0
+
 
-    logging.info(f"定时任务已启动，每 {interval} 秒更新一次")
+def run_coordinator(config: dict, feeds_dir: str, state_dir: str | None = None) -> int:
+    """按调度计划把到期 job 放入工作队列，并在 worker 报告结果后生成首页。"""
+    try:
+        plans = build_plans(config)
+        queue = open_work_queue(config, state_dir)
+    except (ValueError, RuntimeError) as exc:
+        logging.error(f"调度配置错误: {exc}")
+        return 2
+    if not plans:
+        logging.warning("配置文件中没有定义任何可执行任务")
+        return 1
 
-    # 立即执行一次
-    if not run_once(config, feeds_dir):
-        logging.error("首次执行存在失败，调度器将继续运行并在下次重试")
+    def enqueue(job_config: dict) -> str | None:
+        name = str(job_config.get("name") or job_config.get("type") or "未命名")
+        if queue.enqueue(name, job_config):
+            logging.info(f"入队: {name}")
+        else:
+            logging.info(f"{name}: 上一次任务尚未完成，跳过入队")
+        # 入队时的输出反映上一次执行结果，自适应间隔据此调整（滞后一轮）。
+        return item_fingerprint(feeds_dir, job_config)
 
-    # 设置定时任务
-    schedule.every(interval).seconds.do(run_once, config, feeds_dir)
+    adaptive = AdaptiveIntervals(Path(state_dir) / SCHEDULE_STATE_FILENAME if state_dir else None)
+    scheduler = Scheduler(plans, enqueue, max_workers=1, adaptive=adaptive)
+    for plan in plans:
+        logging.info(f"调度 {plan.name}: {_describe_plan(plan)}")
 
-    # 运行循环
+    poll_interval = float((config.get("queue") or {}).get("poll_interval", DEFAULT_POLL_INTERVAL))
+    thread = threading.Thread(target=scheduler.run_forever, name="coordinator", daemon=True)
+    logging.info(f"协调器已启动，共 {len(plans)} 个 job")
+    thread.start()
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
+        while thread.is_alive():
+            thread.join(poll_interval)
+            results = queue.drain_results()
+            for result in results:
+                status = "成功" if result.success else f"失败（{result.details}）"
+                logging.info(f"{result.name}: {status}，worker {result.worker}，第 {result.attempts} 次")
+            if results:
+                _publish_site(config, feeds_dir)
     except KeyboardInterrupt:
-        logging.info("定时任务已停止")
+        scheduler.stop()
+        logging.info("协调器已停止")
+    thread.join()
+    queue.close()
     return 0
 
 
 def main(argv: Sequence[str] | None = None) -> int:
     """主函数"""
     parser = argparse.ArgumentParser(description="RSS Creator - 为任何网站生成 RSS feed")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=("run", "merge", "worker", "coordinator"),
+        default="run",
+        help="run: 执行 jobs（默认）；merge: 合并各分片结果并生成首页；"
+             "coordinator: 把到期 job 放入工作队列；worker: 从队列领取并执行 job"
+    )
     parser.add_argument(
         "-c", "--config",
         default="config.yaml",
@@ -93,11 +427,41 @@ def main(argv: Sequence[str] | None = None) -> int:
         default="feeds",
         help="RSS 文件输出目录 (默认: feeds)"
     )
+    parser.add_argument(
+        "--state-dir",
+        default=".state",
+        help="跨运行状态目录，保存 ETag 等缓存 (默认: .state)"
+    )
     parser.add_argument(
         "-s", "--schedule",
         action="store_true",
         help="启用定时更新"
     )
+    parser.add_argument(
+        "-d", "--daemon",
+        action="store_true",
+        help="常驻模式：定时更新，并在配置文件变化时热加载"
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="i/N",
+        help="只运行第 i 个分片（共 N 个，按 job 名称哈希划分），结果由 merge 汇总"
+    )
+    parser.add_argument(
+        "--shard-output",
+        metavar="DIR",
+        help="分片模式下把本分片写入的文件与清单复制到 DIR，供上传后合并"
+    )
+    parser.add_argument(
+        "--drain",
+        action="store_true",
+        help="worker 在队列为空时退出"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="记录 run/job/fetch/parse/generate 耗时 span，结束时写出 Chrome trace-event JSON"
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -117,10 +481,29 @@ def main(argv: Sequence[str] | None = None) -> int:
         logging.error(f"配置文件格式错误: {exc}")
         return 2
 
-    if args.schedule or config.get("update", {}).get("enabled", False):
-        return run_scheduler(config, args.output)
+    if args.command == "merge":
+        return run_merge(config, args.output)
+    if args.command == "coordinator":
+        return run_coordinator(config, args.output, args.state_dir)
+    shard = None
+    if args.shard:
+        try:
+            shard = Shard.parse(args.shard)
+        except ValueError as exc:
+            logging.error(str(exc))
+            return 2
+
+    with _metrics_export(config), _trace_export(args.trace):
+        if args.command == "worker":
+            return run_worker(config, args.output, args.state_dir, drain=args.drain)
+        if shard is not None:
+            return 0 if run_shard(config, args.output, args.state_dir, shard, args.shard_output) else 1
+        if args.daemon:
+            return run_scheduler(config, args.output, args.state_dir, config_path=args.config)
+        if args.schedule or config.get("update", {}).get("enabled", False):
+            return run_scheduler(config, args.output, args.state_dir)
 
-    return 0 if run_once(config, args.output) else 1
+        return 0 if run_once(config, args.output, args.state_dir) else 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Benchmark Codex changelog extraction on a large synthetic changelog.
+
+Compares the in-place subtree walk used by ``extract_codex_changelog_items``
+with the previous copy-and-reparse implementation and checks that both
+produce identical items.
+
+Usage:
+    python scripts/bench/codex_changelog_extract.py --entries 2000 --repeat 3
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.jobs import codex_changelog  # noqa: E402
+
+PAGE_URL = "https://developers.openai.com/codex/changelog"
+
+
+def build_changelog(entries: int) -> str:
+    rows = []
+    for index in range(entries):
+        rows.append(
+            f"""
+      <li class="scroll-mt-28">
+        <div>
+          <time datetime="2026-03-{index % 28 + 1:02d}">2026-03-{index % 28 + 1:02d}</time>
+          <h3>
+            Codex CLI 0.{index}.0 <span>stable</span>
+            <button data-anchor-id="github-release-{index}" aria-label="Copy link"><svg><path d="M0 0"/></svg></button>
+          </h3>
+        </div>
+        <article>
+          <pre><code>$ npm install -g @openai/codex@0.{index}.0</code></pre>
+          <img src="/banner.png" alt="banner" />
+          <details>
+            <summary>View details</summary>
+            <h4>New Features</h4>
+            <ul>
+              <li>Feature {index}-a with <code>inline code</code> and <a href="https://github.com/openai/codex/pull/{index}">#{index}</a></li>
+              <li>Feature {index}-b<!-- hidden comment --></li>
+              <li>Feature {index}-b</li>
+            </ul>
+            <h4>Bug Fixes</h4>
+            <ul>{"".join(f"<li>Fix {index}.{fix}</li>" for fix in range(8))}</ul>
+            <script>window.__release = {index};</script>
+            <p><a href="https://github.com/openai/codex/releases/tag/rust-v0.{index}.0">Full release on Github</a></p>
+          </details>
+        </article>
+      </li>"""
+        )
+    return f"<html><body><main><section><ul>{''.join(rows)}</ul></section></main></body></html>"
+
+
+def legacy_heading_text(heading) -> str:
+    heading_copy = BeautifulSoup(str(heading), "lxml")
+    for button in heading_copy.select("button"):
+        button.decompose()
+    return re.sub(r"\s+", " ", heading_copy.get_text(" ", strip=True)).strip()
+
+
+def legacy_description(article) -> str:
+    article_copy = BeautifulSoup(str(article), "lxml")
+    for selector in ("button", "img", "pre", "script", "style", "svg"):
+        for element in article_copy.select(selector):
+            element.decompose()
+    for summary in article_copy.select("summary"):
+        summary.decompose()
+
+    lines: list[str] = []
+    for raw_line in article_copy.get_text("\n", strip=True).splitlines():
+        line = re.sub(r"\s+", " ", raw_line).strip()
+        if not line or line == "View details" or line == "Full release on Github":
+            continue
+        if lines and line == lines[-1]:
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def run_extract(html: str, entries: int):
+    return codex_changelog.extract_codex_changelog_items(html, PAGE_URL, max_items=entries)
+
+
+def run_legacy(html: str, entries: int):
+    with patch.object(codex_changelog, "_extract_heading_text", legacy_heading_text), patch.object(
+        codex_changelog, "_extract_description", legacy_description
+    ):
+        return run_extract(html, entries)
+
+
+def best_of(func, repeat: int) -> tuple[float, list]:
+    best = float("inf")
+    result: list = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2000, help="Number of synthetic release entries")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best is reported)")
+    args = parser.parse_args(argv)
+
+    html = build_changelog(args.entries)
+    legacy_time, legacy_items = best_of(lambda: run_legacy(html, args.entries), args.repeat)
+    walk_time, walk_items = best_of(lambda: run_extract(html, args.entries), args.repeat)
+
+    if walk_items != legacy_items:
+        print("输出不一致：新实现与旧实现解析结果不同", file=sys.stderr)
+        return 1
+
+    print(f"entries: {len(walk_items)} ({len(html) / 1024 / 1024:.1f} MiB HTML)")
+    print(f"copy + reparse: {legacy_time:.3f}s")
+    print(f"subtree walk:   {walk_time:.3f}s")
+    print(f"speedup:        {legacy_time / walk_time:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark shared date parsing against plain dateutil.
+
+The sample strings mirror what our sources emit: Codex changelog <time>
+values, GitHub/HuggingFace API timestamps, Atom <updated>, RSS pubDate,
+Waymo API dates, MiniMax meta tags and free-form listing dates. Every run
+checks that src.dates and dateutil agree on the parsed instant.
+
+Usage:
+    python scripts/bench/date_parsing.py --rounds 2000
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timezone
+from pathlib import Path
+
+from dateutil import parser as date_parser
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src import dates  # noqa: E402
+
+SAMPLES = [
+    "2026-03-08",                          # Codex changelog <time datetime>
+    "2026-03-08T12:00:00Z",                # GitHub releases Atom <updated>
+    "2026-01-15T08:41:27Z",                # GitHub API created_at
+    "2026-02-01T10:22:33.000Z",            # HuggingFace API createdAt
+    "2026-02-12T09:30:00+08:00",           # MiniMax article:published_time
+    "2025-12-03",                          # Waymo blog API date
+    "Fri, 14 Feb 2026 06:27:21 +0000",     # RSS pubDate / lastBuildDate
+    "Tue, 10 Mar 2026 17:00:00 GMT",       # OpenAI news RSS pubDate
+    "March 5, 2026",                       # DeepMind listing <time> text
+    "Jan 20, 2026",                        # Meta AI listing date text
+]
+
+
+def dateutil_reference(value: str):
+    dt = date_parser.parse(value)
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def timed(func, values, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for value in values:
+            func(value)
+    return time.perf_counter() - started
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000, help="Passes over the sample set")
+    args = parser.parse_args(argv)
+
+    for value in SAMPLES:
+        if dates.parse_datetime(value) != dateutil_reference(value):
+            print(f"解析结果不一致: {value!r}", file=sys.stderr)
+            return 1
+
+    total = args.rounds * len(SAMPLES)
+    baseline = timed(dateutil_reference, SAMPLES, args.rounds)
+    dates._parse_text.cache_clear()
+    uncached = timed(lambda value: dates._parse_text.__wrapped__(value, False, date.today()), SAMPLES, args.rounds)
+    dates._parse_text.cache_clear()
+    memoized = timed(dates.parse_datetime, SAMPLES, args.rounds)
+
+    print(f"parses: {total} ({len(SAMPLES)} distinct strings)")
+    print(f"dateutil:            {baseline:.3f}s ({baseline / total * 1e6:.1f} us/parse)")
+    print(f"fast path, no memo:  {uncached:.3f}s ({uncached / total * 1e6:.1f} us/parse)")
+    print(f"fast path + memo:    {memoized:.3f}s ({memoized / total * 1e6:.1f} us/parse)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
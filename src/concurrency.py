@@ -0,0 +1,92 @@
+"""Thread pool helpers and cooperative cancellation."""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """``ThreadPoolExecutor`` whose tasks run in a copy of the submitting thread's context.
+
+    Run-scoped state kept in context variables (e.g. request coalescing) then
+    follows the work a job hands to helper threads, while concurrently running
+    jobs keep separate scopes.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+class CancelToken:
+    """Cooperative cancellation flag with an optional deadline.
+
+    The deadline is measured on ``time.monotonic``. Nothing is interrupted
+    forcibly: the HTTP layer and crawl loops poll :attr:`cancelled`. A token
+    with a ``parent`` is also cancelled when the parent is, e.g. a job's
+    deadline token inside the scheduler's per-run token.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        parent: Optional["CancelToken"] = None,
+    ):
+        self._clock = clock
+        self._event = threading.Event()
+        self.parent = parent
+        self.deadline = clock() + float(timeout) if timeout is not None else None
+        self.reason = ""
+
+    def cancel(self, reason: str = "已取消"):
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.parent is not None and self.parent.cancelled:
+            self.reason = self.reason or self.parent.reason
+            return True
+        if self.deadline is not None and self._clock() >= self.deadline:
+            self.reason = self.reason or "超过截止时间"
+            return True
+        return False
+
+    def remaining(self) -> Optional[float]:
+        """距离截止时间（含上级 token 的截止时间）的秒数；都没有截止时间时返回 None。"""
+        inherited = self.parent.remaining() if self.parent is not None else None
+        if self.deadline is None:
+            return inherited
+        own = max(0.0, self.deadline - self._clock())
+        return own if inherited is None else min(own, inherited)
+
+
+_current_token: ContextVar[Optional[CancelToken]] = ContextVar("current_cancel_token", default=None)
+
+
+@contextmanager
+def cancellation_scope(token: CancelToken) -> Iterator[CancelToken]:
+    """Make ``token`` visible to code running in this context (and to ``ContextThreadPoolExecutor`` tasks)."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current_token.get()
+
+
+def cancelled() -> bool:
+    """当前 job 是否已被取消或超过截止时间。"""
+    token = _current_token.get()
+    return token is not None and token.cancelled
@@ -0,0 +1,74 @@
+"""Shared date normalisation with fast paths and memoisation.
+
+ISO-8601 and RFC-822 strings (the vast majority coming from our sources) are
+handled by the standard library; everything else falls back to
+``dateutil.parser``. Results are memoised, so a value parsed by a job and again
+by ``RSSGenerator`` is only parsed once per process. ``dateutil`` fills missing
+fields ("March 5", "Monday") from today's date, so the cache is keyed on the
+date as well and a long-running process never reuses yesterday's answer.
+"""
+
+import re
+from datetime import date, datetime, time, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional
+
+from dateutil import parser as date_parser
+
+RSS_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S %z"
+
+_ISO_PATTERN = re.compile(
+    r"^\d{4}-\d{2}-\d{2}"
+    r"(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,9})?)?(?:Z|[+-]\d{2}:?\d{2})?)?$"
+)
+# 仅接受数字时区或 GMT/UTC/UT/Z，其他缩写交给 dateutil，保持与原先一致的语义。
+_RFC822_PATTERN = re.compile(
+    r"^(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{4}\s+\d{2}:\d{2}(?::\d{2})?"
+    r"\s*(?:[+-]\d{4}|GMT|UTC|UT|Z)?$"
+)
+
+
+def parse_datetime(value: object, *, fuzzy: bool = False) -> Optional[datetime]:
+    """Parse ``value`` into a timezone-aware datetime (naive values are treated as UTC).
+
+    Returns None when the value cannot be parsed.
+    """
+    if isinstance(value, datetime):
+        return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    return _parse_text(text, fuzzy, date.today())
+
+
+@lru_cache(maxsize=8192)
+def _parse_text(text: str, fuzzy: bool, today: date) -> Optional[datetime]:
+    dt = _parse_fast(text)
+    if dt is None:
+        try:
+            dt = date_parser.parse(text, fuzzy=fuzzy, default=datetime.combine(today, time()))
+        except (ValueError, OverflowError, TypeError):
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _parse_fast(text: str) -> Optional[datetime]:
+    try:
+        if _ISO_PATTERN.match(text):
+            return datetime.fromisoformat(text)
+        if _RFC822_PATTERN.match(text):
+            return parsedate_to_datetime(text)
+    except (ValueError, TypeError, IndexError):
+        return None
+    return None
+
+
+def format_rss_date(value: object) -> Optional[str]:
+    """Format a parseable date as an RFC-822 string for RSS, or None."""
+    dt = parse_datetime(value)
+    return dt.strftime(RSS_DATE_FORMAT) if dt is not None else None
@@ -0,0 +1,204 @@
+"""Detail-page enrichment for listing-only scrapes."""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from bs4 import BeautifulSoup
+
+from .concurrency import ContextThreadPoolExecutor
+from .head_metadata import parse_head_metadata
+from .path_utils import write_atomic
+from .run_report import current_stats, measure
+from .scraper import WebScraper
+
+logger = logging.getLogger(__name__)
+
+ENRICHABLE_FIELDS = ("pubDate", "author", "description")
+
+_META_CANDIDATES = {
+    "pubDate": [
+        ("property", "article:published_time"),
+        ("property", "og:published_time"),
+        ("name", "citation_publication_date"),
+        ("name", "publish_date"),
+        ("name", "date"),
+        ("name", "dc.date"),
+    ],
+    "author": [
+        ("name", "author"),
+        ("property", "article:author"),
+        ("name", "citation_author"),
+    ],
+    "description": [
+        ("property", "og:description"),
+        ("name", "description"),
+        ("name", "twitter:description"),
+    ],
+}
+_JSON_LD_KEYS = {
+    "pubDate": ("datePublished", "dateCreated"),
+    "author": ("author", "creator"),
+    "description": ("description",),
+}
+
+
+@measure("parse")
+def extract_detail_metadata(html: str) -> Dict[str, str]:
+    """Read date, author and description from head meta tags, falling back to JSON-LD.
+
+    Only the ``<head>`` is parsed unless fields are still missing, in which case
+    JSON-LD blocks in the body are consulted as well.
+    """
+    head = parse_head_metadata(html)
+    metadata: Dict[str, str] = {}
+    for field, candidates in _META_CANDIDATES.items():
+        if content := head.first_meta(candidates):
+            metadata[field] = content
+
+    _merge_json_ld(metadata, head.json_ld)
+    if head.complete and any(field not in metadata for field in _JSON_LD_KEYS):
+        # 正文中也可能有 JSON-LD，仅在仍有字段缺失时才解析整页
+        soup = BeautifulSoup(html, "lxml")
+        body = soup.body or soup
+        _merge_json_ld(metadata, _iter_json_ld_scripts(body))
+    return metadata
+
+
+def _merge_json_ld(metadata: Dict[str, str], objects: Iterable[Any]) -> None:
+    for obj in _flatten_json_ld(objects):
+        for field, keys in _JSON_LD_KEYS.items():
+            if field in metadata:
+                continue
+            for key in keys:
+                value = _json_ld_text(obj.get(key))
+                if value:
+                    metadata[field] = value
+                    break
+
+
+def _iter_json_ld_scripts(root) -> Iterable[Any]:
+    for script in root.find_all("script", attrs={"type": "application/ld+json"}):
+        raw = script.string or script.get_text()
+        if not raw:
+            continue
+        try:
+            parsed = json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(parsed, list):
+            yield from parsed
+        else:
+            yield parsed
+
+
+def _flatten_json_ld(objects: Iterable[Any]) -> Iterable[Dict[str, Any]]:
+    for candidate in objects:
+        if isinstance(candidate, dict):
+            graph = candidate.get("@graph")
+            if isinstance(graph, list):
+                yield from (node for node in graph if isinstance(node, dict))
+            yield candidate
+
+
+def _json_ld_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return _json_ld_text(value.get("name"))
+    if isinstance(value, list):
+        names = [_json_ld_text(entry) for entry in value]
+        return ", ".join(name for name in names if name)
+    return ""
+
+
+class DetailPageCache:
+    """Detail-page metadata keyed by item URL, persisted as JSON."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._dirty = False
+        if self.path and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._entries = data if isinstance(data, dict) else {}
+            except (OSError, ValueError) as exc:
+                logger.warning(f"读取详情页缓存失败 {self.path}: {exc}")
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            return self._entries.get(url)
+
+    def put(self, url: str, metadata: Dict[str, str]) -> None:
+        with self._lock:
+            self._entries[url] = metadata
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            payload = json.dumps(self._entries, ensure_ascii=False, sort_keys=True)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, payload)
+
+
+class DetailEnricher:
+    """Fill missing item fields from each item's detail page."""
+
+    def __init__(
+        self,
+        scraper: WebScraper,
+        cache: DetailPageCache,
+        *,
+        fields: Iterable[str] = ENRICHABLE_FIELDS,
+        concurrency: int = 4,
+        overwrite: bool = False,
+        encoding: Optional[str] = None,
+    ):
+        self.scraper = scraper
+        self.cache = cache
+        self.fields = [field for field in fields if field in ENRICHABLE_FIELDS]
+        self.concurrency = max(1, int(concurrency))
+        self.overwrite = overwrite
+        self.encoding = encoding
+
+    def enrich(self, items: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Enrich items in place; every detail URL is fetched at most once (ever, with a persistent cache)."""
+        pending = [item for item in items if self._needs_enrichment(item)]
+        urls = list(dict.fromkeys(item["link"] for item in pending))
+        missing = [url for url in urls if self.cache.get(url) is None]
+        if (stats := current_stats()) is not None and len(urls) > len(missing):
+            stats.record_cache_hits(len(urls) - len(missing))
+
+        if missing:
+            logger.info(f"抓取 {len(missing)} 个详情页补全元数据（缓存命中 {len(urls) - len(missing)}）")
+            with ContextThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for url, html in zip(missing, executor.map(self._fetch, missing)):
+                    if html:
+                        self.cache.put(url, extract_detail_metadata(html))
+            self.cache.save()
+
+        for item in pending:
+            metadata = self.cache.get(item["link"]) or {}
+            for field in self.fields:
+                if metadata.get(field) and (self.overwrite or not item.get(field)):
+                    item[field] = metadata[field]
+        return items
+
+    def _needs_enrichment(self, item: Dict[str, str]) -> bool:
+        if not item.get("link"):
+            return False
+        return self.overwrite or any(not item.get(field) for field in self.fields)
+
+    def _fetch(self, url: str) -> Optional[str]:
+        try:
+            return self.scraper.fetch(url, encoding=self.encoding)
+        except Exception as exc:
+            logger.warning(f"抓取详情页失败 {url}: {exc}")
+            return None
@@ -1,30 +1,52 @@
 """Feed 创建主逻辑"""
 
+from collections import deque
 from pathlib import Path
-from typing import Dict
-from urllib.parse import urlparse
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+import json
 import logging
 
+from .concurrency import ContextThreadPoolExecutor
+from .enrichment import ENRICHABLE_FIELDS, DetailEnricher, DetailPageCache
+from .item_store import ItemStore, add_with_history
 from .scraper import WebScraper
 from .parser import HTMLParser
-from .path_utils import resolve_output_path
-from .rss_generator import RSSGenerator
+from .path_utils import resolve_output_path, safe_filename, write_atomic
+from .rss_generator import RSSGenerator, generator_options, read_feed_items
 
 logger = logging.getLogger(__name__)
 
+# 分页输出上一轮写出的条目（状态目录下），用于已知条目判断与保留；CI 只缓存状态目录，不保留 feeds/。
+PAGINATION_STATE_DIR = "pages"
+
+
+def _item_key(item: Dict[str, str]) -> str:
+    """与 ``Item`` 一致的去重键：guid，缺省时为 link。"""
+    return (item.get("guid") or "").strip() or (item.get("link") or "").strip()
+
 
 class FeedCreator:
     """Feed 创建器"""
 
-    def __init__(self, feeds_dir: str = "feeds"):
+    def __init__(
+        self,
+        feeds_dir: str = "feeds",
+        state_dir: Optional[str] = None,
+        item_store: Optional[ItemStore] = None,
+    ):
         """
         初始化 Feed 创建器
 
         Args:
             feeds_dir: RSS 文件输出目录
+            state_dir: 跨运行状态目录（详情页缓存等），为空时缓存只在内存中生效
+            item_store: 条目历史库，配置了 ``history`` 的输出从库中物化条目
         """
         self.feeds_dir = Path(feeds_dir)
         self.feeds_dir.mkdir(parents=True, exist_ok=True)
+        self.state_dir = Path(state_dir) if state_dir else None
+        self.item_store = item_store
 
     def _resolve_output_path(self, output: str) -> Path:
         """确保输出文件在 feeds 目录内，避免路径逃逸。"""
@@ -32,13 +54,16 @@ class FeedCreator:
 
     def create_feed(self, config: Dict) -> bool:
         """
-        根据配置创建单个 RSS feed
+        根据配置创建 RSS feed
+
+        配置了 ``outputs`` 时只抓取、解析一次页面，再在同一棵 DOM 上
+        依次计算每组选择器，生成多个 feed。
 
         Args:
             config: Feed 配置
 
         Returns:
-            是否成功创建
+            是否全部成功创建
         """
         name = config.get("name", "未命名")
         logger.info(f"开始处理: {name}")
@@ -50,9 +75,11 @@ class FeedCreator:
                 logger.error(f"{name}: 缺少 url 配置")
                 return False
 
-            output = config.get("output", f"{name}.xml")
-            selectors = config.get("selectors", {})
             options = config.get("options", {})
+            outputs = self._output_specs(config)
+            if not outputs:
+                logger.error(f"{name}: outputs 配置为空")
+                return False
 
             # 2. 抓取网页
             scraper = WebScraper(
@@ -67,41 +94,267 @@ class FeedCreator:
                 logger.error(f"{name}: 抓取失败")
                 return False
 
-            # 3. 解析内容
+            # 3. 解析内容（整页只解析一次）
             # 提取 base_url 用于处理相对链接
             parsed_url = urlparse(url)
             base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-
             parser = HTMLParser(html, base_url=base_url)
-            items = parser.parse_items(
-                selectors,
-                max_items=options.get("max_items", 20)
-            )
+            pages = [self._parse_outputs(parser, outputs, options)]
 
-            if not items:
-                logger.warning(f"{name}: 未解析到任何条目")
-                return False
+            # 4. 可选分页：遇到只包含已发布条目的页面即停止
+            pagination = config.get("pagination")
+            previous: List[List[Dict[str, str]]] = []
+            if pagination:
+                previous = [self._load_previous(spec) for spec in outputs]
+                known = [{_item_key(item) for item in items} for items in previous]
+                if not self._page_is_known(pages[0], known):
+                    pages.extend(
+                        self._fetch_more_pages(scraper, url, parser, pagination, outputs, options, base_url, known)
+                    )
+                logger.info(f"{name}: 分页抓取 {len(pages)} 页")
 
-            # 4. 生成 RSS
-            generator = RSSGenerator(
-                title=config.get("title", name),
-                link=config.get("link", url),
-                description=config.get("description", f"{name} RSS Feed")
+            output_items = []
+            for index in range(len(outputs)):
+                items = self._merge_items([page[index] for page in pages])
+                if pagination and items:
+                    items = self._retain_previous(items, previous[index], pagination, options)
+                output_items.append(items)
+
+            # 5. 可选详情页补全（按条目 URL 缓存，跨运行只抓取一次）
+            if enrich := config.get("enrich"):
+                enricher = self._create_enricher(name, scraper, enrich, options)
+                enricher.enrich([item for items in output_items for item in items])
+
+            # 6. 按输出生成 RSS
+            results = [self._write_output(spec, items) for spec, items in zip(outputs, output_items)]
+            if pagination:
+                for spec, items, success in zip(outputs, output_items, results):
+                    if success:
+                        self._save_previous(spec, items)
+            return all(results)
+
+        except Exception as e:
+            logger.error(f"{name}: 处理失败 - {e}")
+            return False
+
+    def _output_specs(self, config: Dict) -> List[Dict]:
+        """将单输出与多输出（outputs）配置统一为输出规格列表。"""
+        name = config.get("name", "未命名")
+        url = config.get("url")
+        defaults = {
+            "name": name,
+            "selectors": config.get("selectors", {}),
+            "title": config.get("title", name),
+            "link": config.get("link", url),
+            "description": config.get("description", f"{name} RSS Feed"),
+            "history": config.get("history"),
+            "formats": config.get("formats"),
+            "archive": config.get("archive"),
+        }
+        if not config.get("outputs"):
+            return [{**defaults, "output": config.get("output", f"{name}.xml")}]
+
+        specs = []
+        for entry in config["outputs"]:
+            title = entry.get("title") or entry.get("output") or name
+            specs.append(
+                {
+                    **defaults,
+                    **entry,
+                    "name": f"{name} / {title}",
+                    "title": title,
+                    "description": entry.get("description", f"{title} RSS Feed"),
+                    "output": entry.get("output", f"{title}.xml"),
+                }
             )
-            generator.add_items(items)
+        return specs
 
-            output_path = self._resolve_output_path(output)
-            success = generator.generate(str(output_path))
+    def _parse_outputs(self, parser: HTMLParser, outputs: List[Dict], options: Dict) -> List[List[Dict[str, str]]]:
+        """在同一棵 DOM 上计算每个输出的条目。"""
+        return [
+            parser.parse_items(
+                spec.get("selectors") or {},
+                max_items=spec.get("max_items", options.get("max_items", 20))
+            )
+            for spec in outputs
+        ]
+
+    def _fetch_more_pages(
+        self,
+        scraper: WebScraper,
+        first_url: str,
+        first_parser: HTMLParser,
+        pagination: Dict,
+        outputs: List[Dict],
+        options: Dict,
+        base_url: str,
+        known: List[set],
+    ) -> List[List[List[Dict[str, str]]]]:
+        """
+        抓取第 2 页及之后的页面
 
-            if success:
-                logger.info(f"{name}: 成功生成，包含 {len(items)} 个条目")
+        ``url_template`` 模式下并发预取 ``prefetch`` 页，按页序处理；
+        ``next`` 模式下沿“下一页”链接顺序抓取。页面为空或只包含已知条目时停止。
+        """
+        max_pages = int(pagination.get("max_pages", 5))
+        encoding = options.get("encoding")
+        pages: List[List[List[Dict[str, str]]]] = []
+
+        def parse_page(html: Optional[str]) -> Optional[List[List[Dict[str, str]]]]:
+            if not html:
+                return None
+            page = self._parse_outputs(HTMLParser(html, base_url=base_url), outputs, options)
+            return None if self._page_is_known(page, known) else page
 
-            return success
+        if template := pagination.get("url_template"):
+            start_page = int(pagination.get("start_page", 2))
+            page_urls = iter([template.format(page=number) for number in range(start_page, start_page + max_pages - 1)])
+            prefetch = max(1, int(pagination.get("prefetch", 3)))
+            with ContextThreadPoolExecutor(max_workers=prefetch) as executor:
+                in_flight = deque()
+                for page_url in page_urls:
+                    in_flight.append(executor.submit(scraper.fetch, page_url, encoding=encoding))
+                    if len(in_flight) >= prefetch:
+                        break
+                while in_flight:
+                    page = parse_page(in_flight.popleft().result())
+                    if page is None:
+                        for future in in_flight:
+                            future.cancel()
+                        break
+                    pages.append(page)
+                    if (page_url := next(page_urls, None)) is not None:
+                        in_flight.append(executor.submit(scraper.fetch, page_url, encoding=encoding))
+            return pages
 
+        next_selector = pagination.get("next")
+        if not next_selector:
+            logger.warning("pagination 需要配置 next 或 url_template")
+            return pages
+
+        parser, page_url, visited = first_parser, first_url, {first_url}
+        for _ in range(max_pages - 1):
+            next_elem = parser.soup.select_one(next_selector)
+            href = next_elem.get("href", "") if next_elem else ""
+            next_url = urljoin(page_url, href) if href else ""
+            if not next_url or next_url in visited:
+                break
+            visited.add(next_url)
+            html = scraper.fetch(next_url, encoding=encoding)
+            if not html:
+                break
+            parser, page_url = HTMLParser(html, base_url=base_url), next_url
+            page = self._parse_outputs(parser, outputs, options)
+            if self._page_is_known(page, known):
+                break
+            pages.append(page)
+        return pages
+
+    def _create_enricher(self, name: str, scraper: WebScraper, enrich: Dict, options: Dict) -> DetailEnricher:
+        cache_path = None
+        if self.state_dir is not None:
+            cache_path = self.state_dir / "details" / f"{safe_filename(name)}.json"
+        return DetailEnricher(
+            scraper,
+            DetailPageCache(cache_path),
+            fields=enrich.get("fields", ENRICHABLE_FIELDS),
+            concurrency=enrich.get("concurrency", 4),
+            overwrite=bool(enrich.get("overwrite", False)),
+            encoding=options.get("encoding"),
+        )
+
+    def _previous_state_path(self, spec: Dict) -> Optional[Path]:
+        if self.state_dir is None:
+            return None
+        return self.state_dir / PAGINATION_STATE_DIR / f"{safe_filename(spec['output'])}.json"
+
+    def _load_previous(self, spec: Dict) -> List[Dict[str, str]]:
+        """
+        上一轮写出的条目（加入顺序）
+
+        优先读取状态目录中的记录；没有记录时回退到已发布的 feed 文件。
+        """
+        path = self._previous_state_path(spec)
+        if path is not None and path.exists():
+            try:
+                items = json.loads(path.read_text(encoding="utf-8"))
+                if isinstance(items, list):
+                    return [item for item in items if isinstance(item, dict) and _item_key(item)]
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取分页状态失败 {path}: {e}")
+        # RSS 文件中的条目顺序与 add_items 顺序相反，需要反转回来。
+        return list(reversed(read_feed_items(self._resolve_output_path(spec["output"]))))
+
+    def _save_previous(self, spec: Dict, items: List[Dict[str, str]]):
+        path = self._previous_state_path(spec)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, json.dumps(items, ensure_ascii=False))
+        except (OSError, TypeError) as e:
+            logger.warning(f"保存分页状态失败 {path}: {e}")
+
+    @staticmethod
+    def _page_is_known(page: List[List[Dict[str, str]]], known: List[set]) -> bool:
+        """页面的所有输出都没有新条目（含空页面）时返回 True。"""
+        return all(_item_key(item) in known[index] for index, items in enumerate(page) for item in items)
+
+    @staticmethod
+    def _merge_items(page_items: List[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        merged, seen = [], set()
+        for items in page_items:
+            for item in items:
+                if _item_key(item) not in seen:
+                    seen.add(_item_key(item))
+                    merged.append(item)
+        return merged
+
+    @staticmethod
+    def _retain_previous(
+        items: List[Dict[str, str]],
+        previous: List[Dict[str, str]],
+        pagination: Dict,
+        options: Dict,
+    ) -> List[Dict[str, str]]:
+        """保留已发布但本轮未抓到的条目，使深层归档只需回填一次。"""
+        limit = int(pagination.get("max_items", options.get("max_items", 20) * int(pagination.get("max_pages", 5))))
+        seen = {_item_key(item) for item in items}
+        retained = [item for item in previous if _item_key(item) not in seen]
+        return (items + retained)[:limit]
+
+    def _write_output(self, spec: Dict, items: List[Dict[str, str]]) -> bool:
+        """将一个输出的条目写成 RSS；单个输出出错只记录错误，不影响其他输出。"""
+        name = spec["name"]
+        if not items:
+            logger.warning(f"{name}: 未解析到任何条目")
+            return False
+
+        try:
+            generator = RSSGenerator(
+                title=spec["title"],
+                link=spec["link"],
+                description=spec["description"],
+                **generator_options(spec),
+            )
+            output_path = self._resolve_output_path(spec["output"])
+            count = add_with_history(
+                generator,
+                items,
+                store=self.item_store,
+                feed=output_path.name,
+                history=spec.get("history"),
+            )
+            success = generator.generate(str(output_path))
         except Exception as e:
-            logger.error(f"{name}: 处理失败 - {e}")
+            logger.error(f"{name}: 生成 {spec.get('output')} 失败 - {e}")
             return False
 
+        if success:
+            logger.info(f"{name}: 成功生成，包含 {count} 个条目")
+
+        return success
+
     def create_all_feeds(self, configs: list) -> Dict[str, bool]:
         """
         创建所有配置的 feeds
@@ -0,0 +1,111 @@
+"""Streaming extractor for document ``<head>`` metadata.
+
+Feeds the HTML through an incremental parser and stops as soon as ``</head>``
+(or ``<body>``) is reached, so title, ``<meta>`` tags, canonical links and
+JSON-LD can be read without building a soup of the whole article.
+"""
+
+import json
+from dataclasses import dataclass, field
+from html.parser import HTMLParser as _StdlibHTMLParser
+from typing import Any, Iterable, Optional
+
+DEFAULT_CHUNK_SIZE = 16 * 1024
+
+
+@dataclass
+class HeadMetadata:
+    """Metadata collected from a document head."""
+
+    title: str = ""
+    canonical: str = ""
+    # (属性名, 属性值) -> content；与 soup.find("meta", attrs=...) 一致，只记录首次出现的标签。
+    meta: dict[tuple[str, str], str] = field(default_factory=dict)
+    json_ld: list[Any] = field(default_factory=list)
+    # 是否在文档结束前遇到 </head> / <body>
+    complete: bool = False
+
+    def first_meta(self, candidates: Iterable[tuple[str, str]]) -> Optional[str]:
+        """Return the first non-empty ``content`` among the candidate ``(attr, value)`` pairs."""
+        for candidate in candidates:
+            content = self.meta.get(candidate, "").strip()
+            if content:
+                return content
+        return None
+
+
+class _HeadComplete(Exception):
+    pass
+
+
+class _HeadParser(_StdlibHTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.result = HeadMetadata()
+        self._title_parts: Optional[list[str]] = None
+        self._json_ld_parts: Optional[list[str]] = None
+        self._title_seen = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            raise _HeadComplete
+        attributes = {name: value or "" for name, value in attrs}
+        if tag == "meta":
+            content = attributes.get("content", "")
+            for name in ("name", "property", "http-equiv", "itemprop"):
+                value = attributes.get(name)
+                if value:
+                    self.result.meta.setdefault((name, value), content)
+        elif tag == "link":
+            rel_values = attributes.get("rel", "").lower().split()
+            if "canonical" in rel_values and not self.result.canonical:
+                self.result.canonical = attributes.get("href", "").strip()
+        elif tag == "title" and not self._title_seen:
+            self._title_parts = []
+        elif tag == "script" and attributes.get("type", "").strip().lower() == "application/ld+json":
+            self._json_ld_parts = []
+
+    def handle_startendtag(self, tag, attrs):
+        # <meta ... /> 与 <link ... /> 不会触发 endtag，按 starttag 处理即可。
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            raise _HeadComplete
+        if tag == "title" and self._title_parts is not None:
+            self.result.title = "".join(self._title_parts).strip()
+            self._title_parts = None
+            self._title_seen = True
+        elif tag == "script" and self._json_ld_parts is not None:
+            self._add_json_ld("".join(self._json_ld_parts))
+            self._json_ld_parts = None
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        elif self._json_ld_parts is not None:
+            self._json_ld_parts.append(data)
+
+    def _add_json_ld(self, raw: str) -> None:
+        if not raw.strip():
+            return
+        try:
+            parsed = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        if isinstance(parsed, list):
+            self.result.json_ld.extend(parsed)
+        else:
+            self.result.json_ld.append(parsed)
+
+
+def parse_head_metadata(html: str, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> HeadMetadata:
+    """Collect head metadata in a single pass, stopping at ``</head>``."""
+    parser = _HeadParser()
+    try:
+        for start in range(0, len(html), chunk_size):
+            parser.feed(html[start:start + chunk_size])
+        parser.close()
+    except _HeadComplete:
+        parser.result.complete = True
+    return parser.result
@@ -0,0 +1,98 @@
+"""Persistent conditional-GET cache keyed by request URL.
+
+Stores ``ETag`` / ``Last-Modified`` validators together with the last body so a
+``304 Not Modified`` answer can be served from disk.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import requests
+
+from .path_utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConditionalResponse:
+    text: str
+    not_modified: bool
+
+
+class ConditionalCache:
+    """ETag/Last-Modified store shared by the requests of one job.
+
+    ``path=None`` keeps validators in memory only.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, str]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning(f"读取条件请求缓存失败 {self.path}: {exc}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(
+        self,
+        session: requests.Session,
+        url: str,
+        *,
+        params: Optional[dict[str, Any]] = None,
+        timeout: float = 20,
+    ) -> ConditionalResponse:
+        """GET ``url`` with stored validators; raises ``requests.RequestException`` on failure."""
+        key = cache_key(url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and entry:
+            return ConditionalResponse(text=entry.get("body", ""), not_modified=True)
+        response.raise_for_status()
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            with self._lock:
+                self._entries[key] = {
+                    "etag": etag or "",
+                    "last_modified": last_modified or "",
+                    "body": response.text,
+                }
+                self._dirty = True
+        return ConditionalResponse(text=response.text, not_modified=False)
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            payload = json.dumps(self._entries, ensure_ascii=False)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, payload)
+
+
+def cache_key(url: str, params: Optional[dict[str, Any]] = None) -> str:
+    """Return the fully encoded request URL used as cache key."""
+    return requests.Request("GET", url, params=params).prepare().url or url
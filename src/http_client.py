@@ -1,17 +1,266 @@
 """Shared HTTP session factory with retries."""
 
-from typing import Optional
+import logging
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
 
 import requests
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import MaxRetryError
 from urllib3.util.retry import Retry
 
+from . import metrics
+from .concurrency import current_token
+from .run_report import current_stats
+from .tracing import current_span, span
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
 )
 
+FetchKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """The current job was cancelled or ran out of time before the request could be sent."""
+
+
+class RunFetchCache:
+    """Singleflight cache for GET responses within one run.
+
+    Concurrent or repeated GETs with the same URL and headers share a single
+    in-flight request and the same response body. Failures are not cached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[FetchKey, Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fetch(self, key: FetchKey, send: Callable[[], requests.Response]) -> requests.Response:
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            logger.debug(f"复用本轮已抓取的响应: {key[0]}")
+            token = current_token()
+            try:
+                # 等待其他 job 的同一请求时同样受本 job 截止时间约束。
+                response = future.result(timeout=token.remaining() if token else None)
+            except FutureTimeoutError:
+                raise DeadlineExceeded(f"等待共享请求时超过截止时间: {key[0]}") from None
+            return _clone_response(response)
+
+        try:
+            response = send()
+            # 读取完整 body，后续所有副本共享同一份内容。
+            response.content
+        except BaseException as exc:
+            with self._lock:
+                self._entries.pop(key, None)
+            future.set_exception(exc)
+            raise
+
+        if not _is_cacheable(response):
+            with self._lock:
+                self._entries.pop(key, None)
+        future.set_result(response)
+        return _clone_response(response)
+
+
+# ContextVar 而非模块全局：调度器并发执行多个 job 时，各自的合并作用域互不干扰。
+_active_fetch_cache: ContextVar[Optional[RunFetchCache]] = ContextVar("active_fetch_cache", default=None)
+
+
+@contextmanager
+def coalesce_fetches() -> Iterator[RunFetchCache]:
+    """Enable run-scoped request coalescing for every session from ``create_retry_session``."""
+    cache = RunFetchCache()
+    token = _active_fetch_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _active_fetch_cache.reset(token)
+
+
+class CoalescingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that routes plain GETs through the active ``RunFetchCache``.
+
+    Requests made under a :class:`~src.concurrency.CancelToken` fail fast once
+    it is cancelled, and their timeouts are clamped to the remaining budget.
+    """
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        token = current_token()
+        if token is not None:
+            if token.cancelled:
+                raise DeadlineExceeded(f"{token.reason}，跳过请求: {request.url}", request=request)
+            timeout = _clamp_timeout(timeout, token.remaining())
+
+        with span("fetch", url=request.url, method=request.method) as fetch_span:
+            stats = current_stats()
+            network_calls = []
+
+            def network_send():
+                network_calls.append(request.url)
+                try:
+                    response = super(CoalescingHTTPAdapter, self).send(
+                        request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+                    )
+                except Exception:
+                    if stats is not None:
+                        stats.record_request(status=None, size=0, elapsed=0.0)
+                    metrics.record_request(request.url, status=None, size=0, elapsed=0.0)
+                    raise
+                # 非流式请求随后总会读取完整 body，提前读取以统计下载字节数。
+                size = 0 if stream else len(response.content)
+                elapsed = response.elapsed.total_seconds()
+                fetch_span.set(status=response.status_code, bytes=size)
+                if stats is not None:
+                    stats.record_request(status=response.status_code, size=size, elapsed=elapsed)
+                metrics.record_request(request.url, status=response.status_code, size=size, elapsed=elapsed)
+                return response
+
+            cache = _active_fetch_cache.get()
+            if cache is None or stream or request.method != "GET" or request.body:
+                return network_send()
+
+            key = (request.url, tuple(sorted((name.lower(), value) for name, value in request.headers.items())))
+            response = cache.fetch(key, network_send)
+            if not network_calls:
+                fetch_span.set(cached=True)
+                if stats is not None:
+                    stats.record_cache_hits()
+                metrics.record_cache_hit(request.url)
+            return response
+
+
+class CountingRetry(Retry):
+    """Retry policy that reports every retry to the current job stats and the metrics registry.
+
+    Under a :class:`~src.concurrency.CancelToken` a retry whose backoff or
+    ``Retry-After`` sleep would outlast the remaining budget is not attempted:
+    status retries return the last response, error retries fail as if the
+    retries were exhausted.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        token = current_token()
+        if token is not None:
+            remaining = token.remaining()
+            if token.cancelled or (remaining is not None and _retry_delay(retry, response) >= remaining):
+                reason = DeadlineExceeded(f"{token.reason or '剩余时间不足'}，放弃重试: {url}")
+                raise MaxRetryError(_pool, url, reason) from error
+        if (stats := current_stats()) is not None:
+            stats.record_retry()
+        metrics.record_retry(getattr(_pool, "host", None) or "")
+        current_span().set(retries=len(retry.history))
+        return retry
+
+
+def _retry_delay(retry: Retry, response) -> float:
+    """``Retry.sleep`` 接下来会等待的秒数。"""
+    if response is not None and retry.respect_retry_after_header:
+        retry_after = retry.get_retry_after(response)
+        if retry_after is not None:
+            return retry_after
+    return retry.get_backoff_time()
+
+
+class SessionPool:
+    """Sessions shared across runs, keyed by the options of ``create_retry_session``.
+
+    Keeping the session keeps its keep-alive connection pool, so a long-running
+    process does not redo DNS/TCP/TLS setup on every iteration.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: dict[tuple, requests.Session] = {}
+        self.hits = 0
+
+    def get(self, key: tuple, factory: Callable[[], requests.Session]) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = factory()
+            else:
+                self.hits += 1
+            return session
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_active_session_pool: ContextVar[Optional[SessionPool]] = ContextVar("active_session_pool", default=None)
+
+
+@contextmanager
+def pooled_sessions(pool: Optional[SessionPool] = None) -> Iterator[SessionPool]:
+    """Make ``create_retry_session`` hand out pooled sessions; the pool is closed on exit."""
+    pool = pool or SessionPool()
+    token = _active_session_pool.set(pool)
+    try:
+        yield pool
+    finally:
+        _active_session_pool.reset(token)
+        pool.close()
+
+
+def _clamp_timeout(timeout, remaining: Optional[float]):
+    """Shrink a requests timeout (number or ``(connect, read)``) to at most ``remaining`` seconds."""
+    if remaining is None:
+        return timeout
+    # urllib3 不接受 0 超时；剩余时间极短时仍发出请求，由超时异常结束。
+    remaining = max(remaining, 0.001)
+    if isinstance(timeout, tuple):
+        return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _is_cacheable(response: requests.Response) -> bool:
+    return response.status_code < 500 and response.status_code != 429
+
+
+def _clone_response(response: requests.Response) -> requests.Response:
+    clone = requests.Response()
+    clone.status_code = response.status_code
+    clone.headers = CaseInsensitiveDict(response.headers)
+    clone._content = response.content
+    clone._content_consumed = True
+    clone.url = response.url
+    clone.encoding = response.encoding
+    clone.reason = response.reason
+    clone.elapsed = response.elapsed
+    clone.request = response.request
+    clone.cookies = response.cookies.copy()
+    return clone
+
 
 def create_retry_session(
     *,
@@ -20,13 +269,35 @@ def create_retry_session(
     retries: int = 2,
     backoff_factor: float = 0.5,
 ) -> requests.Session:
-    """Create a requests session with retry policy for idempotent methods."""
+    """Create a requests session with retry policy for idempotent methods.
+
+    Inside :func:`pooled_sessions` the same session is returned for the same options.
+    """
+    pool = _active_session_pool.get()
+    if pool is not None:
+        key = (user_agent, accept, retries, backoff_factor)
+        return pool.get(
+            key,
+            lambda: _build_retry_session(
+                user_agent=user_agent, accept=accept, retries=retries, backoff_factor=backoff_factor
+            ),
+        )
+    return _build_retry_session(user_agent=user_agent, accept=accept, retries=retries, backoff_factor=backoff_factor)
+
+
+def _build_retry_session(
+    *,
+    user_agent: Optional[str],
+    accept: Optional[str],
+    retries: int,
+    backoff_factor: float,
+) -> requests.Session:
     session = requests.Session()
     session.headers.update({"User-Agent": user_agent or DEFAULT_USER_AGENT})
     if accept:
         session.headers.update({"Accept": accept})
 
-    retry_policy = Retry(
+    retry_policy = CountingRetry(
         total=retries,
         connect=retries,
         read=retries,
@@ -36,7 +307,7 @@ def create_retry_session(
         backoff_factor=backoff_factor,
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry_policy)
+    adapter = CoalescingHTTPAdapter(max_retries=retry_policy)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     return session
@@ -0,0 +1,96 @@
+"""Compact feed item model shared by jobs and generators."""
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Mapping, Optional, Union
+
+from .dates import RSS_DATE_FORMAT, parse_datetime
+
+_MIN_DATETIME = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def guid_hash(guid: str) -> int:
+    """Stable signed 64-bit hash of a GUID (fits an SQLite INTEGER)."""
+    digest = hashlib.blake2b(guid.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@dataclass(frozen=True, slots=True)
+class Item:
+    """A normalised feed entry.
+
+    Strings are stripped, ``guid`` defaults to ``link``, ``published`` is a
+    timezone-aware datetime (strings are parsed once on construction) and
+    ``guid_hash`` is precomputed for de-duplication. ``permalink`` overrides
+    the ``isPermaLink`` rule (``guid == link``) when set.
+    """
+
+    title: str
+    link: str
+    guid: str = ""
+    description: str = ""
+    published: Optional[datetime] = None
+    author: str = ""
+    categories: tuple[str, ...] = ()
+    permalink: Optional[bool] = None
+    guid_hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        link = (self.link or "").strip()
+        guid = (self.guid or "").strip() or link
+        object.__setattr__(self, "title", (self.title or "").strip())
+        object.__setattr__(self, "link", link)
+        object.__setattr__(self, "guid", guid)
+        object.__setattr__(self, "description", self.description or "")
+        object.__setattr__(self, "published", parse_datetime(self.published))
+        object.__setattr__(self, "author", (self.author or "").strip())
+        object.__setattr__(self, "categories", tuple(self.categories or ()))
+        object.__setattr__(self, "guid_hash", guid_hash(guid))
+
+    @property
+    def sort_key(self) -> datetime:
+        """Publication time for ordering; undated items sort as oldest."""
+        return self.published or _MIN_DATETIME
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Item":
+        """Build an item from the legacy dict shape (``title``/``link``/``guid``/``pubDate``/...)."""
+        categories = data.get("categories") or ()
+        if isinstance(categories, str):
+            categories = (categories,)
+        return cls(
+            title=str(data.get("title") or ""),
+            link=str(data.get("link") or ""),
+            guid=str(data.get("guid") or ""),
+            description=str(data.get("description") or ""),
+            published=data.get("pubDate"),
+            author=str(data.get("author") or ""),
+            categories=tuple(str(category) for category in categories),
+            permalink=data.get("permalink"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the legacy dict shape; ``pubDate`` is RFC-822 formatted."""
+        data: dict[str, Any] = {"title": self.title, "link": self.link, "guid": self.guid}
+        if self.description:
+            data["description"] = self.description
+        if self.published is not None:
+            data["pubDate"] = self.published.strftime(RSS_DATE_FORMAT)
+        if self.author:
+            data["author"] = self.author
+        if self.categories:
+            data["categories"] = list(self.categories)
+        if self.permalink is not None:
+            data["permalink"] = self.permalink
+        return data
+
+
+ItemLike = Union[Item, Mapping[str, Any]]
+
+
+def coerce_item(value: ItemLike) -> Item:
+    """Accept either an ``Item`` or a legacy item dict."""
+    if isinstance(value, Item):
+        return value
+    return Item.from_dict(value)
@@ -0,0 +1,213 @@
+"""SQLite item history shared by all jobs.
+
+Each feed (keyed by its output filename) keeps every item it has ever
+published, so entries that scroll off an upstream listing stay in our feed.
+Rows are keyed by ``(feed, guid_hash)`` and ordered through an index on
+``(feed, sort_ts)``; ``sort_ts`` is the publication time, or the time the
+item was first seen for undated entries.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .item import Item, ItemLike, coerce_item
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_ITEMS = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    feed TEXT NOT NULL,
+    guid_hash INTEGER NOT NULL,
+    guid TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    author TEXT NOT NULL DEFAULT '',
+    categories TEXT NOT NULL DEFAULT '[]',
+    published INTEGER,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    sort_ts INTEGER NOT NULL,
+    UNIQUE (feed, guid_hash)
+);
+CREATE INDEX IF NOT EXISTS items_feed_sort ON items (feed, sort_ts DESC);
+CREATE INDEX IF NOT EXISTS items_published ON items (published);
+"""
+
+# 已存在的条目保留 first_seen；新值为空时不覆盖旧值（例如本轮未补全详情页）。
+_UPSERT = """
+INSERT INTO items (
+    feed, guid_hash, guid, title, link, description, author, categories,
+    published, first_seen, last_seen, sort_ts
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (feed, guid_hash) DO UPDATE SET
+    guid = excluded.guid,
+    title = excluded.title,
+    link = excluded.link,
+    description = CASE WHEN excluded.description != '' THEN excluded.description ELSE items.description END,
+    author = CASE WHEN excluded.author != '' THEN excluded.author ELSE items.author END,
+    categories = excluded.categories,
+    published = COALESCE(excluded.published, items.published),
+    sort_ts = COALESCE(excluded.published, items.sort_ts),
+    last_seen = excluded.last_seen
+"""
+
+_SELECT_LATEST = """
+SELECT guid, title, link, description, author, categories, published
+FROM items
+WHERE feed = ?
+ORDER BY sort_ts DESC, rowid DESC
+LIMIT ?
+"""
+
+
+class ItemStore:
+    """Persistent per-feed item history backed by SQLite."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def upsert(self, feed: str, items: Iterable[ItemLike], *, now: Optional[float] = None) -> int:
+        """
+        写入一批条目（顺序同 ``RSSGenerator.add_items``，越靠后越新）
+
+        Returns:
+            新增条目数
+        """
+        seen_at = int(now if now is not None else time.time())
+        rows = []
+        for value in items:
+            item = coerce_item(value)
+            # 以 GUID 为键（缺省时即 link）：没有 link 的条目（如 RSSFilter 输出）同样入库。
+            if not item.guid:
+                continue
+            published = int(item.published.timestamp()) if item.published is not None else None
+            rows.append(
+                (
+                    feed,
+                    item.guid_hash,
+                    item.guid,
+                    item.title,
+                    item.link,
+                    item.description,
+                    item.author,
+                    json.dumps(list(item.categories), ensure_ascii=False),
+                    published,
+                    seen_at,
+                    seen_at,
+                    published if published is not None else seen_at,
+                )
+            )
+
+        with self._lock, self._conn:
+            before = self._count(feed)
+            self._conn.executemany(_UPSERT, rows)
+            return self._count(feed) - before
+
+    def latest(self, feed: str, limit: int) -> list[Item]:
+        """按时间倒序返回 feed 最新的 ``limit`` 个条目。"""
+        with self._lock:
+            rows = self._conn.execute(_SELECT_LATEST, (feed, int(limit))).fetchall()
+        return [
+            Item(
+                title=title,
+                link=link,
+                guid=guid,
+                description=description,
+                author=author,
+                categories=tuple(json.loads(categories)),
+                published=datetime.fromtimestamp(published, timezone.utc) if published is not None else None,
+            )
+            for guid, title, link, description, author, categories, published in rows
+        ]
+
+    def prune(
+        self,
+        feed: str,
+        *,
+        keep: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> int:
+        """
+        按保留策略删除旧条目
+
+        Args:
+            keep: 每个 feed 最多保留的条目数
+            max_age_days: 删除 sort_ts 早于该天数的条目
+
+        Returns:
+            删除的条目数
+        """
+        deleted = 0
+        with self._lock, self._conn:
+            if max_age_days is not None:
+                cutoff = int((now if now is not None else time.time()) - float(max_age_days) * 86400)
+                deleted += self._conn.execute(
+                    "DELETE FROM items WHERE feed = ? AND sort_ts < ?", (feed, cutoff)
+                ).rowcount
+            if keep is not None:
+                deleted += self._conn.execute(
+                    """
+                    DELETE FROM items WHERE feed = ? AND rowid NOT IN (
+                        SELECT rowid FROM items WHERE feed = ? ORDER BY sort_ts DESC, rowid DESC LIMIT ?
+                    )
+                    """,
+                    (feed, feed, int(keep)),
+                ).rowcount
+        return deleted
+
+    def count(self, feed: str) -> int:
+        with self._lock:
+            return self._count(feed)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _count(self, feed: str) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM items WHERE feed = ?", (feed,)).fetchone()[0]
+
+
+def add_with_history(
+    generator: Any,
+    items: Iterable[ItemLike],
+    *,
+    store: Optional[ItemStore],
+    feed: str,
+    history: Any,
+) -> int:
+    """
+    将条目加入 ``generator``；配置了 ``history`` 时先写入条目库，再从库中取最新条目
+
+    ``history`` 可以是 ``true`` 或 dict：``max_items``（输出条目数，默认 100）、
+    ``keep``（库中保留条目数）、``retention_days``（按时间淘汰）。
+
+    Returns:
+        加入 generator 的条目数
+    """
+    items = list(items)
+    if not history or store is None:
+        generator.add_items(items)
+        return len(items)
+
+    options = history if isinstance(history, dict) else {}
+    added = store.upsert(feed, items)
+    pruned = store.prune(feed, keep=options.get("keep"), max_age_days=options.get("retention_days"))
+    if added or pruned:
+        logger.info(f"{feed}: 条目库新增 {added} 条，淘汰 {pruned} 条")
+    return generator.add_from_store(store, feed, limit=int(options.get("max_items", DEFAULT_HISTORY_ITEMS)))
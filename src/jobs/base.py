@@ -2,12 +2,39 @@
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Optional
+
+from src.concurrency import CancelToken
+from src.item import ItemLike
+from src.item_store import ItemStore, add_with_history
 
 
 @dataclass(frozen=True)
 class JobContext:
     feeds_dir: Path
+    # 跨运行持久化的状态目录（ETag、缓存等）；为 None 时相关功能只在内存中生效。
+    state_dir: Optional[Path] = None
+    # 条目历史库；仅当有 job 配置了 history 且启用 state_dir 时由 runner 打开。
+    item_store: Optional[ItemStore] = None
+    # 截止时间与取消标记；runner 同时把它设为当前上下文的 token，HTTP 层据此缩短超时、提前失败。
+    cancel_token: Optional[CancelToken] = None
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """``time.monotonic`` 截止时间；未设置时为 None。"""
+        return self.cancel_token.deadline if self.cancel_token else None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_token is not None and self.cancel_token.cancelled
+
+    def state_path(self, *parts: str) -> Optional[Path]:
+        """Return a path under ``state_dir`` (parents created), or None when state is disabled."""
+        if self.state_dir is None:
+            return None
+        path = Path(self.state_dir).joinpath(*parts)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
 
 
 @dataclass
@@ -31,3 +58,13 @@ class FeedJob:
 
     def run(self, context: JobContext) -> JobResult:
         raise NotImplementedError
+
+    def publish_items(self, context: JobContext, generator: Any, items: Iterable[ItemLike], *, feed: str) -> int:
+        """Add items to ``generator``, routing them through the item store when ``history`` is configured."""
+        return add_with_history(
+            generator,
+            items,
+            store=context.item_store,
+            feed=feed,
+            history=self.config.get("history"),
+        )
@@ -4,13 +4,16 @@ from __future__ import annotations
 
 import logging
 import re
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable, Iterator
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
 
+from src.concurrency import ContextThreadPoolExecutor
 from src.path_utils import resolve_output_path
-from src.rss_generator import RSSGenerator
+from src.rss_generator import RSSGenerator, generator_options
+from src.run_report import measure
 from src.scraper import WebScraper
 
 from .base import FeedJob, JobContext, JobResult
@@ -26,8 +29,13 @@ DEFAULT_LINK = f"{DEFAULT_SOURCE_URL}#github-release"
 DEFAULT_FALLBACK_ATOM_URL = "https://github.com/openai/codex/releases.atom"
 DEFAULT_MAX_ITEMS = 50
 DEFAULT_ANCHOR_PREFIXES = ("github-release-",)
+HEADING_EXCLUDED_TAGS = frozenset({"button"})
+DESCRIPTION_EXCLUDED_TAGS = frozenset({"button", "img", "pre", "script", "style", "svg", "summary"})
+# 与 Tag.get_text() 默认行为一致：只收集普通文本和 CDATA，忽略注释等。
+_TEXT_STRING_TYPES = (NavigableString, CData)
 
 
+@measure("parse")
 def extract_codex_changelog_items(
     html: str,
     page_url: str,
@@ -82,6 +90,7 @@ def extract_codex_changelog_items(
     return items
 
 
+@measure("parse")
 def extract_github_release_atom_items(xml: str, *, max_items: int = DEFAULT_MAX_ITEMS) -> list[dict[str, str]]:
     """Extract release entries from GitHub's releases Atom feed."""
     soup = BeautifulSoup(xml, "xml")
@@ -130,11 +139,28 @@ def _extract_anchor_id(container: Tag) -> str | None:
     return anchor_id or None
 
 
+def _iter_visible_strings(root: Tag, excluded_tags: frozenset[str]) -> Iterator[str]:
+    """Yield stripped text under ``root`` in document order, skipping excluded subtrees.
+
+    Walks the existing tree instead of copying and re-parsing it, so the cost is
+    linear in the size of the subtree.
+    """
+    stack = list(reversed(root.contents))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Tag):
+            if node.name not in excluded_tags:
+                stack.extend(reversed(node.contents))
+            continue
+        if type(node) not in _TEXT_STRING_TYPES:
+            continue
+        text = node.strip()
+        if text:
+            yield text
+
+
 def _extract_heading_text(heading: Tag) -> str:
-    heading_copy = BeautifulSoup(str(heading), "lxml")
-    for button in heading_copy.select("button"):
-        button.decompose()
-    return _normalize_whitespace(heading_copy.get_text(" ", strip=True))
+    return _normalize_whitespace(" ".join(_iter_visible_strings(heading, HEADING_EXCLUDED_TAGS)))
 
 
 def _extract_release_link(article: Tag) -> str | None:
@@ -149,15 +175,9 @@ def _extract_release_link(article: Tag) -> str | None:
 
 
 def _extract_description(article: Tag) -> str:
-    article_copy = BeautifulSoup(str(article), "lxml")
-    for selector in ("button", "img", "pre", "script", "style", "svg"):
-        for element in article_copy.select(selector):
-            element.decompose()
-    for summary in article_copy.select("summary"):
-        summary.decompose()
-
+    text = "\n".join(_iter_visible_strings(article, DESCRIPTION_EXCLUDED_TAGS))
     lines: list[str] = []
-    for raw_line in article_copy.get_text("\n", strip=True).splitlines():
+    for raw_line in text.splitlines():
         line = _normalize_whitespace(raw_line)
         if not line or line == "View details" or line == "Full release on Github":
             continue
@@ -193,6 +213,71 @@ def _normalize_whitespace(value: str) -> str:
     return re.sub(r"\s+", " ", value).strip()
 
 
+def _create_scraper(options: dict[str, Any]) -> WebScraper:
+    return WebScraper(
+        timeout=options.get("timeout", 15),
+        user_agent=options.get("user_agent"),
+        retries=options.get("retries", 2),
+        backoff_factor=options.get("backoff_factor", 0.5),
+    )
+
+
+def _run_hedged(
+    primary: Callable[[], list[dict[str, str]]],
+    fallback: Callable[[], list[dict[str, str]]],
+    *,
+    hedge_after: float,
+) -> list[dict[str, str]]:
+    """Run the fallback fetch once the primary is slower than ``hedge_after`` seconds.
+
+    ``hedge_after <= 0`` starts both sources immediately. The first usable result
+    wins; when both are already available the primary keeps precedence.
+    """
+    executor = ContextThreadPoolExecutor(max_workers=2, thread_name_prefix="codex-hedge")
+    try:
+        primary_future = executor.submit(primary)
+        fallback_future: Future | None = None
+        if hedge_after <= 0:
+            fallback_future = executor.submit(fallback)
+        else:
+            wait([primary_future], timeout=hedge_after)
+            if not primary_future.done():
+                logger.info(f"Codex changelog 页面 {hedge_after:g}s 内未返回，并行请求 GitHub Releases Atom feed")
+                fallback_future = executor.submit(fallback)
+
+        pending = {future for future in (primary_future, fallback_future) if future is not None}
+        results: dict[Future, list[dict[str, str]]] = {}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # 每个来源结束时只取一次结果，异常也只记录一次。
+            for future in done:
+                results[future] = _future_items(future)
+            # 优先级固定：主源可用时始终优先，其次才是已完成的回退源。
+            for future in (primary_future, fallback_future):
+                items = results.get(future)
+                if items:
+                    if future is fallback_future:
+                        logger.info("使用 GitHub Releases Atom feed 的结果")
+                    return items
+            if primary_future.done() and fallback_future is None:
+                # 主源已结束但无结果，按原逻辑回退。
+                logger.info("Codex changelog 页面不可用或未命中 release 条目，回退到 GitHub Releases Atom feed")
+                fallback_future = executor.submit(fallback)
+                pending = {fallback_future}
+        return []
+    finally:
+        # 不等待落后的请求，使耗时取决于更快的来源。
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _future_items(future: Future) -> list[dict[str, str]]:
+    try:
+        return future.result() or []
+    except Exception as exc:
+        logger.warning(f"Codex 数据源抓取异常: {exc}")
+        return []
+
+
 @register_job
 class CodexChangelogJob(FeedJob):
     """Build an RSS feed from the official Codex changelog page."""
@@ -204,29 +289,41 @@ class CodexChangelogJob(FeedJob):
         fallback_atom_url = str(self.config.get("fallback_atom_url") or DEFAULT_FALLBACK_ATOM_URL)
         output_file = str(self.config.get("output") or DEFAULT_OUTPUT)
         options = self.config.get("options") or {}
-
-        scraper = WebScraper(
-            timeout=options.get("timeout", 15),
-            user_agent=options.get("user_agent"),
-            retries=options.get("retries", 2),
-            backoff_factor=options.get("backoff_factor", 0.5),
-        )
         max_items = int(options.get("max_items", DEFAULT_MAX_ITEMS))
-        html = scraper.fetch(url, encoding=options.get("encoding"))
-        items: list[dict[str, str]] = []
-        if html:
-            items = extract_codex_changelog_items(
+        encoding = options.get("encoding")
+        hedge_after = options.get("hedge_after")
+        hedged = bool(fallback_atom_url) and hedge_after is not None
+
+        scraper = _create_scraper(options)
+        # 对冲模式下两个来源并发请求，一次性运行时各自使用独立 session；常驻 / worker 模式的会话池
+        # 按选项复用 session，两者共用同一个 session（与并发 job 共用池化 session 相同），
+        # 来源主机不同，连接池互不占用。
+        atom_scraper = _create_scraper(options) if hedged else scraper
+
+        def fetch_changelog_items() -> list[dict[str, str]]:
+            html = scraper.fetch(url, encoding=encoding)
+            if not html:
+                return []
+            return extract_codex_changelog_items(
                 html,
                 url,
                 anchor_prefixes=self.config.get("anchor_prefixes"),
                 max_items=max_items,
             )
 
-        if not items and fallback_atom_url:
-            logger.info("Codex changelog 页面不可用或未命中 release 条目，回退到 GitHub Releases Atom feed")
-            atom_xml = scraper.fetch(fallback_atom_url, encoding=options.get("encoding"))
-            if atom_xml:
-                items = extract_github_release_atom_items(atom_xml, max_items=max_items)
+        def fetch_atom_items() -> list[dict[str, str]]:
+            atom_xml = atom_scraper.fetch(fallback_atom_url, encoding=encoding)
+            if not atom_xml:
+                return []
+            return extract_github_release_atom_items(atom_xml, max_items=max_items)
+
+        if hedged:
+            items = _run_hedged(fetch_changelog_items, fetch_atom_items, hedge_after=float(hedge_after))
+        else:
+            items = fetch_changelog_items()
+            if not items and fallback_atom_url:
+                logger.info("Codex changelog 页面不可用或未命中 release 条目，回退到 GitHub Releases Atom feed")
+                items = fetch_atom_items()
 
         if not items:
             return JobResult(name=self.name, success=False, details="抓取 changelog 页面和 GitHub Releases Atom feed 均失败，或未解析到条目")
@@ -236,8 +333,9 @@ class CodexChangelogJob(FeedJob):
             title=str(self.config.get("title") or DEFAULT_TITLE),
             link=str(self.config.get("link") or DEFAULT_LINK),
             description=str(self.config.get("description") or DEFAULT_DESCRIPTION),
+            **generator_options(self.config),
         )
-        generator.add_items(items)
+        self.publish_items(context, generator, items, feed=output_path.name)
         success = generator.generate(str(output_path))
         details = f"输出: {Path(output_path).name}" if success else "RSS 生成失败"
         return JobResult(name=self.name, success=success, details=details)
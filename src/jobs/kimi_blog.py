@@ -10,9 +10,13 @@ from urllib.parse import urljoin, urlparse
 import requests
 from bs4 import BeautifulSoup
 
+from src.head_metadata import parse_head_metadata
 from src.http_client import create_retry_session
+from src.item import Item
 from src.path_utils import resolve_output_path
-from src.rss_generator import RSSGenerator
+from src.rss_generator import RSSGenerator, generator_options
+from src.run_report import measure
+from src.tracing import current_span, span
 
 from .base import FeedJob, JobContext, JobResult
 from .registry import register_job
@@ -31,6 +35,7 @@ def create_session() -> requests.Session:
     )
 
 
+@measure("parse", "extract", extractor="kimi.index")
 def extract_article_urls_from_index(html: str, base_url: str = BLOG_URL) -> list[str]:
     """从 index 页面提取所有文章链接。"""
     # 从 __VP_HASH_MAP__ JavaScript 变量中提取页面列表
@@ -62,25 +67,27 @@ def extract_article_urls_from_index(html: str, base_url: str = BLOG_URL) -> list
     return urls
 
 
-def extract_article_item(url: str, html: str) -> Optional[dict]:
-    """从文章页面提取 RSS 条目。"""
-    soup = BeautifulSoup(html, "html.parser")
+@measure("parse", "extract", extractor="kimi.article")
+def extract_article_item(url: str, html: str) -> Optional[Item]:
+    """从文章页面提取 RSS 条目。
 
-    # 获取标题
-    title = None
-    if title_tag := soup.find("title"):
-        title = title_tag.get_text(strip=True)
+    标题与描述取自 ``<head>``；仅在缺少 meta 描述时才解析正文段落。
+    """
+    current_span().set(url=url)
+    head = parse_head_metadata(html)
 
+    # 获取标题
+    title = head.title
     if not title:
         return None
 
     # 获取描述
-    description = None
-    if meta_desc := soup.find("meta", attrs={"name": "description"}):
-        description = meta_desc.get("content", "").strip()
+    description = head.first_meta([("name", "description")])
 
     # 尝试从内容中提取第一段作为描述
     if not description:
+        with span("soup", "parse"):
+            soup = BeautifulSoup(html, "html.parser")
         # 查找第一个段落
         for p in soup.select("div.markdown p"):
             text = p.get_text(strip=True)
@@ -88,15 +95,7 @@ def extract_article_item(url: str, html: str) -> Optional[dict]:
                 description = text[:500]  # 截取前500字符
                 break
 
-    item = {
-        "title": title,
-        "link": url,
-    }
-
-    if description:
-        item["description"] = description
-
-    return item
+    return Item(title=title, link=url, description=description or "")
 
 
 @register_job
@@ -128,6 +127,9 @@ class KimiBlogJob(FeedJob):
         # 抓取每篇文章
         items = []
         for idx, article_url in enumerate(article_urls, start=1):
+            if context.cancelled:
+                logger.warning(f"已到截止时间，仅发布已解析的 {len(items)} 篇文章")
+                break
             logger.info(f"解析文章 {idx}/{len(article_urls)}: {article_url}")
             try:
                 resp = session.get(article_url, timeout=REQUEST_TIMEOUT)
@@ -139,7 +141,7 @@ class KimiBlogJob(FeedJob):
             item = extract_article_item(article_url, resp.text)
             if item:
                 items.append(item)
-                logger.info(f"  - {item.get('title', 'N/A')[:50]}")
+                logger.info(f"  - {item.title[:50]}")
 
         if not items:
             return JobResult(name=self.name, success=False, details="未能解析任何文章")
@@ -151,8 +153,9 @@ class KimiBlogJob(FeedJob):
             title=self.config.get("title", "Kimi Blog"),
             link=self.config.get("link", BLOG_URL),
             description=self.config.get("description", "Kimi Research Articles & Technical Blogs"),
+            **generator_options(self.config),
         )
-        generator.add_items(items)
+        self.publish_items(context, generator, items, feed=output_path.name)
 
         success = generator.generate(str(output_path))
         if not success:
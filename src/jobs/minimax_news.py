@@ -5,19 +5,24 @@ import json
 import logging
 import re
 from collections import deque
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Callable, Iterable, Optional
 from urllib.parse import urljoin, urlparse, urlunparse
 
 import requests
 from bs4 import BeautifulSoup
-from dateutil import parser as date_parser
 
+from src.concurrency import cancelled
+from src.dates import parse_datetime
+from src.head_metadata import HeadMetadata, parse_head_metadata
 from src.http_client import create_retry_session
+from src.item import Item
 from src.path_utils import resolve_output_path
-from src.rss_generator import RSSGenerator
+from src.rss_generator import RSSGenerator, generator_options
+from src.run_report import measure
 from src.runtime import setup_logging
+from src.tracing import current_span, span
 
 from .base import FeedJob, JobContext, JobResult
 from .registry import register_job
@@ -156,9 +161,12 @@ def _iter_json_strings(value: Any) -> Iterable[str]:
             stack.extend(current)
 
 
+@measure("parse", "extract", extractor="minimax.news_urls")
 def extract_news_urls_from_html(html: str, page_url: str = NEWS_URL) -> list[str]:
     """从 news 页面 HTML 中提取文章链接。"""
-    soup = BeautifulSoup(html, "html.parser")
+    current_span().set(url=page_url)
+    with span("soup", "parse"):
+        soup = BeautifulSoup(html, "html.parser")
     seen = set()
     urls = []
 
@@ -196,8 +204,9 @@ def extract_news_urls_from_html(html: str, page_url: str = NEWS_URL) -> list[str
                     add_url(candidate)
 
     # 最后回退：正则匹配字符串中的相对 news 路径
-    for candidate in _extract_news_urls_from_text(html, page_url):
-        add_url(candidate)
+    with span("regex_fallback", "parse"):
+        for candidate in _extract_news_urls_from_text(html, page_url):
+            add_url(candidate)
 
     return urls
 
@@ -211,25 +220,7 @@ def _parse_datetime(candidate: str) -> Optional[datetime]:
 
     normalized = text.replace("年", "-").replace("月", "-").replace("日", "")
     normalized = normalized.replace(".", "-").replace("/", "-")
-
-    try:
-        dt = date_parser.parse(normalized, fuzzy=True)
-    except Exception:
-        return None
-
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt
-
-
-def _first_meta(soup: BeautifulSoup, candidates: list[tuple[str, str]]) -> Optional[str]:
-    for attr_name, attr_value in candidates:
-        tag = soup.find("meta", attrs={attr_name: attr_value})
-        if tag and tag.get("content"):
-            content = tag.get("content", "").strip()
-            if content:
-                return content
-    return None
+    return parse_datetime(normalized, fuzzy=True)
 
 
 def _extract_json_ld(soup: BeautifulSoup) -> list[Any]:
@@ -249,22 +240,23 @@ def _extract_json_ld(soup: BeautifulSoup) -> list[Any]:
     return entries
 
 
-def _extract_publish_date(soup: BeautifulSoup) -> Optional[str]:
-    meta_date = _first_meta(
-        soup,
+def _extract_publish_date(head: HeadMetadata, body_soup: Callable[[], BeautifulSoup]) -> Optional[str]:
+    meta_date = head.first_meta(
         [
             ("property", "article:published_time"),
             ("property", "og:published_time"),
             ("name", "publish_date"),
             ("name", "date"),
             ("name", "dc.date"),
-        ],
+        ]
     )
     if meta_date:
         dt = _parse_datetime(meta_date)
         if dt is not None:
             return dt.isoformat()
 
+    # head 中没有可用日期时才回退到正文
+    soup = body_soup()
     for time_tag in soup.select("time"):
         candidate = time_tag.get("datetime") or time_tag.get_text(strip=True)
         dt = _parse_datetime(candidate)
@@ -281,11 +273,12 @@ def _extract_publish_date(soup: BeautifulSoup) -> Optional[str]:
                 if dt is not None:
                     return dt.isoformat()
 
-    text = soup.get_text(" ", strip=True)
-    for match in re.findall(r"(20\d{2}[./-]\d{1,2}[./-]\d{1,2}(?:[ T]\d{1,2}:\d{2}(?::\d{2})?)?)", text):
-        dt = _parse_datetime(match)
-        if dt is not None:
-            return dt.isoformat()
+    with span("regex_fallback", "parse"):
+        text = soup.get_text(" ", strip=True)
+        for match in re.findall(r"(20\d{2}[./-]\d{1,2}[./-]\d{1,2}(?:[ T]\d{1,2}:\d{2}(?::\d{2})?)?)", text):
+            dt = _parse_datetime(match)
+            if dt is not None:
+                return dt.isoformat()
 
     return None
 
@@ -295,55 +288,66 @@ def _fallback_title_from_url(url: str) -> str:
     return slug.replace("-", " ").strip().title()
 
 
+@measure("parse", "extract", extractor="minimax.article")
 def extract_article_item_from_html(
     url: str,
     html: str,
     response_url: Optional[str] = None,
 ) -> Optional[dict]:
-    """从文章页面提取 RSS 所需字段。"""
-    soup = BeautifulSoup(html, "html.parser")
+    """从文章页面提取 RSS 所需字段。
+
+    优先只解析 ``<head>``；标题、描述或日期缺失时才构建整页 soup 做正文回退。
+    """
+    current_span().set(url=url)
+    with span("head", "parse"):
+        head = parse_head_metadata(html)
+    soup: Optional[BeautifulSoup] = None
+
+    def body_soup() -> BeautifulSoup:
+        nonlocal soup
+        if soup is None:
+            with span("soup", "parse"):
+                soup = BeautifulSoup(html, "html.parser")
+        return soup
+
     effective_url = response_url or url
     normalized_effective_url = normalize_news_url(effective_url, base_url=url)
     if not normalized_effective_url:
         return None
 
-    canonical_tag = soup.find("link", attrs={"rel": "canonical"})
-    canonical_url = canonical_tag.get("href", "") if canonical_tag else ""
-    og_url = _first_meta(soup, [("property", "og:url")]) or ""
+    og_url = head.first_meta([("property", "og:url")]) or ""
     link = (
-        normalize_news_url(canonical_url, base_url=effective_url)
+        normalize_news_url(head.canonical, base_url=effective_url)
         or normalize_news_url(og_url, base_url=effective_url)
         or normalized_effective_url
     )
 
-    title = _first_meta(
-        soup,
+    title = head.first_meta(
         [
             ("property", "og:title"),
             ("name", "twitter:title"),
             ("name", "title"),
-        ],
+        ]
     )
     if not title:
-        if h1 := soup.select_one("h1"):
+        if h1 := body_soup().select_one("h1"):
             title = h1.get_text(strip=True)
-    if not title and soup.title:
-        title = soup.title.get_text(strip=True)
+    if not title:
+        title = head.title
     if not title:
         title = _fallback_title_from_url(link)
     if not title:
         return None
 
-    description = _first_meta(
-        soup,
+    description = head.first_meta(
         [
             ("property", "og:description"),
             ("name", "description"),
             ("name", "twitter:description"),
-        ],
+        ]
     )
     if not description:
-        if p_tag := soup.select_one("article p, main p"):
+        if p_tag := body_soup().select_one("article p, main p"):
             description = p_tag.get_text(" ", strip=True)
 
     item = {
@@ -353,11 +357,11 @@ def extract_article_item_from_html(
     if description:
         item["description"] = description
 
-    pub_date = _extract_publish_date(soup)
+    pub_date = _extract_publish_date(head, body_soup)
     if pub_date:
         item["pubDate"] = pub_date
 
-    author = _first_meta(soup, [("name", "author"), ("property", "article:author")])
+    author = head.first_meta([("name", "author"), ("property", "article:author")])
     if author:
         item["author"] = author
 
@@ -401,8 +405,9 @@ def _fetch_news_urls_from_sitemap(
         except requests.RequestException as exc:
             logger.warning(f"读取 sitemap 失败 {xml_url}: {exc}")
             return []
-        soup = BeautifulSoup(resp.text, "xml")
-        locs = [loc.get_text(strip=True) for loc in soup.find_all("loc")]
+        with measure("parse", "sitemap", url=xml_url):
+            soup = BeautifulSoup(resp.text, "xml")
+            locs = [loc.get_text(strip=True) for loc in soup.find_all("loc")]
         if locs:
             return locs
 
@@ -426,6 +431,9 @@ def _fetch_news_urls_from_sitemap(
 
     scanned = 0
     while sitemap_queue and scanned < max_sitemap_files:
+        if cancelled():
+            logger.warning("已到截止时间，停止扫描 sitemap")
+            break
         sitemap_url = sitemap_queue.popleft()
         if sitemap_url in seen_sitemaps:
             continue
@@ -460,6 +468,9 @@ def _crawl_related_news_urls(
             discovered.append(url)
 
     while queue and len(visited_pages) < max_discovery_pages:
+        if cancelled():
+            logger.warning("已到截止时间，停止递归发现文章链接")
+            break
         current_url = queue.popleft()
         if current_url in visited_pages:
             continue
@@ -543,6 +554,10 @@ class MiniMaxNewsJob(FeedJob):
         items = []
         seen_links = set()
         for idx, article_url in enumerate(article_urls, start=1):
+            if context.cancelled:
+                # 发布已解析的条目，不让后续 job 等待。
+                logger.warning(f"已到截止时间，仅发布已解析的 {len(items)} 篇文章")
+                break
             logger.info(f"解析文章 {idx}/{len(article_urls)}: {article_url}")
             item = _fetch_article_item(session, article_url, logger)
             if not item:
@@ -553,7 +568,7 @@ class MiniMaxNewsJob(FeedJob):
             seen_links.add(link)
             if not item.get("guid"):
                 item["guid"] = article_url
-            items.append(item)
+            items.append(Item.from_dict(item))
             if len(items) >= max_items:
                 break
 
@@ -567,8 +582,9 @@ class MiniMaxNewsJob(FeedJob):
             title=self.config.get("title", "MiniMax News"),
             link=self.config.get("link", NEWS_URL),
             description=self.config.get("description", "Latest news and updates from MiniMax"),
+            **generator_options(self.config),
         )
-        generator.add_items(ordered_items)
+        self.publish_items(context, generator, ordered_items, feed=output_path.name)
 
         success = generator.generate(str(output_path))
         if not success:
@@ -1,13 +1,18 @@
 """MiniMax Releases RSS 任务 - 整合 HuggingFace 模型发布与 GitHub 仓库."""
 
+import json
 import logging
+from pathlib import Path
 from typing import Optional
 
 import requests
 
+from src.concurrency import ContextThreadPoolExecutor
+from src.http_cache import ConditionalCache
 from src.http_client import create_retry_session
+from src.item import Item
 from src.path_utils import resolve_output_path
-from src.rss_generator import RSSGenerator
+from src.rss_generator import RSSGenerator, feed_paths, generator_options, record_published_feed
 
 from .base import FeedJob, JobContext, JobResult
 from .registry import register_job
@@ -38,10 +43,12 @@ def _hf_session(retries: int, backoff_factor: float) -> requests.Session:
 
 def _fetch_hf_resources(
     session: requests.Session,
+    cache: ConditionalCache,
     resource_type: str,
     max_items: int,
     logger: logging.Logger,
-) -> list[dict]:
+) -> tuple[list[dict], bool]:
+    """返回 (资源列表, 是否 304 未变化)。"""
     url = f"{HF_API_BASE}/{resource_type}"
     params = {
         "author": HF_ORG,
@@ -50,18 +57,17 @@ def _fetch_hf_resources(
         "limit": max_items,
     }
     try:
-        resp = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        return resp.json()
+        resp = cache.get(session, url, params=params, timeout=REQUEST_TIMEOUT)
+        return _json_list(resp.text), resp.not_modified
     except requests.RequestException as exc:
         logger.warning(f"获取 HuggingFace {resource_type} 失败: {exc}")
-        return []
+        return [], False
     except ValueError as exc:
         logger.warning(f"解析 HuggingFace {resource_type} JSON 失败: {exc}")
-        return []
+        return [], False
 
 
-def _hf_resource_to_item(resource: dict, resource_type: str) -> Optional[dict]:
+def _hf_resource_to_item(resource: dict, resource_type: str) -> Optional[Item]:
     resource_id = resource.get("id", "")
     if not resource_id:
         return None
@@ -78,13 +84,12 @@ def _hf_resource_to_item(resource: dict, resource_type: str) -> Optional[dict]:
     if tags:
         parts.append(f"Tags: {', '.join(tags[:5])}")
 
-    return {
-        "title": name,
-        "link": link,
-        "guid": link,
-        "pubDate": resource.get("createdAt"),
-        "description": " | ".join(parts),
-    }
+    return Item(
+        title=name,
+        link=link,
+        published=resource.get("createdAt"),
+        description=" | ".join(parts),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -101,9 +106,11 @@ def _github_session(retries: int, backoff_factor: float) -> requests.Session:
 
 def _fetch_github_repos(
     session: requests.Session,
+    cache: ConditionalCache,
     max_items: int,
     logger: logging.Logger,
-) -> list[dict]:
+) -> tuple[list[dict], bool]:
+    """返回 (仓库列表, 是否 304 未变化)；304 不计入 GitHub 未认证限流额度。"""
     url = f"{GITHUB_API_BASE}/orgs/{GITHUB_ORG}/repos"
     params = {
         "sort": "created",
@@ -112,18 +119,17 @@ def _fetch_github_repos(
         "type": "public",
     }
     try:
-        resp = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        return resp.json()
+        resp = cache.get(session, url, params=params, timeout=REQUEST_TIMEOUT)
+        return _json_list(resp.text), resp.not_modified
     except requests.RequestException as exc:
         logger.warning(f"获取 GitHub 仓库列表失败: {exc}")
-        return []
+        return [], False
     except ValueError as exc:
         logger.warning(f"解析 GitHub 仓库 JSON 失败: {exc}")
-        return []
+        return [], False
 
 
-def _repo_to_item(repo: dict) -> Optional[dict]:
+def _repo_to_item(repo: dict) -> Optional[Item]:
     name = repo.get("name", "")
     html_url = repo.get("html_url", "")
     if not name or not html_url:
@@ -140,13 +146,19 @@ def _repo_to_item(repo: dict) -> Optional[dict]:
     if topics:
         parts.append(f"Topics: {', '.join(topics)}")
 
-    return {
-        "title": name,
-        "link": html_url,
-        "guid": html_url,
-        "pubDate": repo.get("created_at"),
-        "description": " | ".join(parts),
-    }
+    return Item(
+        title=name,
+        link=html_url,
+        published=repo.get("created_at"),
+        description=" | ".join(parts),
+    )
+
+
+def _json_list(text: str) -> list[dict]:
+    payload = json.loads(text)
+    if not isinstance(payload, list):
+        raise ValueError("响应不是 JSON 数组")
+    return payload
 
 
 # ---------------------------------------------------------------------------
@@ -168,23 +180,43 @@ class MiniMaxReleasesJob(FeedJob):
         retries = int(options.get("retries", 2))
         backoff_factor = float(options.get("backoff_factor", 0.5))
 
-        items: list[dict] = []
-
-        # --- HuggingFace ---
+        cache = ConditionalCache(context.state_path("http", f"{Path(output_file).stem}.json"))
         hf_session = _hf_session(retries, backoff_factor)
-        for resource_type in resource_types:
-            logger.info(f"从 HuggingFace 获取 {HF_ORG} 的 {resource_type}...")
-            resources = _fetch_hf_resources(hf_session, resource_type, max_items, logger)
+        gh_session = _github_session(retries, backoff_factor)
+
+        # HuggingFace 各资源类型与 GitHub 并发请求
+        with ContextThreadPoolExecutor(max_workers=len(resource_types) + 1) as executor:
+            hf_futures = []
+            for resource_type in resource_types:
+                logger.info(f"从 HuggingFace 获取 {HF_ORG} 的 {resource_type}...")
+                hf_futures.append(
+                    (
+                        resource_type,
+                        executor.submit(_fetch_hf_resources, hf_session, cache, resource_type, max_items, logger),
+                    )
+                )
+            logger.info(f"从 GitHub 获取 {GITHUB_ORG} 的公开仓库...")
+            gh_future = executor.submit(_fetch_github_repos, gh_session, cache, max_items, logger)
+
+            hf_results = [(resource_type, future.result()) for resource_type, future in hf_futures]
+            repos, repos_not_modified = gh_future.result()
+        cache.save()
+
+        all_not_modified = repos_not_modified and all(not_modified for _, (_, not_modified) in hf_results)
+        published_paths = feed_paths(output_path, self.config.get("formats")).values()
+        if all_not_modified and all(path.exists() for path in published_paths):
+            logger.info("MiniMax Releases 所有来源均返回 304，跳过生成")
+            record_published_feed(output_path)
+            return JobResult(name=self.name, success=True, details=f"未变化: {output_path}")
+
+        items: list[Item] = []
+        for resource_type, (resources, _) in hf_results:
             logger.info(f"  获取到 {len(resources)} 条 {resource_type}")
             for resource in resources:
                 item = _hf_resource_to_item(resource, resource_type)
                 if item:
                     items.append(item)
 
-        # --- GitHub ---
-        gh_session = _github_session(retries, backoff_factor)
-        logger.info(f"从 GitHub 获取 {GITHUB_ORG} 的公开仓库...")
-        repos = _fetch_github_repos(gh_session, max_items, logger)
         logger.info(f"获取到 {len(repos)} 个仓库")
         for repo in repos:
             item = _repo_to_item(repo)
@@ -199,7 +231,7 @@ class MiniMaxReleasesJob(FeedJob):
             )
 
         # Sort all items by pubDate descending, items without date go last
-        items.sort(key=lambda x: x.get("pubDate") or "", reverse=True)
+        items.sort(key=lambda item: item.sort_key, reverse=True)
         items = items[:max_items]
 
         generator = RSSGenerator(
@@ -209,8 +241,9 @@ class MiniMaxReleasesJob(FeedJob):
                 "description",
                 "MiniMax model releases on HuggingFace and new GitHub repositories",
             ),
+            **generator_options(self.config),
         )
-        generator.add_items(items)
+        self.publish_items(context, generator, items, feed=output_path.name)
 
         success = generator.generate(str(output_path))
         if not success:
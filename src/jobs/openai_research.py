@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional
 
 from src.path_utils import resolve_output_path
+from src.rss_generator import generator_options
 from src.rss_filter import RSSFilter
 from src.runtime import setup_logging
 
@@ -44,6 +45,8 @@ class OpenAIResearchFilterJob(FeedJob):
             output_path=str(output_path),
             title=self.config.get("title", "OpenAI Research Only"),
             description=self.config.get("description", "OpenAI 官方 RSS - 仅研究内容"),
+            publish=lambda generator, items: self.publish_items(context, generator, items, feed=output_path.name),
+            feed_options=generator_options(self.config),
         )
         details = f"输出: {output_path}" if success else "过滤失败"
         return JobResult(name=self.name, success=success, details=details)
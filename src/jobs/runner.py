@@ -1,8 +1,17 @@
 """Unified runner for all config-driven jobs."""
 
 import logging
+import time
+from dataclasses import replace
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
+
+from src import metrics
+from src.concurrency import CancelToken, cancellation_scope, current_token
+from src.http_client import coalesce_fetches
+from src.item_store import ItemStore
+from src.run_report import JobStats, RunReport, job_stats_scope
+from src.tracing import span
 
 # Ensure built-in jobs are registered even when importing runner directly.
 from . import codex_changelog as _codex_changelog  # noqa: F401
@@ -11,47 +20,99 @@ from . import minimax_releases as _minimax_releases  # noqa: F401
 from . import openai_research as _openai_research  # noqa: F401
 from . import selector_scrape as _selector_scrape  # noqa: F401
 from . import waymo_blog as _waymo_blog  # noqa: F401
-from .base import JobContext
+from .base import JobContext, JobResult
 from .registry import create_job
 
 logger = logging.getLogger(__name__)
 
+ITEM_STORE_FILENAME = "items.sqlite3"
+
 
 class JobRunner:
     """Execute configured jobs and aggregate result status."""
 
-    def __init__(self, feeds_dir: str):
+    def __init__(self, feeds_dir: str, state_dir: Optional[str] = None, job_deadline: Optional[float] = None):
+        """
+        Args:
+            job_deadline: 每个 job 的默认时间预算（秒）；job 可用 ``deadline`` 单独配置，None 表示不限
+        """
         self.feeds_dir = Path(feeds_dir)
+        self.job_deadline = job_deadline
+        # 最近一次 run_jobs 的耗时报告
+        self.last_report: Optional[RunReport] = None
         self.feeds_dir.mkdir(parents=True, exist_ok=True)
+        self.state_dir = Path(state_dir) if state_dir else None
+        if self.state_dir is not None:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+
+    def _open_item_store(self, job_configs: list[dict]) -> Optional[ItemStore]:
+        if self.state_dir is None:
+            return None
+        if not any(config.get("history") and config.get("enabled", True) for config in job_configs):
+            return None
+        return ItemStore(self.state_dir / ITEM_STORE_FILENAME)
 
-    def run_jobs(self, job_configs: list[dict]) -> Dict[str, bool]:
+    def run_jobs(self, job_configs: list[dict], *, report: Optional[RunReport] = None) -> Dict[str, bool]:
+        """
+        Args:
+            report: 把本次统计累积到已有报告（常驻模式跨多次调用汇总）；默认每次新建
+        """
         results: Dict[str, bool] = {}
-        context = JobContext(feeds_dir=self.feeds_dir)
-
-        for config in job_configs:
-            if not config.get("enabled", True):
-                name = str(config.get("name") or config.get("type") or "未命名")
-                logger.info(f"跳过已禁用 job: {name}")
-                continue
-
-            fallback_name = str(config.get("name") or config.get("type") or "未命名")
-            try:
-                job = create_job(config)
-            except Exception as exc:
-                logger.error(f"{fallback_name}: job 配置错误 - {exc}")
-                results[fallback_name] = False
-                continue
-
-            try:
-                result = job.run(context)
-            except Exception as exc:
-                logger.error(f"{job.name}: 执行异常 - {exc}")
-                results[job.name] = False
-                continue
-
-            results[result.name] = result.success
-            if not result.success and result.details:
-                logger.error(f"{result.name}: {result.details}")
+        rolling = report is not None
+        report = report if rolling else RunReport(started_at=time.time())
+        item_store = self._open_item_store(job_configs)
+        context = JobContext(feeds_dir=self.feeds_dir, state_dir=self.state_dir, item_store=item_store)
+
+        try:
+            # 同一轮内相同 URL + headers 的 GET 只真正请求一次。
+            with coalesce_fetches() as fetch_cache, span("run", jobs=len(job_configs)):
+                for config in job_configs:
+                    if not config.get("enabled", True):
+                        name = str(config.get("name") or config.get("type") or "未命名")
+                        logger.info(f"跳过已禁用 job: {name}")
+                        continue
+
+                    fallback_name = str(config.get("name") or config.get("type") or "未命名")
+                    try:
+                        job = create_job(config)
+                    except Exception as exc:
+                        logger.error(f"{fallback_name}: job 配置错误 - {exc}")
+                        results[fallback_name] = False
+                        continue
+
+                    deadline = config.get("deadline", self.job_deadline)
+                    # 调度器为每次运行设置的上级 token（配置移除 / 变更时取消）同样生效。
+                    token = CancelToken(float(deadline) if deadline else None, parent=current_token())
+                    stats = JobStats(name=job.name)
+                    report.add(stats, replace=rolling)
+                    started = time.perf_counter()
+                    try:
+                        with cancellation_scope(token), job_stats_scope(stats), span("job", job=job.name) as job_span:
+                            result = job.run(replace(context, cancel_token=token))
+                            job_span.set(success=result.success, requests=stats.requests, items=stats.items)
+                    except Exception as exc:
+                        logger.error(f"{job.name}: 执行异常 - {exc}")
+                        result = JobResult(name=job.name, success=False)
+                    finally:
+                        stats.wall_time = time.perf_counter() - started
+                        if token.cancelled:
+                            logger.warning(f"{job.name}: {token.reason}，已提前结束")
+                    stats.name = result.name
+                    stats.success = result.success
+                    metrics.record_job(result.name, result.success, stats.wall_time)
+
+                    results[result.name] = result.success
+                    if not result.success and result.details:
+                        logger.error(f"{result.name}: {result.details}")
+        finally:
+            if item_store is not None:
+                item_store.close()
+
+        report.finished_at = time.time()
+        self.last_report = report
+
+        if fetch_cache.hits:
+            logger.info(f"本轮复用了 {fetch_cache.hits} 次重复请求")
 
         if results:
             success_count = sum(1 for ok in results.values() if ok)
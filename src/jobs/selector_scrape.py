@@ -17,7 +17,12 @@ class SelectorScrapeJob(FeedJob):
     job_type = "selector_scrape"
 
     def run(self, context: JobContext) -> JobResult:
-        creator = FeedCreator(feeds_dir=str(context.feeds_dir))
+        state_dir = str(context.state_dir) if context.state_dir is not None else None
+        creator = FeedCreator(feeds_dir=str(context.feeds_dir), state_dir=state_dir, item_store=context.item_store)
         success = creator.create_feed(self.config)
-        details = f"输出: {self.config.get('output', f'{self.name}.xml')}" if success else "抓取或生成失败"
+        if self.config.get("outputs"):
+            outputs = ", ".join(str(entry.get("output")) for entry in self.config["outputs"])
+        else:
+            outputs = self.config.get("output", f"{self.name}.xml")
+        details = f"输出: {outputs}" if success else "抓取或生成失败"
         return JobResult(name=self.name, success=success, details=details)
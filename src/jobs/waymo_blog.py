@@ -1,15 +1,19 @@
 """Waymo Blog Technology job."""
 
 import argparse
+import json
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import requests
 
+from src.http_cache import ConditionalCache
 from src.http_client import create_retry_session
-from src.path_utils import resolve_output_path
-from src.rss_generator import RSSGenerator
+from src.item import Item
+from src.path_utils import resolve_output_path, safe_filename
+from src.rss_generator import RSSGenerator, feed_paths, generator_options, record_published_feed
+from src.run_report import measure
 from src.runtime import setup_logging
 
 from .base import FeedJob, JobContext, JobResult
@@ -25,6 +29,50 @@ logger = logging.getLogger(__name__)
 DEFAULT_FEEDS_DIR = Path(__file__).resolve().parents[2] / "feeds"
 
 
+def _create_session(options: dict[str, Any]) -> requests.Session:
+    return create_retry_session(
+        user_agent=options.get("user_agent"),
+        accept="application/json",
+        retries=int(options.get("retries", 2)),
+        backoff_factor=float(options.get("backoff_factor", 0.5)),
+    )
+
+
+@measure("parse")
+def _posts_to_items(posts: list[dict], base_url: str, max_items: int) -> list[Item]:
+    """按日期取最新的 max_items 篇，并按 feedgen 栈顺序（旧→新）转换为条目。"""
+    latest_posts = sorted(posts, key=lambda post: post.get("date", ""), reverse=True)[:max_items]
+    latest_posts.reverse()
+
+    items = []
+    for post in latest_posts:
+        url = post.get("url", "")
+        if url and not url.startswith("http"):
+            url = base_url + url
+
+        items.append(
+            Item(
+                title=post.get("title", ""),
+                link=url,
+                description=post.get("summary", ""),
+                published=post.get("date", ""),
+                author=post.get("author", ""),
+            )
+        )
+    return items
+
+
+def index_posts_by_tag(posts: list[dict], tags: list[str]) -> dict[str, list[dict]]:
+    """单次遍历 posts，为每个关注的 tag 建立文章索引。"""
+    index: dict[str, list[dict]] = {tag: [] for tag in tags}
+    for post in posts:
+        for tag in set(post.get("tags") or ()):
+            bucket = index.get(tag)
+            if bucket is not None:
+                bucket.append(post)
+    return index
+
+
 @register_job
 class WaymoBlogTechnologyJob(FeedJob):
     job_type = "waymo_blog_technology"
@@ -40,12 +88,7 @@ class WaymoBlogTechnologyJob(FeedJob):
         output_path = resolve_output_path(context.feeds_dir, output_file)
         logger.info("正在从 Waymo Blog API 获取文章...")
 
-        session = create_retry_session(
-            user_agent=options.get("user_agent"),
-            accept="application/json",
-            retries=int(options.get("retries", 2)),
-            backoff_factor=float(options.get("backoff_factor", 0.5)),
-        )
+        session = _create_session(options)
 
         try:
             response = session.get(api_url, timeout=int(options.get("timeout", 15)))
@@ -60,27 +103,9 @@ class WaymoBlogTechnologyJob(FeedJob):
         logger.info(f"Waymo API 返回 {len(posts)} 篇文章")
 
         tech_posts = [post for post in posts if tag in post.get("tags", [])]
-        tech_posts.sort(key=lambda post: post.get("date", ""), reverse=True)
         logger.info(f"过滤后 {len(tech_posts)} 篇 {tag} 文章")
 
-        latest_posts = tech_posts[:max_items]
-        latest_posts.reverse()
-
-        items = []
-        for post in latest_posts:
-            url = post.get("url", "")
-            if url and not url.startswith("http"):
-                url = base_url + url
-
-            items.append(
-                {
-                    "title": post.get("title", ""),
-                    "link": url,
-                    "description": post.get("summary", ""),
-                    "pubDate": post.get("date", ""),
-                    "author": post.get("author", ""),
-                }
-            )
+        items = _posts_to_items(tech_posts, base_url, max_items)
 
         if not items:
             return JobResult(name=self.name, success=False, details=f"未找到任何 {tag} 文章")
@@ -89,13 +114,94 @@ class WaymoBlogTechnologyJob(FeedJob):
             title=self.config.get("title", "Waymo Blog - Technology"),
             link=self.config.get("link", "https://waymo.com/blog/search/?t=Technology"),
             description=self.config.get("description", "Waymo Blog Technology 分类文章"),
+            **generator_options(self.config),
         )
-        generator.add_items(items)
+        self.publish_items(context, generator, items, feed=output_path.name)
         success = generator.generate(str(output_path))
         details = f"输出: {output_path}" if success else "RSS 生成失败"
         return JobResult(name=self.name, success=success, details=details)
 
 
+@register_job
+class WaymoBlogTagsJob(FeedJob):
+    """Fan out one Waymo Blog API response into one feed per tag."""
+
+    job_type = "waymo_blog_tags"
+
+    def run(self, context: JobContext) -> JobResult:
+        options = self.config.get("options", {})
+        api_url = self.config.get("api_url", DEFAULT_API_URL)
+        base_url = self.config.get("base_url", DEFAULT_BASE_URL)
+        max_items = int(options.get("max_items", DEFAULT_MAX_ITEMS))
+        outputs, skipped = [], []
+        for index, entry in enumerate(self.config.get("outputs") or []):
+            if isinstance(entry, dict) and entry.get("tag"):
+                outputs.append(entry)
+            else:
+                # 配置笔误不应让某个 feed 悄无声息地消失：其余 tag 照常生成，job 记为失败。
+                logger.error(f"{self.name}: outputs[{index}] 缺少 tag，已跳过")
+                skipped.append(f"outputs[{index}] 缺少 tag")
+        if not outputs:
+            return JobResult(name=self.name, success=False, details="outputs 为空或缺少 tag")
+
+        output_paths = [
+            resolve_output_path(context.feeds_dir, entry.get("output") or f"waymo_blog_{entry['tag'].lower()}.xml")
+            for entry in outputs
+        ]
+        cache = ConditionalCache(context.state_path("http", f"{safe_filename(self.name, 'waymo_blog')}.json"))
+        logger.info(f"正在从 Waymo Blog API 获取文章（{len(outputs)} 个 tag）...")
+
+        try:
+            response = cache.get(_create_session(options), api_url, timeout=int(options.get("timeout", 15)))
+            payload = json.loads(response.text)
+        except requests.RequestException as exc:
+            return JobResult(name=self.name, success=False, details=f"调用 Waymo API 失败: {exc}")
+        except ValueError as exc:
+            return JobResult(name=self.name, success=False, details=f"Waymo API 返回非法 JSON: {exc}")
+        finally:
+            cache.save()
+
+        published_paths = [
+            path
+            for entry, output_path in zip(outputs, output_paths)
+            for path in feed_paths(output_path, {**self.config, **entry}.get("formats")).values()
+        ]
+        if response.not_modified and all(path.exists() for path in published_paths):
+            logger.info("Waymo Blog API 返回 304，跳过生成")
+            for output_path in output_paths:
+                record_published_feed(output_path)
+            return JobResult(name=self.name, success=not skipped, details="; ".join(["未变化"] + skipped))
+
+        posts = payload.get("posts", [])
+        logger.info(f"Waymo API 返回 {len(posts)} 篇文章")
+        index = index_posts_by_tag(posts, [entry["tag"] for entry in outputs])
+
+        written, failed = [], []
+        for entry, output_path in zip(outputs, output_paths):
+            tag = entry["tag"]
+            items = _posts_to_items(index[tag], base_url, max_items)
+            logger.info(f"{tag}: {len(index[tag])} 篇文章")
+            if not items:
+                failed.append(f"未找到任何 {tag} 文章")
+                continue
+
+            generator = RSSGenerator(
+                title=entry.get("title", f"Waymo Blog - {tag}"),
+                link=entry.get("link", f"https://waymo.com/blog/search/?t={tag}"),
+                description=entry.get("description", f"Waymo Blog {tag} 分类文章"),
+                **generator_options({**self.config, **entry}),
+            )
+            self.publish_items(context, generator, items, feed=output_path.name)
+            if generator.generate(str(output_path)):
+                written.append(output_path.name)
+            else:
+                failed.append(f"{output_path.name} RSS 生成失败")
+
+        failed.extend(skipped)
+        details = "; ".join(([f"输出: {', '.join(written)}"] if written else []) + failed)
+        return JobResult(name=self.name, success=not failed, details=details)
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="Fetch Waymo Blog Technology posts and generate RSS")
     parser.add_argument("--max-items", type=int, default=DEFAULT_MAX_ITEMS, help="Maximum feed items")
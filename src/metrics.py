@@ -0,0 +1,262 @@
+"""Prometheus metrics for jobs, HTTP requests and feed freshness.
+
+Metrics accumulate in the process-wide :data:`REGISTRY`. One-shot runs write
+it in the node-exporter textfile format; the daemon and workers serve it at
+``/metrics``. The text exposition format is small enough to render here, so no
+client library is needed.
+
+Freshness is exported as Unix timestamps rather than ages, so a textfile
+written once stays correct: alert on ``time() - rss_feed_newest_item_timestamp_seconds``.
+"""
+
+import logging
+import math
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterable, Optional
+from urllib.parse import urlsplit
+
+from .path_utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+JOB_DURATION_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600)
+REQUEST_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 需要标签 {self.labelnames}，收到 {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        with self._lock:
+            return [(self.name, tuple(zip(self.labelnames, key)), value) for key, value in sorted(self._values.items())]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), *, buckets: Iterable[float]):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        rows = []
+        for _, labels, (counts, total) in super().samples():
+            for bound, count in zip(self.buckets, counts):
+                rows.append((f"{self.name}_bucket", labels + (("le", _format_value(bound)),), count))
+            rows.append((f"{self.name}_sum", labels, total))
+            rows.append((f"{self.name}_count", labels, counts[-1]))
+        return rows
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def clear(self):
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        """按 Prometheus 文本格式（0.0.4）输出全部指标。"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+                lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if labels else f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str | Path) -> Path:
+        """写入 node-exporter textfile collector 可读取的 ``.prom`` 文件（原子替换）。"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, self.render())
+        return path
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+
+JOB_DURATION = REGISTRY.register(Histogram(
+    "rss_job_duration_seconds", "Wall time of one job run.", ("job",), buckets=JOB_DURATION_BUCKETS
+))
+JOB_RUNS = REGISTRY.register(Counter("rss_job_runs_total", "Job runs by result.", ("job", "result")))
+JOB_LAST_SUCCESS = REGISTRY.register(Gauge(
+    "rss_job_last_success_timestamp_seconds", "Unix time the job last succeeded.", ("job",)
+))
+REQUEST_DURATION = REGISTRY.register(Histogram(
+    "rss_http_request_duration_seconds", "Latency of HTTP requests sent over the network.", ("host",),
+    buckets=REQUEST_DURATION_BUCKETS,
+))
+REQUESTS = REGISTRY.register(Counter("rss_http_requests_total", "HTTP requests by status code.", ("host", "code")))
+RESPONSE_BYTES = REGISTRY.register(Counter("rss_http_response_bytes_total", "Response body bytes downloaded.", ("host",)))
+RETRIES = REGISTRY.register(Counter("rss_http_retries_total", "Retries made by the session retry policy.", ("host",)))
+CACHE_HITS = REGISTRY.register(Counter(
+    "rss_fetch_cache_hits_total", "GETs answered by the run fetch cache without a request.", ("host",)
+))
+CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    "rss_fetch_cache_hit_ratio", "Share of GETs answered by the run fetch cache since process start."
+))
+FEED_NEWEST_ITEM = REGISTRY.register(Gauge(
+    "rss_feed_newest_item_timestamp_seconds", "Publication time of the newest item in the feed.", ("feed",)
+))
+FEED_LAST_BUILD = REGISTRY.register(Gauge(
+    "rss_feed_last_build_timestamp_seconds", "Unix time the feed file was last written.", ("feed",)
+))
+FEED_ITEMS = REGISTRY.register(Gauge("rss_feed_items", "Items written to the feed.", ("feed",)))
+
+_ratio_lock = threading.Lock()
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).hostname or ""
+
+
+def _update_hit_ratio():
+    with _ratio_lock:
+        hits = CACHE_HITS.total()
+        CACHE_HIT_RATIO.set(hits / (hits + REQUESTS.total()))
+
+
+def record_job(name: str, success: bool, wall_time: float):
+    JOB_DURATION.observe(wall_time, job=name)
+    JOB_RUNS.inc(job=name, result="success" if success else "failure")
+    if success:
+        JOB_LAST_SUCCESS.set(time.time(), job=name)
+
+
+def record_request(url: str, *, status: Optional[int], size: int, elapsed: float):
+    host = _host(url)
+    REQUESTS.inc(host=host, code=str(status) if status is not None else "error")
+    if status is not None:
+        REQUEST_DURATION.observe(elapsed, host=host)
+        RESPONSE_BYTES.inc(size, host=host)
+    _update_hit_ratio()
+
+
+def record_cache_hit(url: str):
+    CACHE_HITS.inc(host=_host(url))
+    _update_hit_ratio()
+
+
+def record_retry(host: str):
+    RETRIES.inc(host=host)
+
+
+def record_feed(path: str | Path, *, items: int, newest: Optional[datetime], built_at: Optional[float] = None):
+    feed = Path(path).name
+    FEED_LAST_BUILD.set(time.time() if built_at is None else built_at, feed=feed)
+    FEED_ITEMS.set(items, feed=feed)
+    if newest is not None:
+        FEED_NEWEST_ITEM.set(newest.timestamp(), feed=feed)
+
+
+def metrics_options(config: dict) -> Optional[dict[str, Any]]:
+    """
+    读取顶层 ``metrics`` 配置：``{textfile: path, port: 9108, host: 127.0.0.1}``
+
+    Returns:
+        未配置或 ``enabled: false`` 时返回 None
+    """
+    value = config.get("metrics")
+    if not isinstance(value, dict) or value.get("enabled") is False:
+        return None
+    return {
+        "textfile": value.get("textfile"),
+        "port": int(value["port"]) if value.get("port") is not None else None,
+        "host": str(value.get("host", DEFAULT_METRICS_HOST)),
+    }
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"metrics: {format % args}")
+
+
+def start_metrics_server(port: int, host: str = DEFAULT_METRICS_HOST, registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """在后台线程提供 ``/metrics``；调用方负责 ``shutdown()`` 与 ``server_close()``。"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info(f"指标服务已启动: http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -2,17 +2,19 @@
 
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
-from datetime import timezone
-from dateutil import parser as date_parser
 from urllib.parse import urljoin
 import logging
 
+from .dates import format_rss_date
+from .run_report import measure
+
 logger = logging.getLogger(__name__)
 
 
 class HTMLParser:
     """HTML 解析器"""
 
+    @measure("parse", "soup")
     def __init__(self, html: str, base_url: str = ""):
         """
         初始化解析器
@@ -24,6 +26,7 @@ class HTMLParser:
         self.soup = BeautifulSoup(html, "lxml")
         self.base_url = base_url.rstrip("/")
 
+    @measure("parse")
     def parse_items(self, selectors: Dict[str, str], max_items: int = 20) -> List[Dict[str, str]]:
         """
         解析网页内容为结构化数据
@@ -121,11 +124,5 @@ class HTMLParser:
 
     def _parse_date(self, date_string: str) -> Optional[str]:
         """解析日期字符串为 RSS 格式"""
-        try:
-            dt = date_parser.parse(date_string)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt.strftime("%a, %d %b %Y %H:%M:%S %z")
-        except Exception:
-            # 日期解析失败时返回 None，避免把旧内容伪装成最新内容
-            return None
+        # 日期解析失败时返回 None，避免把旧内容伪装成最新内容
+        return format_rss_date(date_string)
@@ -1,5 +1,9 @@
 """Path helpers."""
 
+import hashlib
+import os
+import re
+import threading
 from pathlib import Path
 
 
@@ -18,3 +22,31 @@ def resolve_output_path(feeds_dir: str | Path, output: str) -> Path:
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
     return output_path
+
+
+def safe_filename(name: str, default: str = "job") -> str:
+    """Turn a job name into a stable, filesystem-safe file stem.
+
+    A short hash of the original name keeps names that normalise to the same
+    stem (non-ASCII names, "A B" and "a-b") in separate files.
+    """
+    stem = re.sub(r"[^0-9A-Za-z]+", "_", name.lower()).strip("_") or default
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+    return f"{stem}_{digest}"
+
+
+def write_atomic(path: str | Path, data: bytes | str):
+    """
+    原子写入：先写同目录临时文件再替换
+
+    读者只会看到完整的旧文件或新文件；多个进程/线程同时写同一路径时以最后一次替换为准，
+    临时文件名包含进程与线程号，互不覆盖。
+    """
+    path = Path(path)
+    payload = data.encode("utf-8") if isinstance(data, str) else data
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
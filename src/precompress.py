@@ -0,0 +1,134 @@
+"""Precompressed ``.gz`` / ``.br`` siblings for published feeds.
+
+Static servers (nginx ``gzip_static``/``brotli_static``, most CDNs) can serve
+these directly instead of compressing every response on the fly. A manifest
+in the feeds directory records each source's fingerprint and the resulting
+sizes, so unchanged files are not recompressed.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # 可选依赖：未安装时只生成 .gz
+    brotli = None
+
+from .path_utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "precompressed.json"
+DEFAULT_PATTERNS = ("*.xml", "*.atom", "*.json", "*.html")
+# 太小的文件压缩后节省有限，反而多一次磁盘/网络往返。
+DEFAULT_MIN_SIZE = 256
+_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def precompress_options(config: dict) -> Optional[dict[str, Any]]:
+    """Return keyword options from the top-level ``precompress`` config, or None when disabled."""
+    value = config.get("precompress", True)
+    if value is False or (isinstance(value, dict) and value.get("enabled") is False):
+        return None
+    if not isinstance(value, dict):
+        return {}
+    options: dict[str, Any] = {}
+    if "patterns" in value:
+        options["patterns"] = tuple(value["patterns"])
+    if "min_size" in value:
+        options["min_size"] = int(value["min_size"])
+    return options
+
+
+def precompress_feeds(
+    feeds_dir: str | Path,
+    *,
+    patterns: Iterable[str] = DEFAULT_PATTERNS,
+    min_size: int = DEFAULT_MIN_SIZE,
+) -> dict[str, Any]:
+    """
+    为 feeds 目录中的输出文件生成压缩副本
+
+    只在源文件指纹变化或压缩副本缺失时重新压缩；源文件已删除时清理对应副本。
+
+    Returns:
+        写入 ``precompressed.json`` 的清单
+    """
+    root = Path(feeds_dir)
+    manifest_path = root / MANIFEST_NAME
+    previous = _load_manifest(manifest_path)
+    encodings = _encodings()
+
+    files: dict[str, dict[str, Any]] = {}
+    compressed = 0
+    for path in _iter_sources(root, patterns):
+        name = path.relative_to(root).as_posix()
+        data = path.read_bytes()
+        if len(data) < min_size:
+            _remove_siblings(path)
+            continue
+
+        fingerprint = hashlib.sha256(data).hexdigest()
+        old = previous.get(name) or {}
+        entry: dict[str, Any] = {"sha256": fingerprint, "size": len(data)}
+        changed = old.get("sha256") != fingerprint
+        for encoding, (suffix, compress) in encodings.items():
+            sibling = _sibling(path, suffix)
+            if changed or encoding not in old or not sibling.exists():
+                write_atomic(sibling, compress(data))
+                compressed += 1
+            entry[encoding] = sibling.stat().st_size
+        if changed:
+            # 旧的 .br 在 brotli 不可用时无法更新，删除以免内容过期。
+            for encoding, suffix in _SUFFIXES.items():
+                if encoding not in encodings:
+                    _sibling(path, suffix).unlink(missing_ok=True)
+        files[name] = entry
+
+    for name in previous.keys() - files.keys():
+        _remove_siblings(root / name)
+
+    manifest = {"version": 1, "files": files}
+    write_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8"))
+    if compressed:
+        total = sum(entry["size"] for entry in files.values())
+        total_gzip = sum(entry.get("gzip", 0) for entry in files.values())
+        logger.info(f"预压缩 {compressed} 个文件（gzip 总计 {total_gzip}/{total} 字节）")
+    return manifest
+
+
+def _encodings() -> dict[str, tuple[str, Any]]:
+    # mtime=0 使相同输入产生相同的 .gz，便于缓存与对比。
+    encodings = {"gzip": (".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        encodings["br"] = (".br", lambda data: brotli.compress(data, quality=11))
+    return encodings
+
+
+def _iter_sources(root: Path, patterns: Iterable[str]) -> list[Path]:
+    paths = {path for pattern in patterns for path in root.rglob(pattern) if path.is_file()}
+    paths.discard(root / MANIFEST_NAME)
+    return sorted(paths)
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(path.name + suffix)
+
+
+def _remove_siblings(path: Path):
+    for suffix in _SUFFIXES.values():
+        _sibling(path, suffix).unlink(missing_ok=True)
+
+
+def _load_manifest(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    files = payload.get("files") if isinstance(payload, dict) else None
+    return files if isinstance(files, dict) else {}
+
@@ -1,13 +1,13 @@
 """RSS 过滤模块 - 从现有 RSS 中过滤特定分类"""
 
-import requests
-from feedgen.feed import FeedGenerator
 from bs4 import BeautifulSoup
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import logging
-from dateutil import parser as date_parser
 
 from .http_client import create_retry_session
+from .item import Item
+from .rss_generator import RSSGenerator
+from .run_report import measure
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +52,9 @@ class RSSFilter:
         categories: List[str],
         output_path: str,
         title: Optional[str] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        publish: Optional[Callable[[RSSGenerator, List[Item]], Any]] = None,
+        feed_options: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """
         按分类过滤 RSS
@@ -62,6 +64,8 @@ class RSSFilter:
             output_path: 输出文件路径
             title: 新 RSS 的标题（可选）
             description: 新 RSS 的描述（可选）
+            publish: 自定义条目写入方式（例如经由条目历史库），默认直接 add_items
+            feed_options: 传给 RSSGenerator 的格式 / 归档参数（见 ``generator_options``）
 
         Returns:
             是否成功生成
@@ -71,7 +75,8 @@ class RSSFilter:
             return False
 
         try:
-            soup = BeautifulSoup(rss_content, "xml")
+            with measure("parse"):
+                soup = BeautifulSoup(rss_content, "xml")
 
             # 获取源 RSS 信息
             channel = soup.find("channel")
@@ -83,72 +88,61 @@ class RSSFilter:
             source_link = channel.find("link").get_text() if channel.find("link") else ""
             source_desc = channel.find("description").get_text() if channel.find("description") else ""
 
-            # 创建新的 RSS
-            fg = FeedGenerator()
-            fg.title(title or f"{source_title} - 已过滤")
-            fg.link(href=source_link, rel="alternate")
-            fg.description(description or f"{source_desc} (仅包含: {', '.join(categories)})")
-            fg.language("zh-CN")
-            fg.generator("RSS Creator - RSS Filter")
+            generator = RSSGenerator(
+                title=title or f"{source_title} - 已过滤",
+                link=source_link,
+                description=description or f"{source_desc} (仅包含: {', '.join(categories)})",
+                generator="RSS Creator - RSS Filter",
+                require_link=False,
+                **(feed_options or {}),
+            )
 
             # 过滤条目
             items = soup.find_all("item")
-            filtered_count = 0
             categories_lower = [c.lower() for c in categories]
+            filtered_items = []
 
             logger.info(f"源 RSS 包含 {len(items)} 个条目")
 
             for item in items:
                 # 获取分类
-                item_categories = item.find_all("category")
-                item_category_texts = [cat.get_text().lower() for cat in item_categories]
+                item_category_texts = [cat.get_text() for cat in item.find_all("category")]
 
                 # 检查是否匹配
-                if any(cat in item_category_texts for cat in categories_lower):
-                    fe = fg.add_entry()
-
-                    # 标题
-                    if item_title := item.find("title"):
-                        fe.title(item_title.get_text())
-
-                    # 链接
-                    if item_link := item.find("link"):
-                        fe.link(href=item_link.get_text())
-
-                    # 描述
-                    if item_desc := item.find("description"):
-                        fe.description(item_desc.get_text())
-
-                    # GUID
-                    if item_guid := item.find("guid"):
-                        guid_value = item_guid.get_text()
-                    elif item_link := item.find("link"):
-                        guid_value = item_link.get_text()
-                    else:
-                        guid_value = item.find("title").get_text() if item.find("title") else None
-                    if guid_value:
-                        fe.guid(guid_value, permalink=guid_value.startswith("http"))
-
-                    # 发布日期
-                    if item_date := item.find("pubDate"):
-                        try:
-                            fe.pubDate(date_parser.parse(item_date.get_text()))
-                        except Exception:
-                            logger.debug(f"无法解析日期: {item_date.get_text()}")
-
-                    # 分类
-                    for cat in item_categories:
-                        fe.category(term=cat.get_text())
-
-                    filtered_count += 1
+                if any(cat.lower() in categories_lower for cat in item_category_texts):
+                    title_text = _child_text(item, "title")
+                    link = _child_text(item, "link")
+                    # 沿用源 feed 的规则：guid 依次回退到 link、标题；以 http 开头的 guid 视为 permalink。
+                    guid = (_child_text(item, "guid") or link or title_text).strip()
+                    filtered_items.append(
+                        Item(
+                            title=title_text,
+                            link=link,
+                            guid=guid,
+                            description=_child_text(item, "description"),
+                            published=_child_text(item, "pubDate") or None,
+                            categories=tuple(item_category_texts),
+                            permalink=guid.startswith("http"),
+                        )
+                    )
 
             # 生成文件
-            fg.rss_file(output_path, pretty=True)
+            if publish is not None:
+                publish(generator, filtered_items)
+            else:
+                generator.add_items(filtered_items)
+            if not generator.generate(output_path):
+                return False
             logger.info(f"成功过滤 RSS: {output_path}")
-            logger.info(f"保留了 {filtered_count}/{len(items)} 个条目")
+            logger.info(f"保留了 {len(filtered_items)}/{len(items)} 个条目")
 
             return True
 
         except Exception as e:
             logger.error(f"过滤 RSS 失败: {e}")
             return False
+
+
+def _child_text(element, name: str) -> str:
+    child = element.find(name)
+    return child.get_text() if child else ""
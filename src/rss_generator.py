@@ -1,18 +1,94 @@
-"""RSS 生成模块"""
+"""RSS 生成模块（同时支持 Atom 1.0 与 JSON Feed 1.1 输出）"""
 
+from feedgen.ext.base import BaseExtension
 from feedgen.feed import FeedGenerator
-from typing import List, Dict, Optional
-from datetime import datetime, timezone
-from dateutil import parser as date_parser
+from feedgen.util import xml_elem
+from pathlib import Path
+from typing import Iterable, List, Dict, Optional, Sequence
+import json
 import logging
+import xml.etree.ElementTree as ET
+
+from . import metrics
+from .dates import parse_datetime
+from .item import Item, ItemLike, coerce_item
+from .path_utils import write_atomic
+from .run_report import current_stats, measure
+from .tracing import current_span
 
 logger = logging.getLogger(__name__)
 
+FEED_FORMATS = ("rss", "atom", "json")
+FEED_LANGUAGE = "zh-CN"
+JSON_FEED_VERSION = "https://jsonfeed.org/version/1.1"
+# RSS 写入配置的 output 路径，其它格式写在同名不同后缀的文件中。
+_FORMAT_SUFFIXES = {"atom": ".atom", "json": ".json"}
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+FH_NS = "http://purl.org/syndication/history/1.0"
+DEFAULT_ARCHIVE_PAGE_SIZE = 20
+DEFAULT_ARCHIVE_SIZE = 100
+
+
+def normalize_formats(formats: Optional[Sequence[str]]) -> tuple[str, ...]:
+    """校验 ``formats`` 配置；RSS 始终输出（分页、站点索引等依赖它）。"""
+    normalized = ["rss"]
+    for value in formats or ():
+        name = str(value).strip().lower()
+        if name not in FEED_FORMATS:
+            raise ValueError(f"未知的 feed 格式: {value}（可选: {', '.join(FEED_FORMATS)}）")
+        if name not in normalized:
+            normalized.append(name)
+    return tuple(normalized)
+
+
+def feed_paths(output_path: str | Path, formats: Optional[Sequence[str]] = None) -> Dict[str, Path]:
+    """返回每种格式的输出路径，例如 ``foo.xml`` / ``foo.atom`` / ``foo.json``。"""
+    path = Path(output_path)
+    return {
+        name: path if name == "rss" else path.with_suffix(_FORMAT_SUFFIXES[name])
+        for name in normalize_formats(formats)
+    }
+
+
+class _ArchiveLinks(BaseExtension):
+    """feedgen 扩展：写入 RFC 5005 的 atom:link 与 fh:archive 标记。"""
+
+    def __init__(self):
+        self.links: List[tuple[str, str]] = []
+        self.is_archive = False
+
+    def extend_ns(self):
+        return {"atom": ATOM_NS, "fh": FH_NS}
+
+    def extend_rss(self, rss_feed):
+        self._extend(rss_feed[0])
+        return rss_feed
+
+    def extend_atom(self, atom_feed):
+        self._extend(atom_feed)
+        return atom_feed
+
+    def _extend(self, parent):
+        for rel, href in self.links:
+            xml_elem(f"{{{ATOM_NS}}}link", parent, rel=rel, href=href)
+        if self.is_archive:
+            xml_elem(f"{{{FH_NS}}}archive", parent)
+
 
 class RSSGenerator:
     """RSS 生成器"""
 
-    def __init__(self, title: str, link: str, description: str):
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        description: str,
+        generator: str = "RSS Creator",
+        formats: Optional[Sequence[str]] = None,
+        archive: Optional[Dict] = None,
+        require_link: bool = True,
+    ):
         """
         初始化 RSS 生成器
 
@@ -20,92 +96,345 @@ class RSSGenerator:
             title: Feed 标题
             link: Feed 链接
             description: Feed 描述
+            generator: <generator> 字段
+            formats: 额外输出格式（``atom`` / ``json``），RSS 始终输出
+            archive: RFC 5005 归档配置（``page_size`` / ``archive_size`` / ``base_url``）
+            require_link: 为 False 时保留没有 link 的条目（转发外部 feed 时使用）
         """
-        self.fg = FeedGenerator()
-        self.fg.title(title)
-        self.fg.link(href=link, rel="alternate")
-        self.fg.description(description)
-        self.fg.language("zh-CN")
-        self.fg.generator("RSS Creator")
-        self._seen_entry_ids = set()
-
-    def add_items(self, items: List[Dict[str, str]]):
+        self.title = title
+        self.link = link
+        self.description = description
+        self.generator = generator
+        self.formats = normalize_formats(formats)
+        self.archive = _archive_options(archive)
+        self.require_link = require_link
+        self._seen_guid_hashes = set()
+        # 已加入的条目（add_items 顺序，越靠后越新）；生成时再统一序列化为各格式。
+        self._items: List[Item] = []
+
+    def add_items(self, items: Iterable[ItemLike]):
         """
         添加条目到 RSS
 
         Args:
-            items: 条目列表
+            items: ``Item`` 列表；旧式 dict 条目会先转换为 ``Item``
         """
         for item_data in items:
             try:
-                entry_id = self._get_entry_id(item_data)
-                if entry_id in self._seen_entry_ids:
-                    continue
-                self._seen_entry_ids.add(entry_id)
-
-                fe = self.fg.add_entry()
-
+                item = coerce_item(item_data)
                 # 必需字段
-                title = item_data.get("title", "").strip() or "无标题"
-                link = item_data.get("link", "").strip()
-                if not link:
+                if not item.link and self.require_link:
                     raise ValueError("条目缺少 link")
 
-                fe.title(title)
-                fe.link(href=link)
-                guid = item_data.get("guid", "").strip() or link
-                fe.guid(guid, permalink=(guid == link))
-
-                # 可选字段
-                if description := item_data.get("description"):
-                    fe.description(description)
-
-                if pub_date := item_data.get("pubDate"):
-                    dt = self._to_datetime(pub_date)
-                    if dt is not None:
-                        fe.pubDate(dt)
+                # 按 guid 去重（guid 缺省为 link）。
+                if item.guid_hash in self._seen_guid_hashes:
+                    continue
+                self._seen_guid_hashes.add(item.guid_hash)
 
-                if author := item_data.get("author"):
-                    fe.author({"name": author})
+                self._items.append(item)
 
             except Exception as e:
                 logger.warning(f"添加条目失败: {e}")
                 continue
 
-    def _get_entry_id(self, item_data: Dict[str, str]) -> str:
-        """优先使用稳定链接作为幂等键，缺失时回退到标题。"""
-        link = item_data.get("link", "").strip()
-        if link:
-            return link
-        return item_data.get("title", "").strip()
-
-    def _to_datetime(self, value) -> Optional[datetime]:
-        """将字符串或 datetime 统一转换成带时区的 datetime。"""
-        try:
-            if isinstance(value, datetime):
-                dt = value
-            else:
-                dt = date_parser.parse(str(value))
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except Exception:
-            return None
+    def add_from_store(self, store, feed: str, limit: int) -> int:
+        """
+        从条目库物化 feed 最新的 ``limit`` 个条目（单次索引查询）
+
+        Returns:
+            加入的条目数
+        """
+        items = store.latest(feed, limit)
+        # feedgen 以栈顺序输出：先加入最旧的条目，使最新条目位于文件顶部。
+        self.add_items(reversed(items))
+        return len(items)
 
+    @measure("generate")
     def generate(self, output_path: str) -> bool:
         """
-        生成 RSS 文件
+        生成 feed 文件（按 ``formats`` 一次性输出全部格式）
+
+        配置了 ``archive`` 时，主文件只保留最新的 ``page_size`` 个条目，
+        更早的条目写入 ``<name>-archive-<n>.xml`` 归档页。
 
         Args:
-            output_path: 输出文件路径
+            output_path: RSS 输出文件路径；Atom / JSON Feed 写在同名 ``.atom`` / ``.json`` 文件
 
         Returns:
-            是否成功生成
+            是否全部成功生成
         """
-        try:
-            self.fg.rss_file(output_path, pretty=True)
-            logger.info(f"成功生成 RSS: {output_path}")
-            return True
-        except Exception as e:
-            logger.error(f"生成 RSS 失败: {e}")
-            return False
+        items, links = self._items, []
+        success = True
+        if (stats := current_stats()) is not None:
+            stats.record_items(len(items))
+        current_span().set(output=Path(output_path).name, items=len(items))
+        if self.archive is not None:
+            try:
+                items, links = self._write_archives(Path(output_path))
+            except Exception as e:
+                logger.error(f"生成归档页失败: {e}")
+                return False
+
+        fg = self._build_feed(items, links=links)
+        for name, path in feed_paths(output_path, self.formats).items():
+            try:
+                # 原子替换：重复执行同一 job（例如租约过期后被另一 worker 接手）不会留下半写的文件。
+                if name == "rss":
+                    write_atomic(path, fg.rss_str(pretty=True))
+                elif name == "atom":
+                    _pin_updated(fg, items)
+                    write_atomic(path, fg.atom_str(pretty=True))
+                else:
+                    write_atomic(path, self.json_feed(items))
+                logger.info(f"成功生成 {name.upper()}: {path}")
+            except Exception as e:
+                logger.error(f"生成 {name.upper()} 失败: {e}")
+                success = False
+        if success:
+            newest = max((item.published for item in items if item.published is not None), default=None)
+            metrics.record_feed(output_path, items=len(items), newest=newest)
+        return success
+
+    def json_feed(self, items: Optional[Sequence[Item]] = None) -> str:
+        """按 JSON Feed 1.1 序列化（条目顺序与 RSS 文件一致：最后加入的在前）。"""
+        feed = {
+            "version": JSON_FEED_VERSION,
+            "title": self.title,
+            "home_page_url": self.link,
+            "description": self.description,
+            "language": FEED_LANGUAGE,
+            "items": [self._json_item(item) for item in reversed(self._items if items is None else items)],
+        }
+        return json.dumps(feed, ensure_ascii=False, indent=2) + "\n"
+
+    @staticmethod
+    def _json_item(item: Item) -> Dict:
+        entry = {"id": item.guid, "title": item.title or "无标题"}
+        if item.link:
+            entry["url"] = item.link
+        entry["content_text"] = item.description
+        if item.published is not None:
+            entry["date_published"] = item.published.isoformat()
+        if item.author:
+            entry["authors"] = [{"name": item.author}]
+        if item.categories:
+            entry["tags"] = list(item.categories)
+        return entry
+
+    def _build_feed(
+        self,
+        items: Sequence[Item],
+        *,
+        links: Sequence[tuple[str, str]] = (),
+        is_archive: bool = False,
+    ) -> FeedGenerator:
+        fg = FeedGenerator()
+        fg.id(self.link)
+        fg.title(self.title)
+        fg.link(href=self.link, rel="alternate")
+        fg.description(self.description)
+        fg.language(FEED_LANGUAGE)
+        fg.generator(self.generator)
+        if links or is_archive:
+            fg.register_extension("archive", _ArchiveLinks, atom=True, rss=True)
+            fg.archive.links = list(links)
+            fg.archive.is_archive = is_archive
+
+        for item in items:
+            try:
+                self._add_entry(fg, item)
+            except Exception as e:
+                logger.warning(f"添加条目失败: {e}")
+
+        if is_archive:
+            # 归档页内容不再变化，lastBuildDate / updated 取最新条目时间，使重写结果保持稳定。
+            _pin_updated(fg, items)
+        return fg
+
+    @staticmethod
+    def _add_entry(fg: FeedGenerator, item: Item):
+        fe = fg.add_entry()
+        fe.title(item.title or "无标题")
+        if item.link:
+            fe.link(href=item.link)
+        if item.guid:
+            permalink = item.guid == item.link if item.permalink is None else item.permalink
+            fe.guid(item.guid, permalink=permalink)
+
+        # 可选字段（Item 已完成规范化，这里不再重复解析）
+        if item.description:
+            fe.description(item.description, isSummary=True)
+
+        if item.published is not None:
+            fe.pubDate(item.published)
+            fe.updated(item.published)
+
+        if item.author:
+            fe.author({"name": item.author})
+
+        for category in item.categories:
+            fe.category(term=category)
+
+    def _write_archives(self, output_path: Path) -> tuple[List[Item], List[tuple[str, str]]]:
+        """
+        将超出当前页的条目追加到归档页，返回当前页条目与当前页的 RFC 5005 链接
+
+        已写满的归档页不再改写；每次只重写最新（未满）的归档页，
+        以及新开归档页时为上一页补上 ``next-archive`` 链接。
+        """
+        page_size = self.archive["page_size"]
+        archive_size = self.archive["archive_size"]
+        # 按发布时间分页，而非加入顺序：不少 job 按从新到旧的顺序加入条目。稳定排序，无日期条目视为最旧。
+        ordered = sorted(self._items, key=lambda item: item.sort_key)
+        current = ordered[-page_size:]
+        current_hashes = {item.guid_hash for item in current}
+
+        pages = [
+            [Item.from_dict(data) for data in reversed(read_feed_items(path))]
+            for path in _existing_archive_paths(output_path)
+        ]
+        archived = {item.guid_hash for page in pages for item in page}
+        # 上一轮当前页中已不在本轮当前页的条目（例如上游已滚动掉）也要归档，避免丢失。
+        previous_current = [Item.from_dict(data) for data in reversed(read_feed_items(output_path))]
+
+        pending: List[Item] = []
+        for item in previous_current + ordered[:-page_size]:
+            if item.guid_hash in current_hashes or item.guid_hash in archived:
+                continue
+            archived.add(item.guid_hash)
+            pending.append(item)
+        # 按时间追加（稳定排序，无日期条目保持原有相对顺序）。
+        pending.sort(key=lambda item: item.sort_key)
+
+        changed = set()
+        if pending and (not pages or len(pages[-1]) >= archive_size):
+            if pages:
+                changed.add(len(pages) - 1)
+            pages.append([])
+        while pending:
+            if len(pages[-1]) >= archive_size:
+                changed.add(len(pages) - 1)
+                pages.append([])
+            room = archive_size - len(pages[-1])
+            pages[-1].extend(pending[:room])
+            pending = pending[room:]
+            changed.add(len(pages) - 1)
+
+        current_url = self._archive_url(output_path.name)
+        for index in sorted(changed):
+            links = [("current", current_url), ("self", self._archive_url(archive_path(output_path, index + 1).name))]
+            if index > 0:
+                links.append(("prev-archive", self._archive_url(archive_path(output_path, index).name)))
+            if index + 1 < len(pages):
+                links.append(("next-archive", self._archive_url(archive_path(output_path, index + 2).name)))
+            page_fg = self._build_feed(pages[index], links=links, is_archive=True)
+            write_atomic(archive_path(output_path, index + 1), page_fg.rss_str(pretty=True))
+            logger.info(f"更新归档页: {archive_path(output_path, index + 1)}（{len(pages[index])} 个条目）")
+
+        links = [("current", current_url)]
+        if pages:
+            links.append(("prev-archive", self._archive_url(archive_path(output_path, len(pages)).name)))
+        return current, links
+
+    def _archive_url(self, filename: str) -> str:
+        return f"{self.archive['base_url']}{filename}"
+
+
+def _pin_updated(fg: FeedGenerator, items: Sequence[Item]):
+    """<updated>（feedgen 中同时是 lastBuildDate）取最新条目的发布时间，避免内容未变时文件随运行时间变化。"""
+    latest = max((item.published for item in items if item.published is not None), default=None)
+    if latest is not None:
+        fg.updated(latest)
+
+
+def archive_path(output_path: str | Path, number: int) -> Path:
+    """第 ``number`` 个归档页的路径（1 为最早的归档页）。"""
+    path = Path(output_path)
+    return path.with_name(f"{path.stem}-archive-{number}{path.suffix}")
+
+
+def _existing_archive_paths(output_path: Path) -> List[Path]:
+    paths = []
+    while (path := archive_path(output_path, len(paths) + 1)).exists():
+        paths.append(path)
+    return paths
+
+
+def _archive_options(archive: Optional[Dict]) -> Optional[Dict]:
+    if not archive:
+        return None
+    options = archive if isinstance(archive, dict) else {}
+    page_size = int(options.get("page_size", DEFAULT_ARCHIVE_PAGE_SIZE))
+    archive_size = int(options.get("archive_size", DEFAULT_ARCHIVE_SIZE))
+    if page_size <= 0 or archive_size <= 0:
+        raise ValueError("archive.page_size 与 archive.archive_size 必须为正整数")
+    base_url = str(options.get("base_url") or "")
+    if base_url and not base_url.endswith("/"):
+        base_url += "/"
+    return {"page_size": page_size, "archive_size": archive_size, "base_url": base_url}
+
+
+def generator_options(config: Dict) -> Dict:
+    """从 job / 输出配置中提取 ``RSSGenerator`` 的格式与归档参数。"""
+    return {"formats": config.get("formats"), "archive": config.get("archive")}
+
+
+def record_published_feed(output_path: str | Path):
+    """
+    来源未变化、跳过生成时，按已发布的 RSS 文件记录 feed 新鲜度指标
+
+    一次性运行每次都是新进程，不记录的话 textfile 中恰好缺少未变化的 feed，过期告警无法触发。
+    构建时间取文件修改时间。
+    """
+    path = Path(output_path)
+    try:
+        built_at = path.stat().st_mtime
+    except OSError:
+        return
+    items = read_feed_items(path)
+    newest = max(
+        (published for published in (parse_datetime(item.get("pubDate")) for item in items) if published is not None),
+        default=None,
+    )
+    metrics.record_feed(path, items=len(items), newest=newest, built_at=built_at)
+
+
+def read_feed_items(path: str | Path) -> List[Dict[str, str]]:
+    """
+    读取已发布 RSS 文件中的条目（文件顺序）
+
+    Args:
+        path: RSS 文件路径
+
+    没有 link 但有 guid 的条目（如 RSSFilter 输出的条目）同样保留；guid 的 ``isPermaLink``
+    记录为 ``permalink``，重新生成时保持不变。
+
+    Returns:
+        条目列表；文件不存在或无法解析时返回空列表
+    """
+    feed_path = Path(path)
+    if not feed_path.exists():
+        return []
+
+    try:
+        root = ET.parse(feed_path).getroot()
+    except (ET.ParseError, OSError) as e:
+        logger.warning(f"读取已有 RSS 失败 {feed_path}: {e}")
+        return []
+
+    items = []
+    for element in root.iter("item"):
+        item = {}
+        for field in ("title", "link", "guid", "description", "pubDate", "author"):
+            value = (element.findtext(field) or "").strip()
+            if value:
+                item[field] = value
+        categories = [text.strip() for text in (category.text for category in element.iter("category")) if text]
+        if categories:
+            item["categories"] = categories
+        guid = element.find("guid")
+        if guid is not None and guid.get("isPermaLink") in ("true", "false"):
+            item["permalink"] = guid.get("isPermaLink") == "true"
+        if item.get("link") or item.get("guid"):
+            items.append(item)
+    return items
@@ -0,0 +1,183 @@
+"""Per-run timing report.
+
+``JobRunner`` gives every job a :class:`JobStats` held in a context
+variable. The HTTP adapter, the parsers and ``RSSGenerator`` add to whatever
+stats are current, so jobs need no changes to be measured, and helper
+threads started through ``ContextThreadPoolExecutor`` report into the same
+job.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .path_utils import write_atomic
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILENAME = "run-report.json"
+
+
+@dataclass
+class JobStats:
+    name: str
+    success: bool = False
+    wall_time: float = 0.0
+    requests: int = 0
+    bytes_downloaded: int = 0
+    request_time: float = 0.0
+    cache_hits: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    retries: int = 0
+    # 计时阶段：parse 为 HTML/XML/JSON 解析与条目提取，generate 为写出 feed 文件。
+    parse_time: float = 0.0
+    generate_time: float = 0.0
+    items: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_request(self, *, status: Optional[int], size: int, elapsed: float):
+        with self._lock:
+            self.requests += 1
+            self.bytes_downloaded += size
+            self.request_time += elapsed
+            if status == 304:
+                self.not_modified += 1
+            elif status is None or status >= 400:
+                self.errors += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_cache_hits(self, count: int = 1):
+        with self._lock:
+            self.cache_hits += count
+
+    def record_items(self, count: int):
+        with self._lock:
+            self.items += count
+
+    def add_time(self, phase: str, seconds: float):
+        with self._lock:
+            setattr(self, f"{phase}_time", getattr(self, f"{phase}_time") + seconds)
+
+    def to_dict(self) -> dict:
+        data = {spec.name: getattr(self, spec.name) for spec in fields(self) if not spec.name.startswith("_")}
+        for key in ("wall_time", "request_time", "parse_time", "generate_time"):
+            data[key] = round(data[key], 4)
+        return data
+
+
+_current_stats: ContextVar[Optional[JobStats]] = ContextVar("current_job_stats", default=None)
+_active_phase: ContextVar[Optional[str]] = ContextVar("active_phase", default=None)
+
+
+@contextmanager
+def job_stats_scope(stats: JobStats) -> Iterator[JobStats]:
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_stats() -> Optional[JobStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def measure(phase: str, name: Optional[str] = None, **attributes) -> Iterator[None]:
+    """
+    把代码块耗时计入当前 job 的 ``phase`` 阶段；没有当前 job 时只执行不计时
+
+    也可作为装饰器使用：``@measure("parse")``。嵌套的同一阶段只计最外层。
+    同时记录名为 ``name``（默认同 ``phase``）的 tracing span，嵌套的 span 均保留。
+    """
+    with span(name or phase, phase, **attributes):
+        stats = _current_stats.get()
+        if stats is None or _active_phase.get() == phase:
+            yield
+            return
+        token = _active_phase.set(phase)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.add_time(phase, time.perf_counter() - started)
+            _active_phase.reset(token)
+
+
+@dataclass
+class RunReport:
+    started_at: float
+    finished_at: float = 0.0
+    jobs: list[JobStats] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, stats: JobStats, *, replace: bool = False):
+        """加入一个 job 的统计；``replace`` 时替换同名 job 的旧记录（常驻模式下每个 job 保留最近一次运行）。"""
+        with self._lock:
+            kept = [existing for existing in self.jobs if not replace or existing.name != stats.name]
+            self.jobs = kept + [stats]
+
+    @property
+    def wall_time(self) -> float:
+        return max(0.0, self.finished_at - self.started_at)
+
+    def slowest(self, limit: int = 10) -> list[JobStats]:
+        return sorted(self.jobs, key=lambda stats: stats.wall_time, reverse=True)[:limit]
+
+    def to_dict(self) -> dict:
+        totals = {
+            key: sum(getattr(stats, key) for stats in self.jobs)
+            for key in ("requests", "bytes_downloaded", "cache_hits", "not_modified", "errors", "retries", "items")
+        }
+        return {
+            "version": 1,
+            "started_at": _isoformat(self.started_at),
+            "finished_at": _isoformat(self.finished_at),
+            "wall_time": round(self.wall_time, 4),
+            "totals": totals,
+            "jobs": [stats.to_dict() for stats in self.jobs],
+        }
+
+    def write(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, json.dumps(self.to_dict(), ensure_ascii=False, indent=2))
+        return path
+
+    def log_slowest(self, limit: int = 10):
+        """按耗时降序输出最慢的 job。"""
+        if not self.jobs:
+            return
+        logger.info(f"最慢的 {min(limit, len(self.jobs))} 个 job（本轮共 {self.wall_time:.1f}s）:")
+        for stats in self.slowest(limit):
+            logger.info(
+                f"  {stats.wall_time:7.2f}s  {stats.name}  "
+                f"请求 {stats.requests}（网络 {stats.request_time:.2f}s，{_format_bytes(stats.bytes_downloaded)}，"
+                f"304 {stats.not_modified}，缓存 {stats.cache_hits}）  "
+                f"解析 {stats.parse_time:.2f}s  生成 {stats.generate_time:.2f}s  条目 {stats.items}"
+                + ("" if stats.success else "  [失败]")
+            )
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def _format_bytes(size: int) -> str:
+    if size < 1024:
+        return f"{size}B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f}KB"
+    return f"{size / 1024 / 1024:.1f}MB"
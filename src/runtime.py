@@ -1,6 +1,11 @@
 """Runtime helpers shared by CLI entrypoints and jobs."""
 
 import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
 
 LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -19,3 +24,37 @@ def setup_logging(verbose: bool = False):
         return
 
     logging.basicConfig(level=level, format=LOG_FORMAT, datefmt=DATE_FORMAT)
+
+
+class ConfigWatcher:
+    """Reload a config file when its modification time or size changes."""
+
+    def __init__(self, path: str | Path, loader: Callable[[str], Any]):
+        self.path = Path(path)
+        self._loader = loader
+        self._stamp = self._read_stamp()
+
+    def poll(self) -> Optional[Any]:
+        """
+        检查配置文件是否变化
+
+        Returns:
+            变化后重新加载的配置；未变化或加载失败（沿用旧配置）时返回 None
+        """
+        stamp = self._read_stamp()
+        if stamp is None or stamp == self._stamp:
+            return None
+        # 无论成功与否都记录新状态，写坏的配置只报一次错，修复保存后再重新加载。
+        self._stamp = stamp
+        try:
+            return self._loader(str(self.path))
+        except Exception as exc:
+            logger.error(f"重新加载配置失败，继续使用旧配置: {exc}")
+            return None
+
+    def _read_stamp(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,485 @@
+"""Priority-queue scheduler for config-driven jobs.
+
+Every job has its own plan (fixed ``interval`` or a 5-field ``cron``
+expression, plus optional ``jitter``). Due jobs are popped from a heap and
+handed to a worker pool. A job is only re-queued once its run has finished,
+so runs of the same job never overlap, and any slots missed while it was
+running (or while the process was stalled) collapse into a single run.
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .concurrency import CancelToken, ContextThreadPoolExecutor, cancellation_scope
+from .path_utils import resolve_output_path, write_atomic
+from .rss_generator import read_feed_items
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 3600
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 86400
+DEFAULT_ADAPTIVE_BACKOFF = 2.0
+SCHEDULE_STATE_FILENAME = "schedule.json"
+# 启动时各 job 的首次运行分散在该窗口内（不超过 job 间隔），避免同一时刻集中发起请求。
+DEFAULT_STAGGER = 300
+
+# (名称, 最小值, 最大值)；weekday 允许 7（周日）。
+_CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+class CronExpression:
+    """Minimal 5-field cron expression (``minute hour day month weekday``), evaluated in UTC.
+
+    Supports ``*``, ``a-b``, ``a,b``, ``*/n`` and ``a-b/n``; weekday ``0`` and ``7``
+    are both Sunday. As in cron, when both day and weekday are restricted a
+    time matches if either does.
+    """
+
+    def __init__(self, text: str):
+        parts = text.split()
+        if len(parts) != len(_CRON_FIELDS):
+            raise ValueError(f"cron 表达式需要 5 个字段: {text!r}")
+        self.text = text
+        values = [_parse_cron_field(part, low, high, name) for part, (name, low, high) in zip(parts, _CRON_FIELDS)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = values
+        self._day_restricted = parts[2] != "*"
+        self._weekday_restricted = parts[4] != "*"
+
+    def next_after(self, timestamp: float) -> float:
+        """Return the first matching minute strictly after ``timestamp``."""
+        current = datetime.fromtimestamp(timestamp, timezone.utc).replace(second=0, microsecond=0)
+        current += timedelta(minutes=1)
+        # 逐级跳过不匹配的月 / 日 / 小时，最坏情况下也只需几千次迭代。
+        limit = current + timedelta(days=366 * 5)
+        while current < limit:
+            if current.month not in self.months:
+                current = (current.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(current):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if current.hour not in self.hours:
+                current = current.replace(minute=0) + timedelta(hours=1)
+                continue
+            if current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+                continue
+            return current.timestamp()
+        raise ValueError(f"cron 表达式没有可执行时间: {self.text!r}")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.text!r})"
+
+
+def _parse_cron_field(text: str, low: int, high: int, name: str) -> frozenset[int]:
+    values: set[int] = set()
+    for part in text.split(","):
+        spec, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start_text, end_text = spec.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(spec)
+            end = high if step_text else start
+        if step <= 0 or start < low or end > high or start > end:
+            raise ValueError(f"cron 字段 {name} 非法: {text!r}")
+        values.update(range(start, end + 1, step))
+    if name == "weekday":
+        # 7 与 0 都表示周日。
+        values = {value % 7 for value in values}
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class AdaptivePolicy:
+    """Bounds for a learned polling interval."""
+
+    min_interval: float
+    max_interval: float
+    backoff: float = DEFAULT_ADAPTIVE_BACKOFF
+
+    def next_delay(self, previous: Optional[float], changed: Optional[bool]) -> float:
+        """有变化时回到最短间隔；持续无变化时按 ``backoff`` 指数退避；结果未知时保持不变。"""
+        if previous is None or changed:
+            return self.min_interval
+        if changed is None:
+            return min(max(previous, self.min_interval), self.max_interval)
+        return min(max(previous * self.backoff, self.min_interval), self.max_interval)
+
+
+@dataclass(frozen=True)
+class JobPlan:
+    """When and how often one job runs."""
+
+    name: str
+    config: dict = field(compare=False)
+    interval: float = DEFAULT_INTERVAL
+    cron: Optional[CronExpression] = field(default=None, compare=False)
+    jitter: float = 0.0
+    adaptive: Optional[AdaptivePolicy] = None
+    offset: float = 0.0
+
+    def next_slot(self, after: float) -> float:
+        if self.cron is not None:
+            return self.cron.next_after(after)
+        return after + self.interval
+
+
+def build_plans(config: dict) -> list[JobPlan]:
+    """
+    根据配置生成每个启用 job 的调度计划
+
+    job 可配置 ``schedule: {interval: 秒, cron: "m h dom mon dow", jitter: 秒, adaptive: ...}``；
+    未配置时使用全局 ``update.interval`` / ``update.adaptive``。
+    """
+    update_config = config.get("update") or {}
+    default_interval = float(update_config.get("interval", DEFAULT_INTERVAL))
+    plans: list[JobPlan] = []
+    seen: set[str] = set()
+    for job in config.get("jobs") or []:
+        if not job.get("enabled", True):
+            continue
+        name = str(job.get("name") or job.get("type") or "未命名")
+        if name in seen:
+            raise ValueError(f"定时模式下 job 名称必须唯一: {name}")
+        seen.add(name)
+
+        schedule = job.get("schedule") or {}
+        cron = CronExpression(str(schedule["cron"])) if schedule.get("cron") else None
+        interval = float(schedule.get("interval", default_interval))
+        if interval <= 0:
+            raise ValueError(f"{name}: schedule.interval 必须大于 0")
+        adaptive = _adaptive_policy(schedule.get("adaptive", update_config.get("adaptive")), interval)
+        if adaptive is not None and cron is not None:
+            raise ValueError(f"{name}: schedule.adaptive 不能与 cron 同时使用")
+        stagger = float(schedule.get("stagger", update_config.get("stagger", DEFAULT_STAGGER)))
+        plans.append(
+            JobPlan(
+                name=name,
+                config=job,
+                interval=interval,
+                cron=cron,
+                jitter=max(0.0, float(schedule.get("jitter", 0))),
+                adaptive=adaptive,
+                # cron 的时间点由用户指定，不再额外错开。
+                offset=0.0 if cron is not None else start_offset(name, min(max(0.0, stagger), interval)),
+            )
+        )
+    return plans
+
+
+def _same_plan(old: JobPlan, new: JobPlan) -> bool:
+    old_cron = old.cron.text if old.cron else None
+    new_cron = new.cron.text if new.cron else None
+    return old == new and old_cron == new_cron and old.config == new.config
+
+
+def start_offset(name: str, window: float) -> float:
+    """由 job 名称哈希得到 ``[0, window)`` 内的固定偏移，重启后保持不变。"""
+    if window <= 0:
+        return 0.0
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64 * window
+
+
+def _adaptive_policy(value: Any, interval: float) -> Optional[AdaptivePolicy]:
+    """``adaptive: true`` 或 ``{min_interval, max_interval, backoff}``；最短间隔默认等于 interval。"""
+    if not value:
+        return None
+    options = value if isinstance(value, dict) else {}
+    min_interval = float(options.get("min_interval", interval))
+    max_interval = float(options.get("max_interval", max(DEFAULT_ADAPTIVE_MAX_INTERVAL, min_interval)))
+    backoff = float(options.get("backoff", DEFAULT_ADAPTIVE_BACKOFF))
+    if min_interval <= 0 or max_interval < min_interval or backoff < 1:
+        raise ValueError("adaptive 需满足 0 < min_interval <= max_interval 且 backoff >= 1")
+    return AdaptivePolicy(min_interval=min_interval, max_interval=max_interval, backoff=backoff)
+
+
+def item_fingerprint(feeds_dir: str | Path, job: dict) -> Optional[str]:
+    """
+    job 所有输出 feed 的条目集合指纹（只看 GUID，忽略 lastBuildDate 等每次都会变化的字段）
+
+    Returns:
+        指纹；没有可读取的输出时返回 None
+    """
+    outputs = [entry.get("output") for entry in job.get("outputs") or [] if isinstance(entry, dict)]
+    if not outputs:
+        outputs = [job.get("output")]
+
+    digest = hashlib.sha256()
+    found = False
+    for output in outputs:
+        if not output:
+            continue
+        path = resolve_output_path(feeds_dir, str(output))
+        if not path.exists():
+            continue
+        found = True
+        guids = sorted(item.get("guid") or item["link"] for item in read_feed_items(path))
+        digest.update(str(output).encode("utf-8") + b"\0" + "\n".join(guids).encode("utf-8") + b"\0")
+    return digest.hexdigest() if found else None
+
+
+class AdaptiveIntervals:
+    """Per-job learned intervals, persisted as JSON so restarts keep the cadence."""
+
+    def __init__(self, path: Optional[str | Path] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        if self.path and self.path.exists():
+            try:
+                payload = json.loads(self.path.read_text(encoding="utf-8"))
+                if isinstance(payload, dict):
+                    self._entries = {name: entry for name, entry in payload.items() if isinstance(entry, dict)}
+            except (OSError, ValueError) as exc:
+                logger.warning(f"读取调度状态失败 {self.path}: {exc}")
+
+    def observe(self, name: str, policy: AdaptivePolicy, fingerprint: Optional[str], now: float) -> float:
+        """记录一次运行结果并返回下一次运行前的等待秒数。"""
+        with self._lock:
+            entry = self._entries.get(name) or {}
+            previous = entry.get("fingerprint")
+            changed = None if fingerprint is None else (previous is not None and fingerprint != previous)
+            delay = policy.next_delay(entry.get("delay"), changed)
+            entry.update(
+                {
+                    "delay": delay,
+                    "fingerprint": fingerprint if fingerprint is not None else previous,
+                    "last_run": now,
+                    "runs": int(entry.get("runs", 0)) + 1,
+                    "changes": int(entry.get("changes", 0)) + (1 if changed else 0),
+                }
+            )
+            if changed:
+                entry["last_change"] = now
+            self._entries[name] = entry
+            self._save_locked()
+        if changed is not None:
+            logger.info(f"{name}: {'有更新' if changed else '无变化'}，{delay:g} 秒后再次抓取")
+        return delay
+
+    def resume_at(self, name: str) -> Optional[float]:
+        """上次运行时间 + 学习到的间隔；没有记录时返回 None。"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if not entry or "last_run" not in entry or "delay" not in entry:
+                return None
+            return float(entry["last_run"]) + float(entry["delay"])
+
+    def _save_locked(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(self._entries, ensure_ascii=False, indent=2))
+
+
+class Scheduler:
+    """Heap-based dispatcher running each job on its own plan."""
+
+    def __init__(
+        self,
+        plans: list[JobPlan],
+        run_job: Callable[[dict], Any],
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        clock: Callable[[], float] = time.time,
+        rng: Callable[[], float] = random.random,
+        adaptive: Optional[AdaptiveIntervals] = None,
+    ):
+        """
+        Args:
+            run_job: 执行一个 job；对 adaptive 计划，返回值应为条目集合指纹（未知时为 None）
+            adaptive: 自适应间隔状态；为 None 时 adaptive 计划使用内存状态
+        """
+        self._plans = {plan.name: plan for plan in plans}
+        self._adaptive = adaptive if adaptive is not None else AdaptiveIntervals()
+        self._run_job = run_job
+        self.max_workers = max(1, int(max_workers))
+        self._clock = clock
+        self._rng = rng
+        self._heap: list[tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        # 每个 job 当前有效的堆条目序号；旧条目出堆时被忽略（惰性删除）。
+        self._entry_ids: dict[str, int] = {}
+        self._slots: dict[str, float] = {}
+        self._running: set[str] = set()
+        # 正在运行的 job 的取消令牌；配置移除或变更时用它提前结束这次运行。
+        self._tokens: dict[str, CancelToken] = {}
+        self._cond = threading.Condition()
+        self._stopped = False
+
+    def start(self, now: Optional[float] = None):
+        """Queue every job at its start offset (adaptive jobs resume their learned cadence)."""
+        now = self._clock() if now is None else now
+        with self._cond:
+            for name, plan in self._plans.items():
+                slot = now + plan.offset
+                resume_at = self._adaptive.resume_at(name) if plan.adaptive else None
+                self._push(name, max(slot, resume_at or slot), jitter=False)
+            self._cond.notify_all()
+
+    def pop_due(self, now: float) -> list[JobPlan]:
+        """Remove and return the jobs due at ``now``, marking them as running.
+
+        At most ``max_workers`` jobs are in flight; further due jobs stay queued
+        in slot order until a running job completes.
+        """
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                _, entry_id, name = self._heap[0]
+                if self._entry_ids.get(name) != entry_id:
+                    heapq.heappop(self._heap)
+                    continue
+                if len(self._running) >= self.max_workers:
+                    break
+                heapq.heappop(self._heap)
+                del self._entry_ids[name]
+                self._running.add(name)
+                due.append(self._plans[name])
+        return due
+
+    def complete(self, name: str, now: float, result: Any = None):
+        """Record a finished run and queue the job's next slot."""
+        with self._cond:
+            self._running.discard(name)
+            self._tokens.pop(name, None)
+            plan = self._plans.get(name)
+            if plan is None:
+                return
+            if plan.adaptive is not None:
+                slot = now + self._adaptive.observe(name, plan.adaptive, result, now)
+            elif name in self._slots:
+                slot = plan.next_slot(self._slots[name])
+            else:
+                # 运行期间被移除又重新加入：按新 job 从起始偏移排期。
+                slot = now + plan.offset
+            if slot <= now:
+                # 运行期间错过的时间点合并为一次立即执行，之后按计划继续。
+                logger.info(f"{name}: 错过计划时间，合并为一次立即执行")
+                slot = now
+            self._push(name, slot, jitter=True)
+            self._cond.notify_all()
+
+    def update_plans(self, plans: list[JobPlan], now: Optional[float] = None) -> tuple[list[str], list[str], list[str]]:
+        """Apply a new set of plans in place.
+
+        New jobs are queued at their start offset, removed jobs are dropped
+        (a run in progress is cancelled and not requeued), and changed jobs are
+        re-planned; a run in progress with an outdated config is cancelled and
+        requeued at the new start offset. Unchanged jobs keep their queued slot
+        and learned state.
+
+        Returns:
+            ``(added, removed, changed)`` job names
+        """
+        now = self._clock() if now is None else now
+        updated = {plan.name: plan for plan in plans}
+        with self._cond:
+            added = [name for name in updated if name not in self._plans]
+            removed = [name for name in self._plans if name not in updated]
+            changed = [
+                name for name in updated if name in self._plans and not _same_plan(self._plans[name], updated[name])
+            ]
+            for name in removed:
+                del self._plans[name]
+                # 堆中的旧条目在出堆时被忽略。
+                self._entry_ids.pop(name, None)
+                self._slots.pop(name, None)
+                self._cancel_running(name, "配置中已移除")
+            for name in added + changed:
+                previous = self._plans.get(name)
+                plan = self._plans[name] = updated[name]
+                if name in self._running:
+                    if previous is not None and previous.config != plan.config:
+                        # 按旧配置运行的结果作废；不保留旧排期，complete() 按新 job 从起始偏移排期。
+                        self._slots.pop(name, None)
+                        self._cancel_running(name, "配置已变更")
+                    # 运行结束时 complete() 按新计划排期。
+                    continue
+                if previous is not None and previous.config == plan.config:
+                    # 只改了调度参数：从现在起按新计划排期。
+                    slot = plan.next_slot(now)
+                else:
+                    slot = now + plan.offset
+                self._push(name, slot, jitter=False)
+            self._cond.notify_all()
+        return added, removed, changed
+
+    def next_due(self) -> Optional[float]:
+        with self._cond:
+            while self._heap and self._entry_ids.get(self._heap[0][2]) != self._heap[0][1]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def is_running(self, name: str) -> bool:
+        with self._cond:
+            return name in self._running
+
+    def run_forever(self):
+        """Dispatch due jobs until :meth:`stop` is called."""
+        self.start()
+        # 复制上下文到工作线程，使调用方启用的会话池等上下文对 job 可见。
+        with ContextThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduler") as executor:
+            with self._cond:
+                while not self._stopped:
+                    for plan in self.pop_due(self._clock()):
+                        executor.submit(self._execute, plan)
+                    # 已满载时等待某个 job 完成（complete 会唤醒），不按到期时间空转。
+                    wakeup = None if len(self._running) >= self.max_workers else self.next_due()
+                    timeout = None if wakeup is None else max(0.0, wakeup - self._clock())
+                    self._cond.wait(timeout)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _execute(self, plan: JobPlan):
+        result = None
+        token = CancelToken()
+        with self._cond:
+            self._tokens[plan.name] = token
+        try:
+            with cancellation_scope(token):
+                result = self._run_job(plan.config)
+        except Exception as exc:
+            logger.error(f"{plan.name}: 调度执行异常 - {exc}")
+        finally:
+            self.complete(plan.name, self._clock(), result)
+
+    def _cancel_running(self, name: str, reason: str):
+        token = self._tokens.get(name)
+        if token is not None:
+            logger.info(f"{name}: {reason}，取消正在进行的运行")
+            token.cancel(reason)
+
+    def _push(self, name: str, slot: float, *, jitter: bool):
+        plan = self._plans[name]
+        self._slots[name] = slot
+        due = slot + (self._rng() * plan.jitter if jitter and plan.jitter else 0.0)
+        entry_id = next(self._counter)
+        self._entry_ids[name] = entry_id
+        heapq.heappush(self._heap, (due, entry_id, name))
@@ -0,0 +1,205 @@
+"""Split jobs across parallel runners and merge their results.
+
+``--shard i/N`` runs the enabled jobs whose name hashes to shard ``i`` and
+writes a manifest of results and written files into ``feeds/.shards/``.
+With ``--shard-output DIR`` only those files and the manifest are copied out,
+so shards that start from the same published tree do not overwrite each
+other's output with stale copies. After all shards' output is copied into one
+directory, ``merge`` checks the manifests, then builds the site index and
+compressed copies once.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from .path_utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIR = ".shards"
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One partition of the job list; ``index`` is 1-based."""
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, text: str) -> "Shard":
+        """解析 ``i/N``（1 <= i <= N）。"""
+        index, sep, count = str(text).partition("/")
+        try:
+            shard = cls(int(index), int(count))
+        except ValueError:
+            raise ValueError(f"分片格式应为 i/N: {text}") from None
+        if not sep or shard.count < 1 or not 1 <= shard.index <= shard.count:
+            raise ValueError(f"分片格式应为 i/N 且 1 <= i <= N: {text}")
+        return shard
+
+    @property
+    def label(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def owns(self, job_name: str) -> bool:
+        return shard_for(job_name, self.count) == self.index
+
+    def select(self, jobs: list[dict]) -> list[dict]:
+        """本分片负责的已启用 job。"""
+        return [job for job in jobs if job.get("enabled", True) and self.owns(job_name(job))]
+
+
+def job_name(job: dict) -> str:
+    return str(job.get("name") or job.get("type") or "未命名")
+
+
+def shard_for(name: str, count: int) -> int:
+    """由 job 名称的稳定哈希决定所属分片（1-based）；与进程、机器及 job 顺序无关。"""
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def snapshot_files(feeds_dir: str | Path) -> dict[str, tuple[int, int]]:
+    """记录 feeds 目录中每个文件的 (mtime_ns, size)，用于找出本分片写入的文件。"""
+    root = Path(feeds_dir)
+    if not root.exists():
+        return {}
+    files = {}
+    for path in root.rglob("*"):
+        relative = path.relative_to(root)
+        if path.is_file() and relative.parts[0] != MANIFEST_DIR:
+            stat = path.stat()
+            files[relative.as_posix()] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def write_manifest(
+    feeds_dir: str | Path,
+    shard: Shard,
+    results: dict[str, bool],
+    before: dict[str, tuple[int, int]],
+) -> Path:
+    """
+    写入分片清单：各 job 结果，以及本次运行新增或修改的文件及其 sha256
+
+    Args:
+        before: 运行前的 :func:`snapshot_files`
+    """
+    root = Path(feeds_dir)
+    after = snapshot_files(root)
+    written = sorted(name for name, stamp in after.items() if before.get(name) != stamp)
+    manifest = {
+        "version": 1,
+        "shard": shard.index,
+        "count": shard.count,
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+        "files": {name: _sha256(root / name) for name in written},
+    }
+    path = root / MANIFEST_DIR / f"shard-{shard.index}-of-{shard.count}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, json.dumps(manifest, ensure_ascii=False, indent=2))
+    logger.info(f"分片 {shard.label}: 写入清单 {path.name}（{len(results)} 个 job，{len(written)} 个文件）")
+    return path
+
+
+def export_shard(feeds_dir: str | Path, manifest_path: str | Path, dest: str | Path) -> int:
+    """
+    把清单中本分片写入的文件及清单本身复制到 ``dest``（保持相对路径）
+
+    Returns:
+        复制的 feed 文件数
+    """
+    root, dest = Path(feeds_dir), Path(dest)
+    manifest_path = Path(manifest_path)
+    files = list((_load_manifest(manifest_path) or {}).get("files") or {})
+    for name in files:
+        target = dest / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(root / name, target)
+    target = dest / MANIFEST_DIR / manifest_path.name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(manifest_path, target)
+    return len(files)
+
+
+@dataclass
+class MergeReport:
+    results: dict[str, bool]
+    missing_shards: list[int]
+    problems: list[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing_shards and not self.problems and all(self.results.values())
+
+
+def merge_manifests(feeds_dir: str | Path, *, cleanup: bool = True) -> Optional[MergeReport]:
+    """
+    合并 ``feeds/.shards/`` 下的分片清单并校验合并后的文件
+
+    检查所有分片是否到齐、同一 job 是否只出现在一个分片、各分片写入的文件是否完整且未被其他分片覆盖。
+    ``cleanup`` 为 True 时删除清单目录，避免其随 feeds 一起发布。
+
+    Returns:
+        合并报告；没有任何清单时返回 None
+    """
+    root = Path(feeds_dir)
+    manifest_dir = root / MANIFEST_DIR
+    manifests = [_load_manifest(path) for path in sorted(manifest_dir.glob("shard-*.json"))]
+    manifests = [manifest for manifest in manifests if manifest]
+    if not manifests:
+        return None
+
+    results: dict[str, bool] = {}
+    problems: list[str] = []
+    counts = {int(manifest["count"]) for manifest in manifests}
+    if len(counts) > 1:
+        problems.append(f"分片总数不一致: {sorted(counts)}")
+    count = max(counts)
+    present = {int(manifest["shard"]) for manifest in manifests}
+    missing = [index for index in range(1, count + 1) if index not in present]
+
+    owners: dict[str, int] = {}
+    for manifest in manifests:
+        shard_index = int(manifest["shard"])
+        for name, success in (manifest.get("results") or {}).items():
+            if name in results:
+                problems.append(f"job {name} 出现在多个分片中")
+            results[name] = bool(results.get(name, True) and success)
+        for name, digest in (manifest.get("files") or {}).items():
+            if name in owners and owners[name] != shard_index:
+                problems.append(f"文件 {name} 同时由分片 {owners[name]} 和 {shard_index} 写入")
+            owners[name] = shard_index
+            path = root / name
+            if not path.is_file():
+                problems.append(f"分片 {shard_index} 的文件缺失: {name}")
+            elif _sha256(path) != digest:
+                problems.append(f"文件 {name} 与分片 {shard_index} 的清单不一致")
+
+    if cleanup:
+        shutil.rmtree(manifest_dir, ignore_errors=True)
+    return MergeReport(results=results, missing_shards=missing, problems=problems)
+
+
+def _load_manifest(path: Path) -> Optional[dict[str, Any]]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logger.error(f"读取分片清单失败 {path}: {exc}")
+        return None
+    if not isinstance(payload, dict) or "shard" not in payload or "count" not in payload:
+        logger.error(f"分片清单格式错误: {path}")
+        return None
+    return payload
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
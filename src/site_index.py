@@ -11,8 +11,13 @@ from pathlib import Path
 import re
 from xml.etree import ElementTree as ET
 
+from .path_utils import write_atomic
+from .rss_generator import feed_paths
+
 logger = logging.getLogger(__name__)
 
+FORMAT_LABELS = {"atom": "Atom", "json": "JSON Feed"}
+
 SECTION_ORDER = ("research", "blogs", "releases")
 SECTION_META = {
     "research": {
@@ -54,6 +59,8 @@ class FeedCard:
     status_label: str
     status_class: str
     sort_rank: int
+    # 除 RSS 外已生成的其它格式：(标签, 相对路径)
+    alternate_formats: tuple[tuple[str, str], ...] = ()
 
 
 def generate_site_index(config: dict, feeds_dir: str) -> Path:
@@ -68,9 +75,10 @@ def generate_site_index(config: dict, feeds_dir: str) -> Path:
     all_cards: list[FeedCard] = []
 
     for job in jobs:
-        card = _build_feed_card(job, feeds_path)
-        grouped_cards[card.section].append(card)
-        all_cards.append(card)
+        for entry in _iter_feed_entries(job):
+            card = _build_feed_card(entry, feeds_path)
+            grouped_cards[card.section].append(card)
+            all_cards.append(card)
 
     sorted_groups = {
         section: _sort_cards(grouped_cards[section]) for section in SECTION_ORDER
@@ -82,7 +90,8 @@ def generate_site_index(config: dict, feeds_dir: str) -> Path:
     live_feed_count = sum(1 for card in all_cards if card.is_live)
 
     output_path = feeds_path / "index.html"
-    output_path.write_text(
+    write_atomic(
+        output_path,
         _render_page(
             site=site,
             grouped_cards=sorted_groups,
@@ -90,12 +99,24 @@ def generate_site_index(config: dict, feeds_dir: str) -> Path:
             live_feed_count=live_feed_count,
             total_feeds=len(all_cards),
         ),
-        encoding="utf-8",
     )
     logger.info("Generated landing page: %s", output_path)
     return output_path
 
 
+def _iter_feed_entries(job: dict):
+    """Expand multi-output jobs (``outputs: [...]``) into one catalog entry per feed."""
+    outputs = job.get("outputs")
+    if not isinstance(outputs, list) or not outputs:
+        yield job
+        return
+
+    shared = {key: value for key, value in job.items() if key != "outputs"}
+    for output in outputs:
+        if isinstance(output, dict):
+            yield {**shared, **output}
+
+
 def _build_feed_card(job: dict, feeds_path: Path) -> FeedCard:
     output_name = str(job.get("output") or "").strip()
     xml_path = feeds_path / output_name if output_name else None
@@ -104,6 +125,7 @@ def _build_feed_card(job: dict, feeds_path: Path) -> FeedCard:
     section = _normalize_section((job.get("catalog") or {}).get("section"))
 
     rss_available = bool(output_name and xml_path and xml_path.exists())
+    alternate_formats = _alternate_formats(job, output_name, feeds_path) if rss_available else ()
     updated_sort = _parse_datetime(channel_meta.get("lastBuildDate") or "")
     status_label, status_class, sort_rank, is_live, updated_display = _status_metadata(
         rss_available=rss_available,
@@ -138,6 +160,20 @@ def _build_feed_card(job: dict, feeds_path: Path) -> FeedCard:
         status_label=status_label,
         status_class=status_class,
         sort_rank=sort_rank,
+        alternate_formats=alternate_formats,
+    )
+
+
+def _alternate_formats(job: dict, output_name: str, feeds_path: Path) -> tuple[tuple[str, str], ...]:
+    """Configured non-RSS formats whose files exist next to the RSS output."""
+    try:
+        paths = feed_paths(output_name, job.get("formats"))
+    except ValueError:
+        return ()
+    return tuple(
+        (FORMAT_LABELS[name], path.as_posix())
+        for name, path in paths.items()
+        if name != "rss" and (feeds_path / path).exists()
     )
 
 
@@ -1037,6 +1073,10 @@ def _render_row(card: FeedCard) -> str:
         if card.rss_available
         else "<span>RSS unavailable</span>"
     )
+    format_actions = "".join(
+        '\n              <a href="{path}">{label}</a>'.format(path=escape(path), label=escape(label))
+        for label, path in card.alternate_formats
+    )
     source_action = (
         '<a href="{source_url}">Source</a>'.format(source_url=escape(card.source_url))
         if card.source_url
@@ -1056,7 +1096,7 @@ def _render_row(card: FeedCard) -> str:
               <span class="meta-item {status_class}"><span class="meta-key">Status</span><strong>{status_label}</strong></span>
             </div>
             <div class="row-actions">
-              {rss_action}
+              {rss_action}{format_actions}
               {source_action}
             </div>
           </div>
@@ -1069,5 +1109,6 @@ def _render_row(card: FeedCard) -> str:
         status_class=status_class,
         status_label=escape(card.status_label),
         rss_action=rss_action,
+        format_actions=format_actions,
         source_action=source_action,
     )
@@ -0,0 +1,164 @@
+"""Lightweight nested tracing spans with Chrome trace-event export.
+
+Spans nest through a context variable: run → job → fetch / parse / extract /
+generate. Like the run report, tracing needs no changes to jobs, and helper
+threads started through ``ContextThreadPoolExecutor`` attach their spans to
+the job that started them. Without an active :func:`tracing_scope`,
+:func:`span` costs one context-variable lookup.
+
+:meth:`Tracer.write_chrome` writes the trace-event JSON that ``chrome://tracing``,
+Perfetto and speedscope open as a flame chart.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from .path_utils import write_atomic
+
+# 常驻模式下 trace 会持续增长，超过上限的 span 只计数不保存。
+DEFAULT_MAX_SPANS = 200_000
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    span_id: int
+    parent_id: Optional[int]
+    start: float
+    end: float = 0.0
+    thread_id: int = 0
+    thread_name: str = ""
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class _NoopSpan:
+    """Returned when tracing is off, so callers can set attributes unconditionally."""
+
+    def set(self, **attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(self, max_spans: int = DEFAULT_MAX_SPANS):
+        self.max_spans = max_spans
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def record(self, span: Span):
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+    def chrome_events(self) -> list[dict]:
+        """完成的 span 转为 ``ph: X`` 事件（微秒），另附线程名元数据。"""
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        events = []
+        threads = {}
+        for span in spans:
+            threads.setdefault(span.thread_id, span.thread_name)
+            args = {key: _json_value(value) for key, value in span.attributes.items()}
+            args.update(span_id=span.span_id, parent_id=span.parent_id)
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1_000_000, 3),
+                "dur": round((span.end - span.start) * 1_000_000, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args,
+            })
+        for thread_id, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}})
+        return events
+
+    def write_chrome(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"traceEvents": self.chrome_events(), "displayTimeUnit": "ms"}
+        if self.dropped:
+            payload["otherData"] = {"dropped_spans": self.dropped}
+        write_atomic(path, json.dumps(payload, ensure_ascii=False))
+        return path
+
+
+def _json_value(value: Any) -> Any:
+    return value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+
+
+_current_tracer: ContextVar[Optional[Tracer]] = ContextVar("current_tracer", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def tracing_scope(tracer: Tracer) -> Iterator[Tracer]:
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+def current_span() -> Span | _NoopSpan:
+    return _current_span.get() or _NOOP_SPAN
+
+
+@contextmanager
+def span(name: str, category: Optional[str] = None, **attributes) -> Iterator[Span | _NoopSpan]:
+    """
+    记录一个嵌套在当前 span 之下的 span；没有 :func:`tracing_scope` 时不记录
+
+    代码块抛出异常时在 span 上记录 ``error`` 后继续抛出。
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+    parent = _current_span.get()
+    thread = threading.current_thread()
+    current = Span(
+        name=name,
+        category=category or name,
+        span_id=tracer.next_id(),
+        parent_id=parent.span_id if parent else None,
+        start=time.perf_counter(),
+        thread_id=thread.ident or 0,
+        thread_name=thread.name,
+        attributes=dict(attributes),
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.set(error=type(exc).__name__)
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current_span.reset(token)
+        tracer.record(current)
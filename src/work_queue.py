@@ -0,0 +1,469 @@
+"""Durable work queue for pull-based job execution.
+
+A coordinator enqueues due jobs; any number of workers lease one task at a
+time, run it and report the result. A lease that is not renewed (the worker
+died or hung) expires and the task becomes available again, up to
+``max_attempts`` runs. Failed runs are retried with exponential backoff.
+
+Two backends share one interface: SQLite (default, a file under the state
+directory, safe across processes on one machine) and Redis (any client with
+the redis-py API, for workers on several machines).
+Workers write feeds and job state to their own output and state
+directories, so on several machines those directories must be shared
+storage for the coordinator to see every feed.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUE_FILENAME = "queue.sqlite3"
+DEFAULT_LEASE_SECONDS = 900
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 60
+DEFAULT_POLL_INTERVAL = 5
+
+# 入队的去重、分配 id、写任务与排入 ready 在服务端一次完成，中途失败不会留下
+# 只登记了 active 却没有任务的 job（那样该 job 永远无法再入队）。
+# KEYS: active, seq, ready；ARGV: name, config, now, task key 前缀
+_REDIS_ENQUEUE = """
+if redis.call('SADD', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+local task_id = redis.call('INCR', KEYS[2])
+redis.call('HSET', ARGV[4] .. task_id, 'name', ARGV[1], 'config', ARGV[2], 'attempts', 0)
+redis.call('ZADD', KEYS[3], ARGV[3], task_id)
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class QueueTask:
+    id: str
+    name: str
+    config: dict = field(compare=False)
+    attempts: int = 1
+
+
+@dataclass(frozen=True)
+class TaskResult:
+    name: str
+    success: bool
+    details: str = ""
+    worker: str = ""
+    attempts: int = 1
+    finished_at: float = 0.0
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SQLiteWorkQueue:
+    """Work queue in a SQLite file; ``BEGIN IMMEDIATE`` serialises leases across processes."""
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        config TEXT NOT NULL,
+        state TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        available_at REAL NOT NULL,
+        lease_owner TEXT,
+        lease_until REAL,
+        enqueued_at REAL NOT NULL
+    );
+    -- 同名 job 同时只有一个未完成任务，重复入队被忽略。
+    CREATE UNIQUE INDEX IF NOT EXISTS tasks_active_name ON tasks (name) WHERE state IN ('queued', 'leased');
+    CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (state, available_at);
+    CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        success INTEGER NOT NULL,
+        details TEXT NOT NULL DEFAULT '',
+        worker TEXT NOT NULL DEFAULT '',
+        attempts INTEGER NOT NULL,
+        finished_at REAL NOT NULL
+    );
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = float(lease_seconds)
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_delay = float(retry_delay)
+        self._lock = threading.Lock()
+        # 手动管理事务，以便用 BEGIN IMMEDIATE 提前拿到写锁。
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+
+    def enqueue(self, name: str, config: dict, *, now: Optional[float] = None) -> bool:
+        """加入一个任务；同名任务尚未完成时返回 False。"""
+        now = time.time() if now is None else now
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO tasks (name, config, available_at, enqueued_at) VALUES (?, ?, ?, ?)",
+                (name, json.dumps(config, ensure_ascii=False), now, now),
+            )
+            return cursor.rowcount > 0
+
+    def lease(self, worker: str, *, now: Optional[float] = None) -> Optional[QueueTask]:
+        """租用最早到期的任务；顺带回收过期租约。"""
+        now = time.time() if now is None else now
+        with self._lock, self._transaction():
+            self._expire_leases(now)
+            row = self._conn.execute(
+                "SELECT id, name, config, attempts FROM tasks WHERE state = 'queued' AND available_at <= ? "
+                "ORDER BY available_at, id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            task_id, name, config, attempts = row
+            self._conn.execute(
+                "UPDATE tasks SET state = 'leased', attempts = attempts + 1, lease_owner = ?, lease_until = ? WHERE id = ?",
+                (worker, now + self.lease_seconds, task_id),
+            )
+        return QueueTask(id=str(task_id), name=name, config=json.loads(config), attempts=attempts + 1)
+
+    def heartbeat(self, task: QueueTask, worker: str, *, now: Optional[float] = None) -> bool:
+        """续租；租约已过期并被他人接手时返回 False。"""
+        now = time.time() if now is None else now
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_until = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (now + self.lease_seconds, int(task.id), worker),
+            )
+            return cursor.rowcount > 0
+
+    def complete(
+        self,
+        task: QueueTask,
+        worker: str,
+        success: bool,
+        details: str = "",
+        *,
+        now: Optional[float] = None,
+    ) -> bool:
+        """
+        报告任务结果：成功或重试次数用尽时结束任务，否则按退避延迟重新排队
+
+        Returns:
+            是否仍持有租约；租约已失效时结果被忽略
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._transaction():
+            row = self._conn.execute(
+                "SELECT attempts FROM tasks WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (int(task.id), worker),
+            ).fetchone()
+            if row is None:
+                return False
+            attempts = row[0]
+            if success or attempts >= self.max_attempts:
+                self._finish(int(task.id), task.name, success, details, worker, attempts, now)
+            else:
+                self._conn.execute(
+                    "UPDATE tasks SET state = 'queued', lease_owner = NULL, lease_until = NULL, available_at = ? "
+                    "WHERE id = ?",
+                    (now + _retry_delay(self.retry_delay, attempts), int(task.id)),
+                )
+        return True
+
+    def drain_results(self) -> list[TaskResult]:
+        """取出并删除已结束任务的结果。"""
+        with self._lock, self._transaction():
+            rows = self._conn.execute(
+                "SELECT id, name, success, details, worker, attempts, finished_at FROM results ORDER BY id"
+            ).fetchall()
+            if rows:
+                self._conn.execute("DELETE FROM results WHERE id <= ?", (rows[-1][0],))
+        return [
+            TaskResult(name, bool(success), details, worker, attempts, finished_at)
+            for _, name, success, details, worker, attempts, finished_at in rows
+        ]
+
+    def pending(self) -> int:
+        """未完成（排队中或执行中）的任务数。"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self):
+        return _ImmediateTransaction(self._conn)
+
+    def _expire_leases(self, now: float):
+        expired = self._conn.execute(
+            "SELECT id, name, attempts, lease_owner FROM tasks WHERE state = 'leased' AND lease_until <= ?", (now,)
+        ).fetchall()
+        for task_id, name, attempts, owner in expired:
+            if attempts >= self.max_attempts:
+                logger.warning(f"{name}: 租约过期且已达最大尝试次数 {attempts}，放弃")
+                self._finish(task_id, name, False, "租约过期", owner or "", attempts, now)
+            else:
+                logger.warning(f"{name}: {owner} 的租约已过期，重新排队")
+                self._conn.execute(
+                    "UPDATE tasks SET state = 'queued', lease_owner = NULL, lease_until = NULL WHERE id = ?", (task_id,)
+                )
+
+    def _finish(self, task_id: int, name: str, success: bool, details: str, worker: str, attempts: int, now: float):
+        self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        self._conn.execute(
+            "INSERT INTO results (name, success, details, worker, attempts, finished_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (name, int(success), details, worker, attempts, now),
+        )
+
+
+class _ImmediateTransaction:
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __enter__(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class RedisWorkQueue:
+    """Work queue on Redis (or any server speaking its protocol).
+
+    Keys under ``prefix``: ``ready`` (sorted set of task ids by time they may
+    be leased), ``task:<id>`` (hash), ``lease:<id>`` (owner, expiring with the
+    lease), ``active`` (set of job names with an unfinished task) and
+    ``results`` (list of JSON results). A leased task stays in ``ready`` with
+    its score pushed to the lease end, so an expired lease makes it visible
+    again without a sweeper.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        prefix: str = "rss:queue",
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ):
+        self.client = client
+        self.prefix = prefix.rstrip(":")
+        self.lease_seconds = float(lease_seconds)
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_delay = float(retry_delay)
+        self._enqueue_script = client.register_script(_REDIS_ENQUEUE)
+
+    def enqueue(self, name: str, config: dict, *, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        added = self._enqueue_script(
+            keys=[self._key("active"), self._key("seq"), self._key("ready")],
+            args=[name, json.dumps(config, ensure_ascii=False), now, self._key("task", "")],
+        )
+        return bool(int(added))
+
+    def lease(self, worker: str, *, now: Optional[float] = None) -> Optional[QueueTask]:
+        now = time.time() if now is None else now
+        for raw_id in self.client.zrangebyscore(self._key("ready"), "-inf", now, start=0, num=10):
+            task_id = _text(raw_id)
+            # SET NX 保证只有一个 worker 拿到租约；PX 到期即释放。
+            if not self.client.set(self._key("lease", task_id), worker, nx=True, px=self._lease_ms()):
+                continue
+            data = {_text(key): _text(value) for key, value in (self.client.hgetall(self._key("task", task_id)) or {}).items()}
+            if not data:
+                # 任务已被其他 worker 完成，清理残留。
+                self.client.zrem(self._key("ready"), task_id)
+                self.client.delete(self._key("lease", task_id))
+                continue
+            attempts = int(self.client.hincrby(self._key("task", task_id), "attempts", 1))
+            task = QueueTask(id=task_id, name=data["name"], config=json.loads(data["config"]), attempts=attempts)
+            if attempts > self.max_attempts:
+                logger.warning(f"{task.name}: 租约多次过期，已达最大尝试次数，放弃")
+                self._finish(task, False, "租约过期", worker, attempts - 1, now)
+                continue
+            self.client.zadd(self._key("ready"), {task_id: now + self.lease_seconds})
+            return task
+        return None
+
+    def heartbeat(self, task: QueueTask, worker: str, *, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        if _text(self.client.get(self._key("lease", task.id))) != worker:
+            return False
+        self.client.pexpire(self._key("lease", task.id), self._lease_ms())
+        self.client.zadd(self._key("ready"), {task.id: now + self.lease_seconds}, xx=True)
+        return True
+
+    def complete(
+        self,
+        task: QueueTask,
+        worker: str,
+        success: bool,
+        details: str = "",
+        *,
+        now: Optional[float] = None,
+    ) -> bool:
+        now = time.time() if now is None else now
+        if _text(self.client.get(self._key("lease", task.id))) != worker:
+            return False
+        if success or task.attempts >= self.max_attempts:
+            self._finish(task, success, details, worker, task.attempts, now)
+        else:
+            self.client.zadd(self._key("ready"), {task.id: now + _retry_delay(self.retry_delay, task.attempts)})
+            self.client.delete(self._key("lease", task.id))
+        return True
+
+    def drain_results(self) -> list[TaskResult]:
+        results = []
+        while (raw := self.client.lpop(self._key("results"))) is not None:
+            results.append(TaskResult(**json.loads(_text(raw))))
+        return results
+
+    def pending(self) -> int:
+        return int(self.client.zcard(self._key("ready")))
+
+    def close(self):
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+    def _finish(self, task: QueueTask, success: bool, details: str, worker: str, attempts: int, now: float):
+        result = TaskResult(task.name, success, details, worker, attempts, now)
+        self.client.rpush(self._key("results"), json.dumps(result.__dict__, ensure_ascii=False))
+        self.client.zrem(self._key("ready"), task.id)
+        self.client.delete(self._key("task", task.id), self._key("lease", task.id))
+        self.client.srem(self._key("active"), task.name)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    def _lease_ms(self) -> int:
+        return max(1, int(self.lease_seconds * 1000))
+
+
+def _retry_delay(base: float, attempts: int) -> float:
+    return base * 2 ** max(0, attempts - 1)
+
+
+def _text(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+WorkQueue = SQLiteWorkQueue | RedisWorkQueue
+
+
+def open_work_queue(config: dict, state_dir: Optional[str | Path]) -> WorkQueue:
+    """
+    按顶层 ``queue`` 配置打开队列
+
+    ``queue: {backend: sqlite | redis, path: ..., url: redis://..., prefix: ..., lease_seconds: 900,
+    max_attempts: 3, retry_delay: 60}``；SQLite 默认位于状态目录的 ``queue.sqlite3``。
+    """
+    options = config.get("queue") or {}
+    common = {
+        "lease_seconds": float(options.get("lease_seconds", DEFAULT_LEASE_SECONDS)),
+        "max_attempts": int(options.get("max_attempts", DEFAULT_MAX_ATTEMPTS)),
+        "retry_delay": float(options.get("retry_delay", DEFAULT_RETRY_DELAY)),
+    }
+    backend = str(options.get("backend", "sqlite")).lower()
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError:  # 可选依赖：仅 Redis 后端需要
+            raise RuntimeError("queue.backend 为 redis 时需要安装 redis 包") from None
+        client = redis.Redis.from_url(str(options.get("url", "redis://localhost:6379/0")), decode_responses=True)
+        return RedisWorkQueue(client, prefix=str(options.get("prefix", "rss:queue")), **common)
+    if backend != "sqlite":
+        raise ValueError(f"未知的 queue.backend: {backend}")
+
+    path = options.get("path")
+    if not path:
+        if state_dir is None:
+            raise ValueError("SQLite 队列需要 queue.path 或 --state-dir")
+        path = Path(state_dir) / QUEUE_FILENAME
+    return SQLiteWorkQueue(path, **common)
+
+
+class Worker:
+    """Lease tasks from a queue and run them, renewing the lease while a task runs."""
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        run_job: Callable[[dict], tuple[bool, str]],
+        *,
+        worker_id: Optional[str] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        Args:
+            run_job: 执行一个 job 配置，返回 ``(是否成功, 说明)``
+        """
+        self.queue = queue
+        self.run_job = run_job
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = float(poll_interval)
+        self._stopped = threading.Event()
+
+    def run_once(self) -> bool:
+        """处理一个任务；队列为空时返回 False。"""
+        task = self.queue.lease(self.worker_id)
+        if task is None:
+            return False
+
+        logger.info(f"{self.worker_id}: 开始执行 {task.name}（第 {task.attempts} 次）")
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(task, stop_heartbeat), daemon=True)
+        heartbeat.start()
+        try:
+            success, details = self.run_job(task.config)
+        except Exception as exc:
+            success, details = False, f"执行异常 - {exc}"
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+
+        if not self.queue.complete(task, self.worker_id, success, details):
+            # 租约已被其他 worker 接手；输出文件为原子替换，重复执行不会留下半成品。
+            logger.warning(f"{task.name}: 租约已失效，本次结果被忽略")
+        return True
+
+    def run(self, *, drain: bool = False):
+        """持续处理任务，直到 :meth:`stop`；``drain`` 为 True 时队列为空即退出。"""
+        while not self._stopped.is_set():
+            if self.run_once():
+                continue
+            if drain:
+                break
+            self._stopped.wait(self.poll_interval)
+
+    def stop(self):
+        self._stopped.set()
+
+    def _heartbeat(self, task: QueueTask, stop: threading.Event):
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not stop.wait(interval):
+            if not self.queue.heartbeat(task, self.worker_id):
+                logger.warning(f"{task.name}: 续租失败，租约可能已过期")
+                return
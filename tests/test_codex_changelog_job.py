@@ -1,4 +1,6 @@
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -181,6 +183,92 @@ class CodexChangelogJobTests(unittest.TestCase):
         self.assertFalse(result.success)
         self.assertIn("抓取 changelog 页面和 GitHub Releases Atom feed 均失败", result.details)
 
+    def _hedged_config(self, hedge_after):
+        return {
+            "type": "codex_changelog",
+            "name": "Codex GitHub Releases",
+            "url": "https://developers.openai.com/codex/changelog",
+            "fallback_atom_url": "https://github.com/openai/codex/releases.atom",
+            "output": "codex_github_releases.xml",
+            "anchor_prefixes": ["github-release-"],
+            "options": {"max_items": 10, "hedge_after": hedge_after},
+        }
+
+    def _run_with_fetch(self, config, fake_fetch):
+        with patch("src.jobs.codex_changelog.WebScraper.fetch", autospec=True, side_effect=fake_fetch):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                result = CodexChangelogJob(config).run(JobContext(feeds_dir=Path(temp_dir)))
+                xml = (Path(temp_dir) / "codex_github_releases.xml").read_text(encoding="utf-8")
+        return result, xml
+
+    def test_hedged_mode_uses_atom_when_changelog_is_slow(self):
+        release = threading.Event()
+
+        def fake_fetch(_scraper, url, encoding=None):
+            if url.endswith(".atom"):
+                return SAMPLE_GITHUB_RELEASES_ATOM
+            release.wait(2)
+            return SAMPLE_CHANGELOG_HTML
+
+        started = time.monotonic()
+        result, xml = self._run_with_fetch(self._hedged_config(0.05), fake_fetch)
+        elapsed = time.monotonic() - started
+        release.set()
+
+        self.assertTrue(result.success)
+        self.assertIn("tag:github.com,2008:Repository/123456789/rust-v0.112.0", xml)
+        self.assertLess(elapsed, 1.5)
+
+    def test_hedged_mode_prefers_changelog_when_both_succeed(self):
+        def fake_fetch(_scraper, url, encoding=None):
+            if url.endswith(".atom"):
+                time.sleep(0.1)
+                return SAMPLE_GITHUB_RELEASES_ATOM
+            return SAMPLE_CHANGELOG_HTML
+
+        result, xml = self._run_with_fetch(self._hedged_config(0), fake_fetch)
+
+        self.assertTrue(result.success)
+        self.assertIn("github-release-294459110", xml)
+        self.assertNotIn("tag:github.com", xml)
+
+    def test_hedged_mode_skips_atom_when_changelog_is_fast(self):
+        calls = []
+
+        def fake_fetch(_scraper, url, encoding=None):
+            calls.append(url)
+            return SAMPLE_CHANGELOG_HTML
+
+        result, _ = self._run_with_fetch(self._hedged_config(5), fake_fetch)
+
+        self.assertTrue(result.success)
+        self.assertEqual(calls, ["https://developers.openai.com/codex/changelog"])
+
+    def test_hedged_mode_falls_back_when_changelog_is_empty(self):
+        def fake_fetch(_scraper, url, encoding=None):
+            if url.endswith(".atom"):
+                return SAMPLE_GITHUB_RELEASES_ATOM
+            return None
+
+        result, xml = self._run_with_fetch(self._hedged_config(5), fake_fetch)
+
+        self.assertTrue(result.success)
+        self.assertIn("rust-v0.112.0", xml)
+
+    def test_hedged_mode_logs_a_failed_source_once(self):
+        def fake_fetch(_scraper, url, encoding=None):
+            if url.endswith(".atom"):
+                time.sleep(0.1)
+                return SAMPLE_GITHUB_RELEASES_ATOM
+            raise RuntimeError("boom")
+
+        with self.assertLogs("src.jobs.codex_changelog", level="WARNING") as logs:
+            result, xml = self._run_with_fetch(self._hedged_config(0), fake_fetch)
+
+        self.assertTrue(result.success)
+        self.assertIn("rust-v0.112.0", xml)
+        self.assertEqual(sum("数据源抓取异常" in line for line in logs.output), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+from src import dates
+
+
+class DateParsingTests(unittest.TestCase):
+    def setUp(self):
+        dates._parse_text.cache_clear()
+
+    def test_fast_paths_do_not_call_dateutil(self):
+        with patch("src.dates.date_parser.parse") as dateutil_parse:
+            iso = dates.parse_datetime("2026-02-12T09:30:00+08:00")
+            day = dates.parse_datetime("2026-03-08")
+            rfc = dates.parse_datetime("Fri, 14 Feb 2026 06:27:21 +0000")
+
+        dateutil_parse.assert_not_called()
+        self.assertEqual(iso, datetime(2026, 2, 12, 9, 30, tzinfo=timezone(timedelta(hours=8))))
+        self.assertEqual(day, datetime(2026, 3, 8, tzinfo=timezone.utc))
+        self.assertEqual(rfc, datetime(2026, 2, 14, 6, 27, 21, tzinfo=timezone.utc))
+
+    def test_falls_back_to_dateutil_and_memoizes(self):
+        with patch("src.dates.date_parser.parse", wraps=dates.date_parser.parse) as dateutil_parse:
+            first = dates.parse_datetime("March 5, 2026")
+            second = dates.parse_datetime("March 5, 2026")
+
+        self.assertEqual(dateutil_parse.call_count, 1)
+        self.assertEqual(first, datetime(2026, 3, 5, tzinfo=timezone.utc))
+        self.assertIs(first, second)
+
+    def test_dates_completed_from_today_are_not_reused_the_next_day(self):
+        with patch("src.dates.date") as fake_date:
+            fake_date.today.return_value = date(2026, 12, 31)
+            before = dates.parse_datetime("March 5")
+            fake_date.today.return_value = date(2027, 1, 1)
+            after = dates.parse_datetime("March 5")
+
+        self.assertEqual(before, datetime(2026, 3, 5, tzinfo=timezone.utc))
+        self.assertEqual(after, datetime(2027, 3, 5, tzinfo=timezone.utc))
+
+    def test_invalid_and_empty_values_return_none(self):
+        self.assertIsNone(dates.parse_datetime("not a date"))
+        self.assertIsNone(dates.parse_datetime("  "))
+        self.assertIsNone(dates.parse_datetime(None))
+        self.assertIsNone(dates.format_rss_date("not a date"))
+
+    def test_fuzzy_parsing_is_keyed_separately(self):
+        self.assertIsNone(dates.parse_datetime("published on 2026-01-20 by MiniMax"))
+        self.assertEqual(
+            dates.parse_datetime("published on 2026-01-20 by MiniMax", fuzzy=True),
+            datetime(2026, 1, 20, tzinfo=timezone.utc),
+        )
+
+    def test_format_rss_date(self):
+        self.assertEqual(dates.format_rss_date("2026-01-02T03:04:05Z"), "Fri, 02 Jan 2026 03:04:05 +0000")
+
+
+if __name__ == "__main__":
+    unittest.main()
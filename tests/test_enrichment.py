@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.enrichment import DetailEnricher, DetailPageCache, extract_detail_metadata
+
+DETAIL_HTML = """
+<html>
+  <head>
+    <meta name="citation_publication_date" content="2025-11-03" />
+    <script type="application/ld+json">
+      {"@context": "https://schema.org", "@type": "ScholarlyArticle",
+       "author": [{"name": "Ada Lovelace"}, {"name": "Alan Turing"}],
+       "description": "Scaling laws for motion forecasting."}
+    </script>
+  </head>
+  <body><h1>Paper</h1></body>
+</html>
+"""
+
+
+class DetailEnrichmentTests(unittest.TestCase):
+    def test_extract_detail_metadata_prefers_meta_then_json_ld(self):
+        metadata = extract_detail_metadata(DETAIL_HTML)
+
+        self.assertEqual(metadata["pubDate"], "2025-11-03")
+        self.assertEqual(metadata["author"], "Ada Lovelace, Alan Turing")
+        self.assertEqual(metadata["description"], "Scaling laws for motion forecasting.")
+
+    def test_enricher_fills_missing_fields_and_caches_across_runs(self):
+        scraper = MagicMock()
+        scraper.fetch.return_value = DETAIL_HTML
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = Path(temp_dir) / "details.json"
+            items = [
+                {"title": "Paper", "link": "https://example.com/p1", "description": "Listing text"},
+                {"title": "Paper dup", "link": "https://example.com/p1"},
+            ]
+            DetailEnricher(scraper, DetailPageCache(cache_path), fields=["pubDate", "description"]).enrich(items)
+
+            self.assertEqual(scraper.fetch.call_count, 1)
+            self.assertEqual(items[0]["pubDate"], "2025-11-03")
+            self.assertEqual(items[0]["description"], "Listing text")
+            self.assertEqual(items[1]["description"], "Scaling laws for motion forecasting.")
+            self.assertNotIn("author", items[0])
+
+            next_run_items = [{"title": "Paper", "link": "https://example.com/p1"}]
+            DetailEnricher(scraper, DetailPageCache(cache_path), fields=["pubDate"]).enrich(next_run_items)
+
+        self.assertEqual(scraper.fetch.call_count, 1)
+        self.assertEqual(next_run_items[0]["pubDate"], "2025-11-03")
+
+    def test_failed_fetches_are_retried_next_run(self):
+        scraper = MagicMock()
+        scraper.fetch.return_value = None
+        cache = DetailPageCache()
+        items = [{"title": "Paper", "link": "https://example.com/p1"}]
+
+        DetailEnricher(scraper, cache, fields=["pubDate"]).enrich(items)
+        DetailEnricher(scraper, cache, fields=["pubDate"]).enrich(items)
+
+        self.assertEqual(scraper.fetch.call_count, 2)
+        self.assertNotIn("pubDate", items[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
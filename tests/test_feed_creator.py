@@ -0,0 +1,260 @@
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from unittest.mock import patch
+
+from src.feed_creator import FeedCreator
+from src.path_utils import safe_filename
+
+LISTING_HTML = """
+<main>
+  <section class="blog">
+    <article><h3>Blog A</h3><a href="/blog/a">Read</a></article>
+    <article><h3>Blog B</h3><a href="/blog/b">Read</a></article>
+  </section>
+  <section class="papers">
+    <div class="paper"><h4>Paper A</h4><a href="/papers/a">PDF</a></div>
+  </section>
+</main>
+"""
+
+
+def _titles(path: Path) -> list[str]:
+    return sorted(item.findtext("title") for item in ET.parse(path).iter("item"))
+
+
+class FeedCreatorTests(unittest.TestCase):
+    @patch("src.feed_creator.WebScraper.fetch", return_value=LISTING_HTML)
+    def test_single_output_config_still_supported(self, fetch):
+        config = {
+            "name": "Demo",
+            "url": "https://example.com/",
+            "output": "demo.xml",
+            "selectors": {"items": "section.blog article", "title": "h3", "link": "a"},
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertTrue(FeedCreator(temp_dir).create_feed(config))
+            self.assertEqual(_titles(Path(temp_dir) / "demo.xml"), ["Blog A", "Blog B"])
+
+        fetch.assert_called_once()
+
+    @patch("src.feed_creator.HTMLParser")
+    @patch("src.feed_creator.WebScraper.fetch", return_value=LISTING_HTML)
+    def test_multi_output_fetches_and_parses_once(self, fetch, parser_cls):
+        from src.parser import HTMLParser
+
+        parser_cls.side_effect = lambda html, base_url="": HTMLParser(html, base_url=base_url)
+        config = {
+            "name": "Demo Lab",
+            "url": "https://example.com/",
+            "outputs": [
+                {
+                    "output": "demo_blog.xml",
+                    "title": "Demo Blog",
+                    "selectors": {"items": "section.blog article", "title": "h3", "link": "a"},
+                },
+                {
+                    "output": "demo_papers.xml",
+                    "title": "Demo Papers",
+                    "selectors": {"items": "div.paper", "title": "h4", "link": "a"},
+                },
+            ],
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertTrue(FeedCreator(temp_dir).create_feed(config))
+            blog_titles = _titles(Path(temp_dir) / "demo_blog.xml")
+            paper_titles = _titles(Path(temp_dir) / "demo_papers.xml")
+            channel_title = ET.parse(Path(temp_dir) / "demo_papers.xml").findtext("./channel/title")
+
+        fetch.assert_called_once()
+        parser_cls.assert_called_once()
+        self.assertEqual(blog_titles, ["Blog A", "Blog B"])
+        self.assertEqual(paper_titles, ["Paper A"])
+        self.assertEqual(channel_title, "Demo Papers")
+
+    @patch("src.feed_creator.WebScraper.fetch", return_value=LISTING_HTML)
+    def test_multi_output_reports_failure_but_writes_other_outputs(self, _fetch):
+        config = {
+            "name": "Demo Lab",
+            "url": "https://example.com/",
+            "outputs": [
+                {"output": "ok.xml", "selectors": {"items": "div.paper", "title": "h4", "link": "a"}},
+                {"output": "empty.xml", "selectors": {"items": "div.missing", "title": "h4", "link": "a"}},
+            ],
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertFalse(FeedCreator(temp_dir).create_feed(config))
+            self.assertTrue((Path(temp_dir) / "ok.xml").exists())
+            self.assertFalse((Path(temp_dir) / "empty.xml").exists())
+
+    @patch("src.feed_creator.WebScraper.fetch", return_value=LISTING_HTML)
+    def test_error_in_one_output_does_not_stop_the_rest(self, _fetch):
+        config = {
+            "name": "Demo Lab",
+            "url": "https://example.com/",
+            "outputs": [
+                {"output": "broken.xml", "selectors": {"items": "div.paper", "title": "h4", "link": "a"}},
+                {"output": "ok.xml", "selectors": {"items": "section.blog article", "title": "h3", "link": "a"}},
+            ],
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            creator = FeedCreator(temp_dir)
+            resolve = creator._resolve_output_path
+
+            def resolve_output_path(output):
+                if output == "broken.xml":
+                    raise ValueError("bad output path")
+                return resolve(output)
+
+            with patch.object(creator, "_resolve_output_path", side_effect=resolve_output_path):
+                self.assertFalse(creator.create_feed(config))
+            self.assertEqual(_titles(Path(temp_dir) / "ok.xml"), ["Blog A", "Blog B"])
+
+    def test_enrich_fetches_detail_pages_for_missing_dates(self):
+        detail_html = '<html><head><meta property="article:published_time" content="2026-01-05T08:00:00Z"></head></html>'
+
+        def fake_fetch(_scraper, url, encoding=None):
+            return LISTING_HTML if url == "https://example.com/" else detail_html
+
+        config = {
+            "name": "Demo",
+            "url": "https://example.com/",
+            "output": "demo.xml",
+            "selectors": {"items": "div.paper", "title": "h4", "link": "a"},
+            "enrich": {"fields": ["pubDate"]},
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "src.feed_creator.WebScraper.fetch", autospec=True, side_effect=fake_fetch
+        ):
+            feeds_dir = Path(temp_dir) / "feeds"
+            state_dir = Path(temp_dir) / "state"
+            self.assertTrue(FeedCreator(str(feeds_dir), state_dir=str(state_dir)).create_feed(config))
+            pub_date = ET.parse(feeds_dir / "demo.xml").findtext("./channel/item/pubDate")
+            self.assertTrue((state_dir / "details" / f"{safe_filename('Demo')}.json").exists())
+
+        self.assertEqual(pub_date, "Mon, 05 Jan 2026 08:00:00 +0000")
+
+
+def _listing_page(*slugs, next_href=None):
+    articles = "".join(f'<article><h3>{slug}</h3><a href="/posts/{slug}">Read</a></article>' for slug in slugs)
+    next_link = f'<a class="next" href="{next_href}">Next</a>' if next_href else ""
+    return f"<main>{articles}{next_link}</main>"
+
+
+class FeedCreatorPaginationTests(unittest.TestCase):
+    selectors = {"items": "article", "title": "h3", "link": "a"}
+
+    def _config(self, pagination):
+        return {
+            "name": "Archive",
+            "url": "https://example.com/blog/",
+            "output": "archive.xml",
+            "selectors": self.selectors,
+            "pagination": pagination,
+            "options": {"max_items": 10},
+        }
+
+    def test_url_template_backfills_then_stops_at_known_page(self):
+        pages = {
+            "https://example.com/blog/": _listing_page("p1"),
+            "https://example.com/blog/page/2/": _listing_page("p2"),
+            "https://example.com/blog/page/3/": _listing_page("p3"),
+            "https://example.com/blog/page/4/": _listing_page(),
+        }
+        fetched = []
+
+        def fake_fetch(_scraper, url, encoding=None):
+            fetched.append(url)
+            return pages.get(url)
+
+        config = self._config({"url_template": "https://example.com/blog/page/{page}/", "max_pages": 10, "prefetch": 2})
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "src.feed_creator.WebScraper.fetch", autospec=True, side_effect=fake_fetch
+        ):
+            creator = FeedCreator(temp_dir)
+            self.assertTrue(creator.create_feed(config))
+            self.assertEqual(_titles(Path(temp_dir) / "archive.xml"), ["p1", "p2", "p3"])
+            self.assertIn("https://example.com/blog/page/4/", fetched)
+
+            # 第二轮：首页出现新条目，第 2 页全是已知条目 -> 停止，但保留旧条目
+            pages["https://example.com/blog/"] = _listing_page("p0", "p1")
+            pages["https://example.com/blog/page/2/"] = _listing_page("p2")
+            fetched.clear()
+            config["pagination"]["prefetch"] = 1
+            self.assertTrue(creator.create_feed(config))
+            titles = _titles(Path(temp_dir) / "archive.xml")
+
+        self.assertEqual(fetched, ["https://example.com/blog/", "https://example.com/blog/page/2/"])
+        self.assertEqual(titles, ["p0", "p1", "p2", "p3"])
+
+    def test_known_items_come_from_state_dir_when_feeds_dir_starts_empty(self):
+        pages = {
+            "https://example.com/blog/": _listing_page("p1"),
+            "https://example.com/blog/page/2/": _listing_page("p2"),
+        }
+        fetched = []
+
+        def fake_fetch(_scraper, url, encoding=None):
+            fetched.append(url)
+            return pages.get(url)
+
+        config = self._config({"url_template": "https://example.com/blog/page/{page}/", "max_pages": 3, "prefetch": 1})
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "src.feed_creator.WebScraper.fetch", autospec=True, side_effect=fake_fetch
+        ):
+            state_dir = Path(temp_dir) / "state"
+            self.assertTrue(FeedCreator(str(Path(temp_dir) / "run1"), state_dir=str(state_dir)).create_feed(config))
+
+            # 与 CI 一样，下一轮从空的 feeds 目录开始，只保留状态目录。
+            pages["https://example.com/blog/"] = _listing_page("p0")
+            fetched.clear()
+            self.assertTrue(FeedCreator(str(Path(temp_dir) / "run2"), state_dir=str(state_dir)).create_feed(config))
+            titles = _titles(Path(temp_dir) / "run2" / "archive.xml")
+
+        self.assertEqual(fetched, ["https://example.com/blog/", "https://example.com/blog/page/2/"])
+        self.assertEqual(titles, ["p0", "p1", "p2"])
+
+    def test_first_page_with_only_known_items_fetches_single_page(self):
+        fetched = []
+
+        def fake_fetch(_scraper, url, encoding=None):
+            fetched.append(url)
+            return _listing_page("p1", next_href="?page=2")
+
+        config = self._config({"next": "a.next", "max_pages": 5})
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "src.feed_creator.WebScraper.fetch", autospec=True, side_effect=fake_fetch
+        ):
+            creator = FeedCreator(temp_dir)
+            self.assertTrue(creator.create_feed(config))
+            self.assertEqual(fetched, ["https://example.com/blog/", "https://example.com/blog/?page=2"])
+
+            fetched.clear()
+            self.assertTrue(creator.create_feed(config))
+
+        self.assertEqual(fetched, ["https://example.com/blog/"])
+
+    def test_next_selector_follows_links_until_max_pages(self):
+        pages = {
+            "https://example.com/blog/": _listing_page("p1", next_href="/blog/?page=2"),
+            "https://example.com/blog/?page=2": _listing_page("p2", next_href="/blog/?page=3"),
+            "https://example.com/blog/?page=3": _listing_page("p3", next_href="/blog/?page=4"),
+        }
+
+        config = self._config({"next": "a.next", "max_pages": 2})
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "src.feed_creator.WebScraper.fetch", autospec=True, side_effect=lambda _s, url, encoding=None: pages.get(url)
+        ):
+            self.assertTrue(FeedCreator(temp_dir).create_feed(config))
+            titles = _titles(Path(temp_dir) / "archive.xml")
+
+        self.assertEqual(titles, ["p1", "p2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
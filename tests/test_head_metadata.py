@@ -0,0 +1,46 @@
+import unittest
+
+from src.head_metadata import parse_head_metadata
+
+ARTICLE_HTML = """<!doctype html>
+<html>
+  <head>
+    <title>MiniMax M2.5 &amp; friends</title>
+    <meta property="og:title" content="MiniMax M2.5" />
+    <meta name="description" content="">
+    <meta name="description" content="second description is ignored">
+    <link rel="canonical" href="https://www.minimax.io/news/minimax-m25">
+    <script type="application/ld+json">[{"@type": "NewsArticle", "datePublished": "2026-02-12"}]</script>
+  </head>
+  <body>
+    <meta name="author" content="body meta is never read">
+    <h1>Body heading</h1>
+  </body>
+</html>
+"""
+
+
+class HeadMetadataTests(unittest.TestCase):
+    def test_collects_head_fields_and_stops_at_head_end(self):
+        head = parse_head_metadata(ARTICLE_HTML)
+
+        self.assertTrue(head.complete)
+        self.assertEqual(head.title, "MiniMax M2.5 & friends")
+        self.assertEqual(head.canonical, "https://www.minimax.io/news/minimax-m25")
+        self.assertEqual(head.first_meta([("property", "og:title")]), "MiniMax M2.5")
+        self.assertIsNone(head.first_meta([("name", "description")]))
+        self.assertIsNone(head.first_meta([("name", "author")]))
+        self.assertEqual(head.json_ld, [{"@type": "NewsArticle", "datePublished": "2026-02-12"}])
+
+    def test_small_chunks_produce_identical_result(self):
+        self.assertEqual(parse_head_metadata(ARTICLE_HTML, chunk_size=7), parse_head_metadata(ARTICLE_HTML))
+
+    def test_document_without_head_end_is_marked_incomplete(self):
+        head = parse_head_metadata('<meta name="description" content="fragment">')
+
+        self.assertFalse(head.complete)
+        self.assertEqual(head.first_meta([("name", "description")]), "fragment")
+
+
+if __name__ == "__main__":
+    unittest.main()
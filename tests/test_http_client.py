@@ -0,0 +1,185 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.concurrency import CancelToken, ContextThreadPoolExecutor, cancellation_scope
+from src.http_client import DeadlineExceeded, coalesce_fetches, create_retry_session, pooled_sessions
+
+
+def _fake_send(calls, *, delay=0.0, status_code=200):
+    lock = threading.Lock()
+
+    def send(_adapter, request, **kwargs):
+        with lock:
+            calls.append(request.url)
+        time.sleep(delay)
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = f"body {len(calls)}".encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    return send
+
+
+class CoalescingFetchTests(unittest.TestCase):
+    def test_repeated_gets_across_sessions_share_one_request(self):
+        calls = []
+        with patch.object(HTTPAdapter, "send", _fake_send(calls)):
+            with coalesce_fetches() as cache:
+                first = create_retry_session().get("https://example.com/list")
+                second = create_retry_session().get("https://example.com/list")
+
+        self.assertEqual(calls, ["https://example.com/list"])
+        self.assertEqual(first.text, second.text)
+        self.assertEqual(cache.hits, 1)
+
+    def test_concurrent_gets_wait_for_in_flight_request(self):
+        calls = []
+        bodies = []
+        with patch.object(HTTPAdapter, "send", _fake_send(calls, delay=0.1)):
+            with coalesce_fetches():
+                # 合并作用域通过 contextvars 传递，需使用 ContextThreadPoolExecutor 派发。
+                with ContextThreadPoolExecutor(max_workers=4) as executor:
+                    futures = [
+                        executor.submit(lambda: create_retry_session().get("https://example.com/a").text)
+                        for _ in range(4)
+                    ]
+                    bodies = [future.result() for future in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(bodies, ["body 1"] * 4)
+
+    def test_concurrent_scopes_in_different_threads_stay_isolated(self):
+        calls = []
+        scope_entered = threading.Barrier(2)
+        caches = []
+
+        def run_scope():
+            with coalesce_fetches() as cache:
+                scope_entered.wait()
+                create_retry_session().get("https://example.com/a")
+                create_retry_session().get("https://example.com/a")
+                caches.append(cache)
+                scope_entered.wait()
+
+        with patch.object(HTTPAdapter, "send", _fake_send(calls)):
+            threads = [threading.Thread(target=run_scope) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            create_retry_session().get("https://example.com/a")
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([cache.hits for cache in caches], [1, 1])
+
+    def test_different_headers_are_fetched_separately(self):
+        calls = []
+        with patch.object(HTTPAdapter, "send", _fake_send(calls)):
+            with coalesce_fetches():
+                create_retry_session(accept="text/html").get("https://example.com/a")
+                create_retry_session(accept="application/json").get("https://example.com/a")
+
+        self.assertEqual(len(calls), 2)
+
+    def test_server_errors_are_not_cached_and_scope_is_required(self):
+        calls = []
+        with patch.object(HTTPAdapter, "send", _fake_send(calls, status_code=503)):
+            with coalesce_fetches():
+                session = create_retry_session()
+                session.get("https://example.com/a")
+                session.get("https://example.com/a")
+            create_retry_session().get("https://example.com/a")
+
+        self.assertEqual(len(calls), 3)
+
+
+class DeadlineTests(unittest.TestCase):
+    def test_timeouts_shrink_to_remaining_budget_and_expired_jobs_fail_fast(self):
+        timeouts = []
+
+        def send(_adapter, request, **kwargs):
+            timeouts.append(kwargs["timeout"])
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b"ok"
+            return response
+
+        now = [0.0]
+        token = CancelToken(10, clock=lambda: now[0])
+        with patch.object(HTTPAdapter, "send", send), cancellation_scope(token):
+            session = create_retry_session()
+            session.get("https://example.com/a", timeout=15)
+            now[0] = 8
+            session.get("https://example.com/b", timeout=(5, 15))
+            now[0] = 10
+            with self.assertRaises(DeadlineExceeded):
+                session.get("https://example.com/c", timeout=15)
+
+        self.assertEqual(timeouts, [10, (2, 2)])
+        self.assertIsInstance(DeadlineExceeded(), requests.RequestException)
+
+    def test_child_token_follows_parent_cancellation_and_deadline(self):
+        now = [0.0]
+        parent = CancelToken(5, clock=lambda: now[0])
+        child = CancelToken(10, clock=lambda: now[0], parent=parent)
+
+        self.assertEqual(child.remaining(), 5)
+        self.assertFalse(child.cancelled)
+        parent.cancel("配置中已移除")
+        self.assertTrue(child.cancelled)
+        self.assertEqual(child.reason, "配置中已移除")
+
+    def test_retry_sleeps_do_not_outlast_the_budget(self):
+        hits = []
+
+        class Unavailable(BaseHTTPRequestHandler):
+            def do_GET(self):
+                hits.append(self.path)
+                self.send_response(503)
+                self.send_header("Retry-After", "2")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Unavailable)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/feed"
+
+        started = time.monotonic()
+        with cancellation_scope(CancelToken(0.5)):
+            response = create_retry_session(retries=3).get(url, timeout=5)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(hits), 1)
+        self.assertLess(elapsed, 1.0)
+
+
+class SessionPoolTests(unittest.TestCase):
+    def test_sessions_are_reused_per_options_and_closed_on_exit(self):
+        with pooled_sessions() as pool:
+            first = create_retry_session(accept="text/html")
+            self.assertIs(create_retry_session(accept="text/html"), first)
+            self.assertIsNot(create_retry_session(accept="application/json"), first)
+
+            with ContextThreadPoolExecutor(max_workers=1) as executor:
+                self.assertIs(executor.submit(create_retry_session, accept="text/html").result(), first)
+
+        self.assertEqual((pool.hits, len(pool)), (2, 0))
+        self.assertIsNot(create_retry_session(accept="text/html"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from datetime import datetime, timezone
+
+from src.item import Item, coerce_item, guid_hash
+
+
+class ItemTests(unittest.TestCase):
+    def test_normalises_fields_on_construction(self):
+        item = Item(title="  Title ", link=" https://example.com/a ", published="2026-02-01T08:00:00Z")
+
+        self.assertEqual(item.title, "Title")
+        self.assertEqual(item.link, "https://example.com/a")
+        self.assertEqual(item.guid, "https://example.com/a")
+        self.assertEqual(item.published, datetime(2026, 2, 1, 8, tzinfo=timezone.utc))
+        self.assertEqual(item.guid_hash, guid_hash("https://example.com/a"))
+
+    def test_unparseable_date_becomes_none(self):
+        self.assertIsNone(Item(title="A", link="https://example.com/a", published="not-a-date").published)
+
+    def test_dict_round_trip(self):
+        data = {
+            "title": "A",
+            "link": "https://example.com/a",
+            "guid": "tag:example.com,2026:a",
+            "description": "Body",
+            "pubDate": "Sun, 01 Feb 2026 08:00:00 +0000",
+            "author": "Alice",
+        }
+        item = coerce_item(data)
+
+        self.assertEqual(item.to_dict(), data)
+        self.assertIs(coerce_item(item), item)
+
+    def test_guid_hash_fits_signed_64_bit_and_items_have_no_dict(self):
+        value = guid_hash("https://example.com/a")
+
+        self.assertTrue(-(2**63) <= value < 2**63)
+        self.assertNotEqual(value, guid_hash("https://example.com/b"))
+        self.assertFalse(hasattr(Item(title="A", link="https://example.com/a"), "__dict__"))
+
+    def test_sort_key_puts_undated_items_last_when_descending(self):
+        dated = Item(title="A", link="https://example.com/a", published="2026-01-01")
+        undated = Item(title="B", link="https://example.com/b")
+
+        ordered = sorted([undated, dated], key=lambda item: item.sort_key, reverse=True)
+
+        self.assertEqual(ordered, [dated, undated])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from src.item import Item
+from src.item_store import ItemStore, add_with_history
+from src.rss_generator import RSSGenerator
+
+
+def _item(slug: str, published: str | None = None, **kwargs) -> Item:
+    return Item(title=slug.upper(), link=f"https://example.com/{slug}", published=published, **kwargs)
+
+
+class ItemStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ItemStore(Path(self.temp_dir.name) / "items.sqlite3")
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_upsert_counts_new_items_and_keeps_items_that_scrolled_off(self):
+        self.assertEqual(self.store.upsert("feed.xml", [_item("a", "2026-01-01"), _item("b", "2026-01-02")]), 2)
+        self.assertEqual(self.store.upsert("feed.xml", [_item("b", "2026-01-02"), _item("c", "2026-01-03")]), 1)
+        self.assertEqual(self.store.upsert("other.xml", [_item("a", "2026-01-01")]), 1)
+
+        latest = self.store.latest("feed.xml", 10)
+
+        self.assertEqual([item.title for item in latest], ["C", "B", "A"])
+        self.assertEqual(latest[0].published.isoformat(), "2026-01-03T00:00:00+00:00")
+        self.assertEqual(self.store.count("other.xml"), 1)
+
+    def test_upsert_does_not_erase_known_fields(self):
+        self.store.upsert("feed.xml", [_item("a", "2026-01-01", description="Body", author="Alice")])
+        self.store.upsert("feed.xml", [_item("a")])
+
+        (item,) = self.store.latest("feed.xml", 10)
+
+        self.assertEqual((item.description, item.author), ("Body", "Alice"))
+        self.assertIsNotNone(item.published)
+
+    def test_items_without_link_are_keyed_on_guid(self):
+        note = Item(title="Note", link="", guid="tag:example.com,2026:note", published="2026-01-01")
+        self.assertEqual(self.store.upsert("feed.xml", [note, Item(title="Empty", link="")]), 1)
+        self.assertEqual(self.store.upsert("feed.xml", [note]), 0)
+
+        (item,) = self.store.latest("feed.xml", 10)
+
+        self.assertEqual((item.guid, item.link), ("tag:example.com,2026:note", ""))
+
+    def test_undated_items_follow_insertion_order_then_first_seen(self):
+        self.store.upsert("feed.xml", [_item("old-1"), _item("old-2")], now=1000)
+        self.store.upsert("feed.xml", [_item("new"), _item("old-1")], now=2000)
+
+        self.assertEqual([item.title for item in self.store.latest("feed.xml", 10)], ["NEW", "OLD-2", "OLD-1"])
+
+    def test_prune_applies_keep_and_age_limits(self):
+        day = 86400
+        self.store.upsert("feed.xml", [_item("a"), _item("b")], now=0)
+        self.store.upsert("feed.xml", [_item("c"), _item("d"), _item("e")], now=10 * day)
+
+        self.assertEqual(self.store.prune("feed.xml", max_age_days=5, now=10 * day), 2)
+        self.assertEqual(self.store.prune("feed.xml", keep=2), 1)
+        self.assertEqual([item.title for item in self.store.latest("feed.xml", 10)], ["E", "D"])
+
+    def test_add_with_history_materialises_latest_items_newest_first(self):
+        self.store.upsert("feed.xml", [_item("a", "2026-01-01"), _item("b", "2026-01-02")])
+        generator = RSSGenerator(title="T", link="https://example.com", description="D")
+
+        count = add_with_history(
+            generator,
+            [_item("c", "2026-01-03")],
+            store=self.store,
+            feed="feed.xml",
+            history={"max_items": 2},
+        )
+        output_path = Path(self.temp_dir.name) / "feed.xml"
+        generator.generate(str(output_path))
+
+        titles = [element.findtext("title") for element in ET.parse(output_path).getroot().iter("item")]
+        self.assertEqual(count, 2)
+        self.assertEqual(titles, ["C", "B"])
+
+    def test_add_with_history_without_config_passes_items_through(self):
+        generator = RSSGenerator(title="T", link="https://example.com", description="D")
+
+        count = add_with_history(generator, [_item("a")], store=self.store, feed="feed.xml", history=None)
+
+        self.assertEqual(count, 1)
+        self.assertEqual(self.store.count("feed.xml"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 import tempfile
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
+from src.concurrency import cancelled
 from src.jobs.base import JobResult
 from src.jobs.runner import JobRunner
 
@@ -38,6 +40,61 @@ class JobRunnerTests(unittest.TestCase):
         self.assertEqual(results, {})
         create_job.assert_not_called()
 
+    @patch("src.jobs.runner.create_job")
+    def test_run_jobs_opens_item_store_only_when_history_is_configured(self, create_job):
+        contexts = []
+        fake_job = MagicMock()
+        fake_job.name = "demo"
+        fake_job.run.side_effect = lambda context: contexts.append(context) or JobResult(name="demo", success=True)
+        create_job.return_value = fake_job
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = JobRunner(f"{temp_dir}/feeds", state_dir=f"{temp_dir}/state")
+            runner.run_jobs([{"type": "demo"}])
+            runner.run_jobs([{"type": "demo", "history": {"max_items": 10}}])
+            store_exists = (runner.state_dir / "items.sqlite3").exists()
+
+        self.assertIsNone(contexts[0].item_store)
+        self.assertIsNotNone(contexts[1].item_store)
+        self.assertTrue(store_exists)
+
+    @patch("src.jobs.runner.ItemStore")
+    @patch("src.jobs.runner.create_job")
+    def test_item_store_is_closed_when_a_run_is_interrupted(self, create_job, store_cls):
+        fake_job = MagicMock()
+        fake_job.name = "demo"
+        fake_job.run.side_effect = KeyboardInterrupt
+        create_job.return_value = fake_job
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = JobRunner(f"{temp_dir}/feeds", state_dir=f"{temp_dir}/state")
+            with self.assertRaises(KeyboardInterrupt):
+                runner.run_jobs([{"type": "demo", "history": {"max_items": 10}}])
+
+        store_cls.return_value.close.assert_called_once()
+
+    @patch("src.jobs.runner.create_job")
+    def test_each_job_gets_its_own_deadline(self, create_job):
+        observed = []
+
+        def run(context):
+            time.sleep(0.02)
+            observed.append((context.deadline is not None, context.cancelled, cancelled()))
+            return JobResult(name="demo", success=True)
+
+        fake_job = MagicMock()
+        fake_job.name = "demo"
+        fake_job.run.side_effect = run
+        create_job.return_value = fake_job
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = JobRunner(temp_dir, job_deadline=60)
+            runner.run_jobs([{"type": "demo", "deadline": 0.01}, {"type": "demo"}])
+            JobRunner(temp_dir).run_jobs([{"type": "demo"}])
+
+        self.assertEqual(observed, [(True, True, True), (True, False, False), (False, False, False)])
+        self.assertFalse(cancelled())
+
 
 if __name__ == "__main__":
     unittest.main()
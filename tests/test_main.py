@@ -1,10 +1,20 @@
+import os
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
 import main as app_main
+from src.runtime import ConfigWatcher
+from src.scheduler import JobPlan, Scheduler
 
 
 class MainTests(unittest.TestCase):
+    def setUp(self):
+        # run_once 会在 feeds 目录写入压缩副本，测试中统一替换掉。
+        self.precompress_feeds = patch("main.precompress_feeds").start()
+        self.addCleanup(patch.stopall)
+
     @patch("main.generate_site_index")
     @patch("main.JobRunner")
     def test_run_once_returns_false_when_any_job_fails(self, runner_cls, generate_site_index):
@@ -33,6 +43,17 @@ class MainTests(unittest.TestCase):
         self.assertTrue(ok)
         generate_site_index.assert_called_once()
 
+    @patch("main.generate_site_index")
+    @patch("main.JobRunner")
+    def test_run_once_precompresses_feeds_unless_disabled(self, runner_cls, _):
+        runner_cls.return_value.run_jobs.return_value = {"job_a": True}
+        jobs = [{"type": "selector_scrape", "name": "job_a"}]
+
+        app_main.run_once({"jobs": jobs, "precompress": {"min_size": 0}}, "feeds")
+        app_main.run_once({"jobs": jobs, "precompress": False}, "feeds")
+
+        self.precompress_feeds.assert_called_once_with("feeds", min_size=0)
+
     @patch("main.generate_site_index", side_effect=RuntimeError("boom"))
     @patch("main.JobRunner")
     def test_run_once_ignores_homepage_generation_failures(self, runner_cls, _):
@@ -40,6 +61,22 @@ class MainTests(unittest.TestCase):
         ok = app_main.run_once({"jobs": [{"type": "selector_scrape", "name": "job_a"}]}, "feeds")
         self.assertTrue(ok)
 
+    @patch("main.open_work_queue")
+    @patch("main.JobRunner")
+    def test_worker_writes_run_report_after_each_job(self, runner_cls, _):
+        runner_cls.return_value.run_jobs.return_value = {"job_a": True}
+
+        def run(worker, drain):
+            worker.run_job({"type": "selector_scrape", "name": "job_a"})
+
+        with tempfile.TemporaryDirectory() as temp_dir, patch("main.Worker.run", autospec=True, side_effect=run):
+            code = app_main.run_worker({}, "feeds", temp_dir, drain=True)
+            report_path = Path(temp_dir) / "run-report.json"
+            self.assertTrue(report_path.exists())
+
+        self.assertEqual(code, 0)
+        self.assertIn("report", runner_cls.return_value.run_jobs.call_args.kwargs)
+
     @patch("main.load_config", return_value={"jobs": [{"type": "selector_scrape", "name": "job_a"}]})
     @patch("main.run_once", return_value=False)
     def test_main_returns_1_when_run_once_failed(self, _, __):
@@ -51,5 +88,48 @@ class MainTests(unittest.TestCase):
         self.assertEqual(code, 2)
 
 
+class ConfigReloadTests(unittest.TestCase):
+    def test_config_changes_are_applied_and_broken_files_ignored(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "config.yaml"
+            path.write_text("jobs:\n  - {type: a, name: A}\n", encoding="utf-8")
+            watcher = ConfigWatcher(path, app_main.load_config)
+            scheduler = Scheduler([JobPlan("A", {"type": "a", "name": "A"})], run_job=lambda config: None)
+            scheduler.start(now=0)
+            current = {"config": {}}
+
+            def write(text, mtime):
+                path.write_text(text, encoding="utf-8")
+                os.utime(path, ns=(mtime, mtime))
+
+            app_main._reload_plans(scheduler, watcher, current)
+            self.assertEqual(current, {"config": {}})
+
+            write("jobs:\n  - {type: a, name: A}\n  - {type: b, name: B}\n", 10**18)
+            app_main._reload_plans(scheduler, watcher, current)
+            self.assertEqual([job["name"] for job in current["config"]["jobs"]], ["A", "B"])
+
+            write("jobs: [\n", 2 * 10**18)
+            app_main._reload_plans(scheduler, watcher, current)
+            self.assertEqual(len(current["config"]["jobs"]), 2)
+            self.assertEqual(sorted(plan.name for plan in scheduler.pop_due(float("inf"))), ["A", "B"])
+
+    def test_reload_warns_about_settings_that_need_a_restart(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "config.yaml"
+            path.write_text("jobs: []\n", encoding="utf-8")
+            watcher = ConfigWatcher(path, app_main.load_config)
+            path.write_text("update: {max_workers: 4, job_deadline: 60}\njobs: []\n", encoding="utf-8")
+            os.utime(path, ns=(10**18, 10**18))
+            scheduler = Scheduler([], run_job=lambda config: None)
+            current = {"config": {"update": {"max_workers": 4, "job_deadline": 30}, "jobs": []}}
+
+            with self.assertLogs(level="WARNING") as logs:
+                app_main._reload_plans(scheduler, watcher, current)
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("update.job_deadline", logs.output[0])
+
+
 if __name__ == "__main__":
     unittest.main()
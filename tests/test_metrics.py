@@ -0,0 +1,100 @@
+import tempfile
+import unittest
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+from src import metrics
+from src.http_client import CountingRetry, create_retry_session
+from src.item import Item
+from src.rss_generator import RSSGenerator
+from src.run_report import JobStats, job_stats_scope
+
+
+def _send(_adapter, request, **kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"x" * 10
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class RegistryTests(unittest.TestCase):
+    def test_render_uses_prometheus_text_format(self):
+        registry = metrics.Registry()
+        runs = registry.register(metrics.Counter("demo_runs_total", "Runs.", ("job",)))
+        duration = registry.register(metrics.Histogram("demo_seconds", "Duration.", buckets=(1, 5)))
+        runs.inc(job='a "quoted" job')
+        duration.observe(0.5)
+        duration.observe(3)
+
+        text = registry.render()
+
+        self.assertIn("# TYPE demo_runs_total counter\n", text)
+        self.assertIn('demo_runs_total{job="a \\"quoted\\" job"} 1\n', text)
+        self.assertIn('demo_seconds_bucket{le="1"} 1\n', text)
+        self.assertIn('demo_seconds_bucket{le="+Inf"} 2\n', text)
+        self.assertIn("demo_seconds_sum 3.5\n", text)
+        with self.assertRaises(ValueError):
+            runs.inc()
+
+    def test_options_and_textfile(self):
+        self.assertIsNone(metrics.metrics_options({}))
+        self.assertEqual(metrics.metrics_options({"metrics": {"port": "9108"}})["port"], 9108)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = metrics.REGISTRY.write_textfile(Path(temp_dir) / "rss.prom")
+            self.assertIn("# TYPE rss_job_runs_total counter", path.read_text(encoding="utf-8"))
+
+    def test_server_exposes_registry(self):
+        registry = metrics.Registry()
+        registry.register(metrics.Gauge("demo_value", "Value.")).set(2)
+        server = metrics.start_metrics_server(0, registry=registry)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            self.assertIn("demo_value 2", response.read().decode("utf-8"))
+
+
+class InstrumentationTests(unittest.TestCase):
+    def setUp(self):
+        metrics.REGISTRY.clear()
+        self.addCleanup(metrics.REGISTRY.clear)
+
+    def test_requests_and_retries_are_counted_per_host(self):
+        with patch.object(HTTPAdapter, "send", _send):
+            create_retry_session().get("https://example.com/feed")
+
+        stats = JobStats(name="demo")
+        with job_stats_scope(stats):
+            CountingRetry(total=2).increment("GET", "/", error=ConnectTimeoutError(), _pool=SimpleNamespace(host="example.com"))
+
+        text = metrics.REGISTRY.render()
+        self.assertIn('rss_http_requests_total{host="example.com",code="200"} 1\n', text)
+        self.assertIn('rss_http_response_bytes_total{host="example.com"} 10\n', text)
+        self.assertIn('rss_http_retries_total{host="example.com"} 1\n', text)
+        self.assertIn("rss_fetch_cache_hit_ratio 0\n", text)
+        self.assertEqual(stats.retries, 1)
+
+    def test_generator_records_feed_freshness(self):
+        published = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        generator = RSSGenerator("Demo", "https://example.com", "demo")
+        generator.add_items([Item(title="A", link="https://example.com/a", published=published)])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generator.generate(str(Path(temp_dir) / "demo.xml"))
+
+        text = metrics.REGISTRY.render()
+        self.assertIn(f'rss_feed_newest_item_timestamp_seconds{{feed="demo.xml"}} {int(published.timestamp())}\n', text)
+        self.assertIn('rss_feed_items{feed="demo.xml"} 1\n', text)
+        self.assertIn('rss_feed_last_build_timestamp_seconds{feed="demo.xml"}', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 
 from src.jobs.minimax_news import (
     extract_article_item_from_html,
@@ -66,6 +67,40 @@ class MiniMaxFeedJobTests(unittest.TestCase):
         self.assertEqual(item["link"], "https://www.minimax.io/news/minimax-m25")
         self.assertTrue(item["pubDate"].startswith("2026-02-12T09:30:00"))
 
+    def test_extract_article_item_skips_body_when_head_is_sufficient(self):
+        html = """
+        <html>
+          <head>
+            <meta property="og:title" content="MiniMax M2.5" />
+            <meta property="og:description" content="MiniMax latest model update" />
+            <meta property="article:published_time" content="2026-02-12T09:30:00Z" />
+          </head>
+          <body><p>2020-01-01</p></body>
+        </html>
+        """
+        with patch("src.jobs.minimax_news.BeautifulSoup") as soup_cls:
+            item = extract_article_item_from_html("https://www.minimax.io/news/minimax-m25", html)
+
+        soup_cls.assert_not_called()
+        self.assertEqual(item["title"], "MiniMax M2.5")
+
+    def test_extract_article_item_falls_back_to_body_for_missing_fields(self):
+        html = """
+        <html>
+          <head><title>Page title</title></head>
+          <body>
+            <h1>MiniMax Agent</h1>
+            <main><p>Agent launch notes.</p></main>
+            <time datetime="2026-01-20T08:00:00Z">Jan 20</time>
+          </body>
+        </html>
+        """
+        item = extract_article_item_from_html("https://www.minimax.io/news/minimax-agent", html)
+
+        self.assertEqual(item["title"], "MiniMax Agent")
+        self.assertEqual(item["description"], "Agent launch notes.")
+        self.assertTrue(item["pubDate"].startswith("2026-01-20T08:00:00"))
+
     def test_extract_article_item_rejects_redirected_non_news_page(self):
         html = """
         <html>
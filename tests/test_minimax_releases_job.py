@@ -0,0 +1,96 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.jobs.base import JobContext
+from src.jobs.minimax_releases import MiniMaxReleasesJob
+
+HF_MODELS = [
+    {"id": "MiniMaxAI/MiniMax-M2", "createdAt": "2026-02-01T00:00:00Z", "pipeline_tag": "text-generation"},
+]
+GITHUB_REPOS = [
+    {"name": "MiniMax-MCP", "html_url": "https://github.com/MiniMax-AI/MiniMax-MCP", "created_at": "2026-01-15T00:00:00Z"},
+]
+
+
+def _response(status_code, payload=None, etag=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = json.dumps(payload) if payload is not None else ""
+    response.headers = {"ETag": etag} if etag else {}
+    response.raise_for_status.return_value = None
+    return response
+
+
+def _session(*responses):
+    session = MagicMock()
+    session.get.side_effect = list(responses)
+    return session
+
+
+class MiniMaxReleasesJobTests(unittest.TestCase):
+    config = {
+        "type": "minimax_releases",
+        "name": "MiniMax Releases",
+        "output": "minimax_releases.xml",
+        "options": {"max_items": 10, "resource_types": ["models"]},
+    }
+
+    def _run(self, temp_dir, hf_session, gh_session):
+        context = JobContext(feeds_dir=Path(temp_dir) / "feeds", state_dir=Path(temp_dir) / "state")
+        context.feeds_dir.mkdir(exist_ok=True)
+        with patch("src.jobs.minimax_releases._hf_session", return_value=hf_session), patch(
+            "src.jobs.minimax_releases._github_session", return_value=gh_session
+        ):
+            return MiniMaxReleasesJob(self.config).run(context)
+
+    def test_second_run_sends_etag_and_skips_generation_when_all_sources_unchanged(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = self._run(
+                temp_dir,
+                _session(_response(200, HF_MODELS, etag='"hf-1"')),
+                _session(_response(200, GITHUB_REPOS, etag='"gh-1"')),
+            )
+            self.assertTrue(first.success)
+            output_path = Path(temp_dir) / "feeds" / "minimax_releases.xml"
+            first_xml = output_path.read_text(encoding="utf-8")
+            self.assertIn("MiniMax-M2", first_xml)
+            self.assertIn("MiniMax-MCP", first_xml)
+
+            hf_session = _session(_response(304))
+            gh_session = _session(_response(304))
+            with patch("src.jobs.minimax_releases.record_published_feed") as record_published_feed:
+                second = self._run(temp_dir, hf_session, gh_session)
+
+            self.assertTrue(second.success)
+            self.assertIn("未变化", second.details)
+            self.assertEqual(hf_session.get.call_args.kwargs["headers"], {"If-None-Match": '"hf-1"'})
+            self.assertEqual(gh_session.get.call_args.kwargs["headers"], {"If-None-Match": '"gh-1"'})
+            self.assertEqual(output_path.read_text(encoding="utf-8"), first_xml)
+            record_published_feed.assert_called_once_with(output_path)
+
+    def test_partial_not_modified_reuses_cached_body(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._run(
+                temp_dir,
+                _session(_response(200, HF_MODELS, etag='"hf-1"')),
+                _session(_response(200, GITHUB_REPOS, etag='"gh-1"')),
+            )
+            new_repo = {"name": "MiniMax-Agent", "html_url": "https://github.com/MiniMax-AI/MiniMax-Agent"}
+            result = self._run(
+                temp_dir,
+                _session(_response(304)),
+                _session(_response(200, GITHUB_REPOS + [new_repo], etag='"gh-2"')),
+            )
+
+            xml = (Path(temp_dir) / "feeds" / "minimax_releases.xml").read_text(encoding="utf-8")
+
+        self.assertTrue(result.success)
+        self.assertIn("MiniMax-M2", xml)
+        self.assertIn("MiniMax-Agent", xml)
+
+
+if __name__ == "__main__":
+    unittest.main()
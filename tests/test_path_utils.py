@@ -0,0 +1,31 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.path_utils import safe_filename, write_atomic
+
+
+class WriteAtomicTests(unittest.TestCase):
+    def test_replaces_file_without_leaving_temporary_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "feed.xml"
+            write_atomic(path, "old")
+            write_atomic(path, b"new")
+
+            self.assertEqual(path.read_text(encoding="utf-8"), "new")
+            self.assertEqual([entry.name for entry in Path(temp_dir).iterdir()], ["feed.xml"])
+
+
+class SafeFilenameTests(unittest.TestCase):
+    def test_distinct_names_get_distinct_stable_stems(self):
+        names = ["博客", "新闻", "A B", "a-b"]
+        stems = [safe_filename(name) for name in names]
+
+        self.assertEqual(len(set(stems)), len(names))
+        self.assertEqual(stems, [safe_filename(name) for name in names])
+        self.assertTrue(stems[0].startswith("job_"))
+        self.assertRegex(safe_filename("Waymo Blog"), r"^waymo_blog_[0-9a-f]{8}$")
+
+
+if __name__ == "__main__":
+    unittest.main()
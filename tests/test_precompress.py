@@ -0,0 +1,62 @@
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src import precompress
+from src.precompress import MANIFEST_NAME, precompress_feeds
+
+
+class PrecompressTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.feeds_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_writes_gzip_siblings_and_manifest(self):
+        body = "<rss>" + "<item>entry</item>" * 100 + "</rss>"
+        (self.feeds_dir / "feed.xml").write_text(body, encoding="utf-8")
+        (self.feeds_dir / "tiny.xml").write_text("<rss/>", encoding="utf-8")
+
+        manifest = precompress_feeds(self.feeds_dir)
+
+        self.assertEqual(gzip.decompress((self.feeds_dir / "feed.xml.gz").read_bytes()).decode(), body)
+        self.assertFalse((self.feeds_dir / "tiny.xml.gz").exists())
+        entry = manifest["files"]["feed.xml"]
+        self.assertEqual(entry["size"], len(body))
+        self.assertLess(entry["gzip"], entry["size"])
+        self.assertEqual(json.loads((self.feeds_dir / MANIFEST_NAME).read_text())["files"], manifest["files"])
+        self.assertNotIn(MANIFEST_NAME, manifest["files"])
+
+    def test_recompresses_only_changed_sources_and_cleans_removed_ones(self):
+        (self.feeds_dir / "a.xml").write_text("a" * 1000, encoding="utf-8")
+        (self.feeds_dir / "b.xml").write_text("b" * 1000, encoding="utf-8")
+        precompress_feeds(self.feeds_dir)
+
+        (self.feeds_dir / "a.xml").write_text("c" * 1000, encoding="utf-8")
+        (self.feeds_dir / "b.xml").unlink()
+        with patch.object(precompress, "write_atomic", wraps=precompress.write_atomic) as write:
+            precompress_feeds(self.feeds_dir)
+
+        written = [call.args[0].name for call in write.call_args_list]
+        self.assertEqual(written, ["a.xml.gz", MANIFEST_NAME])
+        self.assertEqual(gzip.decompress((self.feeds_dir / "a.xml.gz").read_bytes()), b"c" * 1000)
+        self.assertFalse((self.feeds_dir / "b.xml.gz").exists())
+
+    def test_gzip_output_is_deterministic(self):
+        (self.feeds_dir / "a.xml").write_text("a" * 1000, encoding="utf-8")
+        precompress_feeds(self.feeds_dir)
+        first = (self.feeds_dir / "a.xml.gz").read_bytes()
+
+        (self.feeds_dir / MANIFEST_NAME).unlink()
+        precompress_feeds(self.feeds_dir)
+
+        self.assertEqual((self.feeds_dir / "a.xml.gz").read_bytes(), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
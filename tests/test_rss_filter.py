@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from unittest.mock import patch
+
+from src.rss_filter import RSSFilter
+
+SOURCE = """<?xml version="1.0"?>
+<rss version="2.0"><channel>
+  <title>Source</title><link>https://example.com</link><description>D</description>
+  <item><title>No link</title><category>AI</category></item>
+  <item><title>Tag guid</title><link>https://example.com/b</link><guid>tag:example.com,2026:b</guid><category>ai</category></item>
+  <item><title>Other URL guid</title><link>https://example.com/c</link><guid>https://example.com/?p=3</guid><category>AI</category></item>
+  <item><title>Skipped</title><link>https://example.com/d</link><category>Other</category></item>
+</channel></rss>"""
+
+
+class RSSFilterTests(unittest.TestCase):
+    def test_keeps_source_guid_and_permalink_rules(self):
+        with tempfile.TemporaryDirectory() as temp_dir, patch.object(RSSFilter, "fetch_rss", return_value=SOURCE):
+            output_path = Path(temp_dir) / "filtered.xml"
+            self.assertTrue(RSSFilter("https://example.com/feed").filter_by_category(["AI"], str(output_path)))
+            items = {item.findtext("title"): item for item in ET.parse(output_path).getroot().iter("item")}
+
+        self.assertEqual(set(items), {"No link", "Tag guid", "Other URL guid"})
+        self.assertIsNone(items["No link"].find("link"))
+        self.assertEqual(items["No link"].findtext("guid"), "No link")
+        self.assertEqual(items["No link"].find("guid").get("isPermaLink"), "false")
+        self.assertEqual(items["Tag guid"].find("guid").get("isPermaLink"), "false")
+        self.assertEqual(items["Other URL guid"].find("guid").get("isPermaLink"), "true")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
+import json
 import tempfile
 import unittest
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
-from src.rss_generator import RSSGenerator
+from src.item import Item
+from src.rss_generator import RSSGenerator, read_feed_items
 
 
 class RSSGeneratorTests(unittest.TestCase):
@@ -39,6 +41,191 @@ class RSSGeneratorTests(unittest.TestCase):
             self.assertEqual(channel_items[0].findtext("guid"), "https://example.com/a")
             self.assertIsNone(channel_items[0].find("pubDate"))
 
+    def test_add_items_deduplicates_on_guid_not_link(self):
+        generator = RSSGenerator(title="T", link="https://example.com", description="D")
+        generator.add_items(
+            [
+                Item(title="v1", link="https://example.com/release", guid="release-1"),
+                Item(title="v2", link="https://example.com/release", guid="release-2"),
+                Item(title="v2 mirror", link="https://mirror.example.com/release", guid="release-2"),
+                Item(title="no link", link=""),
+            ]
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "feed.xml"
+            self.assertTrue(generator.generate(str(output_path)))
+            titles = [item.findtext("title") for item in ET.parse(output_path).getroot().iter("item")]
+
+        self.assertEqual(titles, ["v2", "v1"])
+
+    def test_add_items_accepts_item_objects(self):
+        generator = RSSGenerator(
+            title="Test Feed",
+            link="https://example.com",
+            description="Test Description",
+        )
+        generator.add_items(
+            [
+                Item(title="Item A", link="https://example.com/a", guid="a-1", published="2026-02-01"),
+                {"title": "Item A again", "link": "https://example.com/a2", "guid": "a-1"},
+                Item(title="Item B", link="https://example.com/b", categories=("News",)),
+            ]
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "feed.xml"
+            self.assertTrue(generator.generate(str(output_path)))
+
+            channel_items = ET.parse(output_path).getroot().findall("./channel/item")
+
+        self.assertEqual([item.findtext("guid") for item in channel_items], ["https://example.com/b", "a-1"])
+        self.assertEqual(channel_items[0].findtext("category"), "News")
+        self.assertEqual(channel_items[1].findtext("pubDate"), "Sun, 01 Feb 2026 00:00:00 +0000")
+
+    def test_generate_writes_every_configured_format_from_one_item_list(self):
+        generator = RSSGenerator(
+            title="Test Feed",
+            link="https://example.com",
+            description="Test Description",
+            formats=["atom", "json"],
+        )
+        generator.add_items(
+            [
+                Item(title="Older", link="https://example.com/a", published="2026-01-01", author="Alice"),
+                Item(title="Newer", link="https://example.com/b", published="2026-01-02", description="Body"),
+            ]
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "feed.xml"
+            self.assertTrue(generator.generate(str(output_path)))
+
+            rss_titles = [item.findtext("title") for item in ET.parse(output_path).getroot().iter("item")]
+            atom = ET.parse(Path(temp_dir) / "feed.atom").getroot()
+            json_feed = json.loads((Path(temp_dir) / "feed.json").read_text(encoding="utf-8"))
+
+        ns = {"atom": "http://www.w3.org/2005/Atom"}
+        self.assertEqual(rss_titles, ["Newer", "Older"])
+        self.assertEqual([entry.findtext("atom:title", namespaces=ns) for entry in atom.findall("atom:entry", ns)], ["Newer", "Older"])
+        self.assertEqual(atom.findtext("atom:updated", namespaces=ns), "2026-01-02T00:00:00+00:00")
+        self.assertEqual(json_feed["version"], "https://jsonfeed.org/version/1.1")
+        self.assertEqual([item["id"] for item in json_feed["items"]], ["https://example.com/b", "https://example.com/a"])
+        self.assertEqual(json_feed["items"][1]["authors"], [{"name": "Alice"}])
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            RSSGenerator(title="T", link="https://example.com", description="D", formats=["rdf"])
+
+    def test_archive_keeps_current_page_small_and_appends_older_items_to_archives(self):
+        def run(output_path, start, stop):
+            generator = RSSGenerator(
+                title="Test Feed",
+                link="https://example.com",
+                description="Test Description",
+                archive={"page_size": 3, "archive_size": 4, "base_url": "https://feeds.example.com"},
+            )
+            generator.add_items(
+                Item(title=f"i{index}", link=f"https://example.com/{index}", published=f"2026-01-{index + 1:02d}")
+                for index in range(start, stop)
+            )
+            self.assertTrue(generator.generate(str(output_path)))
+
+        def titles(path):
+            return [item["title"] for item in read_feed_items(path)]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "feed.xml"
+            run(output_path, 0, 5)
+            first_archive = (Path(temp_dir) / "feed-archive-1.xml").read_bytes()
+            # 上游只剩 4..11：上一轮当前页中滚动掉的 2、3 也要进入归档。
+            run(output_path, 4, 12)
+
+            current = ET.parse(output_path).getroot()
+            archive_1 = ET.parse(Path(temp_dir) / "feed-archive-1.xml").getroot()
+            self.assertEqual(titles(output_path), ["i11", "i10", "i9"])
+            self.assertEqual(titles(Path(temp_dir) / "feed-archive-1.xml"), ["i3", "i2", "i1", "i0"])
+            self.assertEqual(titles(Path(temp_dir) / "feed-archive-2.xml"), ["i7", "i6", "i5", "i4"])
+            self.assertEqual(titles(Path(temp_dir) / "feed-archive-3.xml"), ["i8"])
+            self.assertFalse((Path(temp_dir) / "feed-archive-4.xml").exists())
+            self.assertNotEqual(first_archive, (Path(temp_dir) / "feed-archive-1.xml").read_bytes())
+
+        ns = {"atom": "http://www.w3.org/2005/Atom", "fh": "http://purl.org/syndication/history/1.0"}
+
+        def links(root):
+            return {link.get("rel"): link.get("href") for link in root.findall("./channel/atom:link", ns)}
+
+        self.assertEqual(
+            links(current),
+            {"current": "https://feeds.example.com/feed.xml", "prev-archive": "https://feeds.example.com/feed-archive-3.xml"},
+        )
+        self.assertIsNone(current.find("./channel/fh:archive", ns))
+        self.assertEqual(links(archive_1)["next-archive"], "https://feeds.example.com/feed-archive-2.xml")
+        self.assertNotIn("prev-archive", links(archive_1))
+        self.assertIsNotNone(archive_1.find("./channel/fh:archive", ns))
+
+    def test_archive_pages_by_date_when_items_are_added_newest_first(self):
+        generator = RSSGenerator(
+            title="T", link="https://example.com", description="D", formats=["atom"], archive={"page_size": 3, "archive_size": 10}
+        )
+        generator.add_items(
+            Item(title=f"i{index}", link=f"https://example.com/{index}", published=f"2026-01-{index:02d}")
+            for index in range(10, 0, -1)
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "feed.xml"
+            self.assertTrue(generator.generate(str(output_path)))
+
+            titles = [item["title"] for item in read_feed_items(output_path)]
+            archived = [item["title"] for item in read_feed_items(Path(temp_dir) / "feed-archive-1.xml")]
+            archive = ET.parse(Path(temp_dir) / "feed-archive-1.xml").getroot()
+            atom = ET.parse(output_path.with_suffix(".atom")).getroot()
+
+        self.assertEqual(titles, ["i10", "i9", "i8"])
+        self.assertEqual(archived, ["i7", "i6", "i5", "i4", "i3", "i2", "i1"])
+        self.assertEqual(archive.findtext("./channel/lastBuildDate"), "Wed, 07 Jan 2026 00:00:00 +0000")
+        ns = {"atom": "http://www.w3.org/2005/Atom"}
+        self.assertEqual(atom.findtext("atom:updated", namespaces=ns), "2026-01-10T00:00:00+00:00")
+
+    def test_items_without_link_rotate_into_archive_pages(self):
+        note = Item(title="note", link="", guid="tag:example.com,2026:note", published="2026-01-01", permalink=False)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "feed.xml"
+            for items in (
+                [note, Item(title="i2", link="https://example.com/2", published="2026-01-02")],
+                [Item(title=f"i{index}", link=f"https://example.com/{index}", published=f"2026-01-{index:02d}") for index in (3, 4)],
+            ):
+                generator = RSSGenerator(
+                    title="T", link="https://example.com", description="D",
+                    require_link=False, archive={"page_size": 2, "archive_size": 10},
+                )
+                generator.add_items(items)
+                self.assertTrue(generator.generate(str(output_path)))
+
+            current = [item["title"] for item in read_feed_items(output_path)]
+            archived = read_feed_items(Path(temp_dir) / "feed-archive-1.xml")
+
+        self.assertEqual(current, ["i4", "i3"])
+        self.assertEqual([item["title"] for item in archived], ["i2", "note"])
+        self.assertNotIn("link", archived[1])
+        self.assertEqual((archived[1]["guid"], archived[1]["permalink"]), ("tag:example.com,2026:note", False))
+
+    def test_full_archive_pages_are_not_rewritten(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "feed.xml"
+            for stop in (6, 7, 9):
+                generator = RSSGenerator(title="T", link="https://example.com", description="D", archive={"page_size": 2, "archive_size": 2})
+                generator.add_items(
+                    Item(title=f"i{index}", link=f"https://example.com/{index}", published=f"2026-01-{index + 1:02d}")
+                    for index in range(stop)
+                )
+                generator.generate(str(output_path))
+                if stop == 7:
+                    mtime = (Path(temp_dir) / "feed-archive-1.xml").stat().st_mtime_ns
+
+            self.assertEqual((Path(temp_dir) / "feed-archive-1.xml").stat().st_mtime_ns, mtime)
+            self.assertEqual([item["title"] for item in read_feed_items(Path(temp_dir) / "feed-archive-4.xml")], ["i6"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,113 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.http_client import coalesce_fetches, create_retry_session
+from src.item import Item
+from src.jobs.base import JobResult
+from src.jobs.runner import JobRunner
+from src.rss_generator import RSSGenerator
+from src.run_report import JobStats, RunReport, job_stats_scope, measure
+
+
+def _send(_adapter, request, **kwargs):
+    response = requests.Response()
+    response.status_code = 304 if "cached" in request.url else 200
+    response._content = b"" if response.status_code == 304 else b"x" * 100
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class JobStatsTests(unittest.TestCase):
+    def test_requests_cache_hits_and_not_modified_are_counted(self):
+        stats = JobStats(name="demo")
+        with patch.object(HTTPAdapter, "send", _send), job_stats_scope(stats), coalesce_fetches():
+            session = create_retry_session()
+            session.get("https://example.com/page")
+            session.get("https://example.com/page")
+            session.get("https://example.com/cached")
+
+        self.assertEqual((stats.requests, stats.bytes_downloaded), (2, 100))
+        self.assertEqual((stats.cache_hits, stats.not_modified, stats.errors), (1, 1, 0))
+
+    def test_nested_phases_count_once_and_need_a_current_job(self):
+        with measure("parse"):
+            pass
+
+        stats = JobStats(name="demo")
+        with job_stats_scope(stats):
+            with patch("src.run_report.time.perf_counter", side_effect=[0.0, 1.0, 2.0, 5.0]):
+                with measure("parse"):
+                    with measure("parse"):
+                        pass
+                    with measure("generate"):
+                        pass
+
+        self.assertEqual((stats.parse_time, stats.generate_time), (5.0, 1.0))
+
+    def test_generator_records_items_and_generate_time(self):
+        stats = JobStats(name="demo")
+        generator = RSSGenerator("Demo", "https://example.com", "demo")
+        generator.add_items([Item(title="A", link="https://example.com/a")])
+        with tempfile.TemporaryDirectory() as temp_dir, job_stats_scope(stats):
+            self.assertTrue(generator.generate(str(Path(temp_dir) / "demo.xml")))
+
+        self.assertEqual(stats.items, 1)
+        self.assertGreater(stats.generate_time, 0)
+
+
+class RunReportTests(unittest.TestCase):
+    def test_report_sorts_slowest_jobs_and_writes_json(self):
+        report = RunReport(started_at=0.0, finished_at=10.0)
+        report.jobs = [JobStats(name="fast", wall_time=1.0, requests=1), JobStats(name="slow", wall_time=5.0, requests=3)]
+
+        self.assertEqual([stats.name for stats in report.slowest(1)], ["slow"])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            payload = json.loads(report.write(Path(temp_dir) / "run-report.json").read_text(encoding="utf-8"))
+
+        self.assertEqual(payload["totals"]["requests"], 4)
+        self.assertEqual([job["name"] for job in payload["jobs"]], ["fast", "slow"])
+        self.assertNotIn("_lock", payload["jobs"][0])
+
+    @patch("src.jobs.runner.create_job")
+    def test_runner_keeps_report_of_last_run(self, create_job):
+        fake_job = MagicMock()
+        fake_job.name = "demo"
+        fake_job.run.return_value = JobResult(name="demo", success=True)
+        create_job.return_value = fake_job
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = JobRunner(temp_dir)
+            runner.run_jobs([{"type": "demo"}])
+
+        self.assertEqual([(stats.name, stats.success) for stats in runner.last_report.jobs], [("demo", True)])
+        self.assertGreaterEqual(runner.last_report.finished_at, runner.last_report.started_at)
+
+    @patch("src.jobs.runner.create_job")
+    def test_shared_report_keeps_latest_run_of_each_job(self, create_job):
+        def make_job(config):
+            job = MagicMock()
+            job.name = config["name"]
+            job.run.return_value = JobResult(name=config["name"], success=config["ok"])
+            return job
+
+        create_job.side_effect = make_job
+        report = RunReport(started_at=0.0)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = JobRunner(temp_dir)
+            runner.run_jobs([{"name": "a", "ok": False}], report=report)
+            runner.run_jobs([{"name": "b", "ok": True}], report=report)
+            runner.run_jobs([{"name": "a", "ok": True}], report=report)
+
+        self.assertIs(runner.last_report, report)
+        self.assertEqual([(stats.name, stats.success) for stats in report.jobs], [("b", True), ("a", True)])
+
+
+if __name__ == "__main__":
+    unittest.main()
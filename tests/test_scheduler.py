@@ -0,0 +1,338 @@
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.jobs.base import JobResult
+from src.jobs.runner import JobRunner
+from src.rss_generator import RSSGenerator
+from src.scheduler import (
+    AdaptiveIntervals,
+    AdaptivePolicy,
+    CronExpression,
+    JobPlan,
+    Scheduler,
+    build_plans,
+    item_fingerprint,
+    start_offset,
+)
+
+
+def _ts(text: str) -> float:
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp()
+
+
+class CronExpressionTests(unittest.TestCase):
+    def test_next_after_handles_steps_ranges_and_weekdays(self):
+        self.assertEqual(CronExpression("15 */6 * * *").next_after(_ts("2026-10-19T10:24:00")), _ts("2026-10-19T12:15:00"))
+        self.assertEqual(CronExpression("0 9 * * 1-5").next_after(_ts("2026-10-23T09:00:00")), _ts("2026-10-26T09:00:00"))
+        self.assertEqual(CronExpression("30 2 * * 7").next_after(_ts("2026-10-19T00:00:00")), _ts("2026-10-25T02:30:00"))
+        self.assertEqual(CronExpression("0 0 29 2 *").next_after(_ts("2026-03-01T00:00:00")), _ts("2028-02-29T00:00:00"))
+
+    def test_day_and_weekday_match_either_when_both_restricted(self):
+        # 10 月 20 日为周二；1 号或周一均可。
+        self.assertEqual(CronExpression("0 0 1 * 1").next_after(_ts("2026-10-20T00:00:00")), _ts("2026-10-26T00:00:00"))
+
+    def test_invalid_expressions_are_rejected(self):
+        for text in ("* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *"):
+            with self.assertRaises(ValueError):
+                CronExpression(text)
+
+
+class BuildPlansTests(unittest.TestCase):
+    def test_per_job_schedule_overrides_global_interval(self):
+        plans = build_plans(
+            {
+                "update": {"interval": 600},
+                "jobs": [
+                    {"type": "codex_changelog", "name": "Codex"},
+                    {"type": "kimi_blog", "name": "Kimi", "schedule": {"cron": "0 */6 * * *", "jitter": 120}},
+                    {"type": "demo", "name": "Off", "enabled": False},
+                ],
+            }
+        )
+
+        self.assertEqual([(plan.name, plan.interval, plan.jitter) for plan in plans], [("Codex", 600, 0), ("Kimi", 600, 120)])
+        self.assertEqual(plans[1].cron.text, "0 */6 * * *")
+
+    def test_duplicate_names_are_rejected(self):
+        with self.assertRaises(ValueError):
+            build_plans({"jobs": [{"type": "a", "name": "x"}, {"type": "b", "name": "x"}]})
+
+    def test_adaptive_defaults_come_from_update_section(self):
+        plans = build_plans(
+            {
+                "update": {"interval": 600, "adaptive": {"max_interval": 7200}},
+                "jobs": [
+                    {"type": "a", "name": "A"},
+                    {"type": "b", "name": "B", "schedule": {"adaptive": {"min_interval": 300, "backoff": 1.5}}},
+                    {"type": "c", "name": "C", "schedule": {"adaptive": False}},
+                ],
+            }
+        )
+
+        self.assertEqual(plans[0].adaptive, AdaptivePolicy(600, 7200))
+        self.assertEqual(plans[1].adaptive, AdaptivePolicy(300, 86400, 1.5))
+        self.assertIsNone(plans[2].adaptive)
+        with self.assertRaises(ValueError):
+            build_plans({"jobs": [{"type": "a", "name": "x", "schedule": {"cron": "0 * * * *", "adaptive": True}}]})
+
+    def test_start_offsets_are_stable_and_bounded(self):
+        offsets = [start_offset(f"job-{index}", 300) for index in range(50)]
+
+        self.assertEqual(offsets, [start_offset(f"job-{index}", 300) for index in range(50)])
+        self.assertTrue(all(0 <= offset < 300 for offset in offsets))
+        self.assertGreater(len({int(offset // 60) for offset in offsets}), 3)
+
+        plans = build_plans(
+            {
+                "update": {"interval": 120, "stagger": 600},
+                "jobs": [
+                    {"type": "a", "name": "A"},
+                    {"type": "b", "name": "B", "schedule": {"cron": "0 * * * *"}},
+                    {"type": "c", "name": "C", "schedule": {"stagger": 0}},
+                ],
+            }
+        )
+        self.assertEqual(plans[0].offset, start_offset("A", 120))
+        self.assertEqual((plans[1].offset, plans[2].offset), (0, 0))
+
+
+class SchedulerTests(unittest.TestCase):
+    def _scheduler(self, *plans):
+        return Scheduler(list(plans), run_job=lambda config: True, rng=lambda: 0.5)
+
+    def test_jobs_are_dispatched_by_their_own_interval(self):
+        scheduler = self._scheduler(JobPlan("fast", {}, interval=10), JobPlan("slow", {}, interval=100))
+        scheduler.start(now=0)
+
+        self.assertEqual([plan.name for plan in scheduler.pop_due(0)], ["fast", "slow"])
+        scheduler.complete("fast", 1)
+        scheduler.complete("slow", 1)
+        self.assertEqual(scheduler.next_due(), 10)
+        self.assertEqual([plan.name for plan in scheduler.pop_due(10)], ["fast"])
+        self.assertEqual(scheduler.pop_due(50), [])
+        scheduler.complete("fast", 11)
+        self.assertEqual([plan.name for plan in scheduler.pop_due(100)], ["fast", "slow"])
+
+    def test_running_job_is_not_dispatched_again(self):
+        scheduler = self._scheduler(JobPlan("job", {}, interval=10))
+        scheduler.start(now=0)
+        scheduler.pop_due(0)
+
+        self.assertTrue(scheduler.is_running("job"))
+        self.assertEqual(scheduler.pop_due(35), [])
+        self.assertIsNone(scheduler.next_due())
+
+    def test_missed_slots_collapse_into_one_immediate_run(self):
+        scheduler = self._scheduler(JobPlan("job", {}, interval=10))
+        scheduler.start(now=0)
+        scheduler.pop_due(0)
+        scheduler.complete("job", 35)
+
+        self.assertEqual(scheduler.next_due(), 35)
+        scheduler.pop_due(35)
+        scheduler.complete("job", 36)
+        self.assertEqual(scheduler.next_due(), 45)
+
+    def test_start_spreads_jobs_by_offset(self):
+        scheduler = self._scheduler(JobPlan("a", {}, offset=30), JobPlan("b", {}, offset=5))
+        scheduler.start(now=100)
+
+        self.assertEqual([plan.name for plan in scheduler.pop_due(110)], ["b"])
+        self.assertEqual(scheduler.next_due(), 130)
+
+    def test_due_jobs_wait_for_a_free_worker(self):
+        scheduler = Scheduler(
+            [JobPlan(name, {}, interval=10) for name in ("a", "b", "c")],
+            run_job=lambda config: True,
+            max_workers=2,
+        )
+        scheduler.start(now=0)
+
+        self.assertEqual([plan.name for plan in scheduler.pop_due(0)], ["a", "b"])
+        self.assertEqual(scheduler.pop_due(1), [])
+        scheduler.complete("a", 2)
+        self.assertEqual([plan.name for plan in scheduler.pop_due(2)], ["c"])
+
+    def test_update_plans_applies_diff_by_job_name(self):
+        scheduler = self._scheduler(
+            JobPlan("keep", {"url": "a"}, interval=100),
+            JobPlan("edit", {"url": "b"}, interval=100),
+            JobPlan("drop", {"url": "c"}, interval=100),
+            JobPlan("busy", {"url": "d"}, interval=100),
+        )
+        scheduler.start(now=0)
+        scheduler.pop_due(0)
+        for name in ("keep", "edit", "drop"):
+            scheduler.complete(name, 1)
+
+        added, removed, changed = scheduler.update_plans(
+            [
+                JobPlan("keep", {"url": "a"}, interval=100),
+                JobPlan("edit", {"url": "b2"}, interval=100, offset=7),
+                JobPlan("busy", {"url": "d"}, interval=30),
+                JobPlan("new", {"url": "e"}, interval=100, offset=3),
+            ],
+            now=50,
+        )
+
+        self.assertEqual((added, removed, changed), (["new"], ["drop"], ["edit", "busy"]))
+        self.assertEqual([plan.name for plan in scheduler.pop_due(99)], ["new", "edit"])
+        self.assertEqual([plan.name for plan in scheduler.pop_due(200)], ["keep"])
+        scheduler.complete("busy", 60)
+        self.assertEqual(scheduler.next_due(), 60)
+
+    def test_job_removed_and_re_added_while_running_is_requeued(self):
+        scheduler = self._scheduler(JobPlan("job", {"url": "a"}, interval=100, offset=5))
+        scheduler.start(now=0)
+        scheduler.pop_due(5)
+
+        scheduler.update_plans([], now=10)
+        scheduler.update_plans([JobPlan("job", {"url": "a"}, interval=100, offset=5)], now=20)
+        self.assertEqual(scheduler.next_due(), None)
+        scheduler.complete("job", 30)
+
+        self.assertEqual(scheduler.next_due(), 35)
+
+    @patch("src.jobs.runner.create_job")
+    def test_reload_cancels_runs_of_removed_and_changed_jobs(self, create_job):
+        started = {name: threading.Event() for name in ("drop", "edit", "keep")}
+        release = threading.Event()
+        reasons = {}
+
+        def make_job(config):
+            def run(context):
+                started[config["name"]].set()
+                while not context.cancelled and not release.wait(0.01):
+                    pass
+                reasons[config["name"]] = context.cancel_token.reason if context.cancelled else ""
+                return JobResult(name=config["name"], success=True)
+
+            job = MagicMock()
+            job.name = config["name"]
+            job.run.side_effect = run
+            return job
+
+        create_job.side_effect = make_job
+        plans = [JobPlan(name, {"name": name, "url": name}, interval=100) for name in started]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner = JobRunner(temp_dir)
+            scheduler = Scheduler(
+                plans, lambda config: runner.run_jobs([config]), max_workers=3, clock=lambda: 10, rng=lambda: 0.5
+            )
+            scheduler.start(now=0)
+            threads = [threading.Thread(target=scheduler._execute, args=(plan,)) for plan in scheduler.pop_due(0)]
+            for thread in threads:
+                thread.start()
+            for event in started.values():
+                self.assertTrue(event.wait(2))
+
+            scheduler.update_plans(
+                [
+                    JobPlan("edit", {"name": "edit", "url": "edit2"}, interval=100, offset=7),
+                    JobPlan("keep", {"name": "keep", "url": "keep"}, interval=30),
+                ],
+                now=10,
+            )
+            release.set()
+            for thread in threads:
+                thread.join(2)
+
+        self.assertEqual(reasons, {"drop": "配置中已移除", "edit": "配置已变更", "keep": ""})
+        self.assertEqual(scheduler.next_due(), 17)
+        self.assertEqual([plan.name for plan in scheduler.pop_due(30)], ["edit", "keep"])
+
+    def test_schedule_only_change_replans_from_now(self):
+        scheduler = self._scheduler(JobPlan("job", {"url": "a"}, interval=3600))
+        scheduler.start(now=0)
+        scheduler.pop_due(0)
+        scheduler.complete("job", 1)
+
+        scheduler.update_plans([JobPlan("job", {"url": "a"}, interval=600)], now=100)
+        self.assertEqual(scheduler.next_due(), 700)
+
+    def test_jitter_is_added_to_later_runs(self):
+        scheduler = self._scheduler(JobPlan("job", {}, interval=10, jitter=4))
+        scheduler.start(now=0)
+        self.assertEqual(scheduler.next_due(), 0)
+        scheduler.pop_due(0)
+        scheduler.complete("job", 1)
+
+        self.assertEqual(scheduler.next_due(), 12)
+
+    def test_run_forever_executes_jobs_in_worker_threads(self):
+        runs = []
+        done = threading.Event()
+
+        def run_job(config):
+            runs.append(config["name"])
+            if len(runs) >= 3:
+                done.set()
+
+        scheduler = Scheduler([JobPlan("job", {"name": "job"}, interval=0.01)], run_job)
+        thread = threading.Thread(target=scheduler.run_forever)
+        thread.start()
+        finished = done.wait(timeout=5)
+        scheduler.stop()
+        thread.join(timeout=5)
+
+        self.assertTrue(finished)
+        self.assertFalse(thread.is_alive())
+        self.assertGreaterEqual(runs.count("job"), 3)
+
+
+class AdaptiveIntervalTests(unittest.TestCase):
+    policy = AdaptivePolicy(min_interval=60, max_interval=400, backoff=2)
+
+    def test_quiet_feeds_back_off_and_changes_reset(self):
+        intervals = AdaptiveIntervals()
+        delays = [intervals.observe("job", self.policy, fingerprint, now=0) for fingerprint in ("a", "a", "a", "a", "a")]
+        self.assertEqual(delays, [60, 120, 240, 400, 400])
+
+        self.assertEqual(intervals.observe("job", self.policy, None, now=0), 400)
+        self.assertEqual(intervals.observe("job", self.policy, "b", now=0), 60)
+
+    def test_state_survives_restart(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "schedule.json"
+            first = AdaptiveIntervals(path)
+            first.observe("job", self.policy, "a", now=1000)
+            first.observe("job", self.policy, "a", now=1100)
+
+            restored = AdaptiveIntervals(path)
+            self.assertEqual(restored.resume_at("job"), 1220)
+            self.assertEqual(restored.observe("job", self.policy, "a", now=1300), 240)
+
+            scheduler = Scheduler([JobPlan("job", {}, adaptive=self.policy)], lambda config: None, adaptive=AdaptiveIntervals(path))
+            scheduler.start(now=1400)
+            self.assertEqual(scheduler.next_due(), 1540)
+
+    def test_scheduler_uses_run_result_as_fingerprint(self):
+        scheduler = Scheduler([JobPlan("job", {}, adaptive=self.policy)], lambda config: None)
+        scheduler.start(now=0)
+        scheduler.pop_due(0)
+        scheduler.complete("job", 5, "a")
+        self.assertEqual(scheduler.next_due(), 65)
+        scheduler.pop_due(65)
+        scheduler.complete("job", 70, "a")
+        self.assertEqual(scheduler.next_due(), 190)
+
+    def test_item_fingerprint_ignores_build_time(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            def write(links):
+                generator = RSSGenerator("T", "https://example.com", "D")
+                generator.add_items([{"title": link, "link": link} for link in links])
+                generator.generate(str(Path(temp_dir) / "feed.xml"))
+                return item_fingerprint(temp_dir, {"output": "feed.xml"})
+
+            first = write(["https://example.com/1"])
+            self.assertEqual(write(["https://example.com/1"]), first)
+            self.assertNotEqual(write(["https://example.com/1", "https://example.com/2"]), first)
+            self.assertIsNone(item_fingerprint(temp_dir, {"output": "missing.xml"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
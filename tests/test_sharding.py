@@ -0,0 +1,89 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.sharding import MANIFEST_DIR, Shard, export_shard, merge_manifests, shard_for, snapshot_files, write_manifest
+
+
+class ShardTests(unittest.TestCase):
+    def test_parse_validates_index_and_count(self):
+        self.assertEqual(Shard.parse("2/4"), Shard(2, 4))
+        for text in ("0/4", "5/4", "1/0", "1", "a/b"):
+            with self.assertRaises(ValueError):
+                Shard.parse(text)
+
+    def test_every_enabled_job_lands_in_exactly_one_shard(self):
+        jobs = [{"type": "demo", "name": f"job-{index}"} for index in range(40)]
+        jobs.append({"type": "demo", "name": "off", "enabled": False})
+
+        selected = [job["name"] for index in range(1, 5) for job in Shard(index, 4).select(jobs)]
+
+        self.assertCountEqual(selected, [f"job-{index}" for index in range(40)])
+        self.assertTrue(all(len(Shard(index, 4).select(jobs)) > 0 for index in range(1, 5)))
+        self.assertEqual(shard_for("job-7", 4), shard_for("job-7", 4))
+
+
+class MergeTests(unittest.TestCase):
+    def _run_shard(self, root: Path, shard: Shard, files: dict[str, str], results: dict[str, bool]):
+        before = snapshot_files(root)
+        for name, text in files.items():
+            (root / name).write_text(text, encoding="utf-8")
+        write_manifest(root, shard, results, before)
+
+    def test_merge_combines_results_and_removes_manifests(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "old.xml").write_text("untouched", encoding="utf-8")
+            self._run_shard(root, Shard(1, 2), {"a.xml": "a"}, {"A": True})
+            self._run_shard(root, Shard(2, 2), {"b.xml": "b"}, {"B": True})
+
+            manifest = json.loads((root / MANIFEST_DIR / "shard-2-of-2.json").read_text(encoding="utf-8"))
+            self.assertEqual(list(manifest["files"]), ["b.xml"])
+
+            report = merge_manifests(root)
+            self.assertTrue(report.ok)
+            self.assertEqual(report.results, {"A": True, "B": True})
+            self.assertFalse((root / MANIFEST_DIR).exists())
+            self.assertIsNone(merge_manifests(root))
+
+    def test_merge_reports_missing_shards_and_overwritten_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            self._run_shard(root, Shard(1, 3), {"a.xml": "a"}, {"A": True})
+            self._run_shard(root, Shard(2, 3), {"a.xml": "other"}, {"B": False})
+
+            report = merge_manifests(root)
+
+        self.assertFalse(report.ok)
+        self.assertEqual(report.missing_shards, [3])
+        self.assertEqual(report.results, {"A": True, "B": False})
+        self.assertTrue(any("a.xml" in problem for problem in report.problems))
+
+    def test_exported_shards_merge_onto_published_tree(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp = Path(temp_dir)
+            published = {"a.xml": "old a", "b.xml": "old b", "a-archive-1.xml": "archive"}
+            roots = [temp / "publish", temp / "shard-1", temp / "shard-2"]
+            for root in roots:
+                root.mkdir()
+                for seeded, content in published.items():
+                    (root / seeded).write_text(content, encoding="utf-8")
+            publish_root = roots[0]
+            for index, (name, text) in enumerate([("a.xml", "new a"), ("b.xml", "new b")], start=1):
+                root = roots[index]
+                before = snapshot_files(root)
+                (root / name).write_text(text, encoding="utf-8")
+                manifest = write_manifest(root, Shard(index, 2), {name: True}, before)
+                self.assertEqual(export_shard(root, manifest, publish_root), 1)
+
+            report = merge_manifests(publish_root)
+
+            self.assertTrue(report.ok, report.problems)
+            self.assertEqual((publish_root / "a.xml").read_text(encoding="utf-8"), "new a")
+            self.assertEqual((publish_root / "b.xml").read_text(encoding="utf-8"), "new b")
+            self.assertTrue((publish_root / "a-archive-1.xml").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
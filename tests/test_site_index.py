@@ -214,6 +214,57 @@ class SiteIndexTests(unittest.TestCase):
         self.assertIn(">Source</a>", html)
         self.assertIn("Source unavailable", html)
 
+    def test_generate_site_index_expands_multi_output_jobs(self):
+        config = {
+            "jobs": [
+                {
+                    "type": "waymo_blog_tags",
+                    "name": "Waymo Blog",
+                    "catalog": {"section": "blogs"},
+                    "outputs": [
+                        {"tag": "Technology", "output": "waymo_tech.xml", "title": "Waymo Technology"},
+                        {"tag": "Safety", "output": "waymo_safety.xml", "title": "Waymo Safety"},
+                    ],
+                }
+            ]
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            feeds_dir = Path(temp_dir)
+            _write_feed(feeds_dir / "waymo_tech.xml", "Waymo Technology", "Tech posts.")
+            _write_feed(feeds_dir / "waymo_safety.xml", "Waymo Safety", "Safety posts.")
+
+            output_path = generate_site_index(config, str(feeds_dir))
+            html = output_path.read_text(encoding="utf-8")
+
+        blogs_block = html.split('id="section-blogs"', 1)[1].split('id="section-releases"', 1)[0]
+        self.assertIn('href="waymo_tech.xml"', blogs_block)
+        self.assertIn('href="waymo_safety.xml"', blogs_block)
+        self.assertIn("2 live", blogs_block)
+
+    def test_generate_site_index_links_every_generated_format(self):
+        config = {
+            "jobs": [
+                {
+                    "type": "selector_scrape",
+                    "name": "Example",
+                    "output": "example.xml",
+                    "formats": ["rss", "atom", "json"],
+                }
+            ]
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            feeds_dir = Path(temp_dir)
+            _write_feed(feeds_dir / "example.xml", "Example", "Example feed.")
+            (feeds_dir / "example.json").write_text("{}", encoding="utf-8")
+
+            html = generate_site_index(config, str(feeds_dir)).read_text(encoding="utf-8")
+
+        self.assertIn('href="example.xml">RSS</a>', html)
+        self.assertIn('href="example.json">JSON Feed</a>', html)
+        self.assertNotIn('href="example.atom"', html)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,105 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.concurrency import ContextThreadPoolExecutor
+from src.http_client import create_retry_session
+from src.jobs.base import JobResult
+from src.jobs.minimax_news import extract_article_item_from_html
+from src.jobs.runner import JobRunner
+from src.run_report import measure
+from src.tracing import Span, Tracer, span, tracing_scope
+
+
+def _send(_adapter, request, **kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"<html></html>"
+    response.url = request.url
+    response.request = request
+    return response
+
+
+def _parse(index: int):
+    with measure("parse", "extract", index=index):
+        pass
+
+
+class SpanTests(unittest.TestCase):
+    def test_spans_nest_across_helper_threads_and_record_errors(self):
+        tracer = Tracer()
+        with tracing_scope(tracer), span("job", job="demo") as job_span:
+            with ContextThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(_parse, range(2)))
+            with self.assertRaises(ValueError), span("generate"):
+                raise ValueError("boom")
+
+        children = [recorded for recorded in tracer.spans if recorded.parent_id == job_span.span_id]
+        self.assertCountEqual([recorded.name for recorded in children], ["extract", "extract", "generate"])
+        self.assertEqual({recorded.category for recorded in children if recorded.name == "extract"}, {"parse"})
+        self.assertEqual(children[-1].attributes["error"], "ValueError")
+
+    def test_spans_are_not_recorded_without_a_tracer(self):
+        tracer = Tracer()
+        with tracing_scope(tracer), span("run"):
+            pass
+        with span("job") as noop:
+            noop.set(ignored=True)
+
+        self.assertEqual([recorded.name for recorded in tracer.spans], ["run"])
+        self.assertNotIsInstance(noop, Span)
+
+    def test_fetch_and_extract_spans_carry_attributes(self):
+        tracer = Tracer()
+        html = '<html><head><title>Post</title></head><body><p>2024-05-01</p></body></html>'
+        with tracing_scope(tracer), patch.object(HTTPAdapter, "send", _send):
+            create_retry_session().get("https://example.com/news/post")
+            extract_article_item_from_html("https://www.minimax.io/news/post", html)
+
+        by_name = {recorded.name: recorded for recorded in tracer.spans}
+        self.assertEqual(by_name["fetch"].attributes["status"], 200)
+        self.assertEqual(by_name["fetch"].attributes["bytes"], 13)
+        self.assertEqual(by_name["extract"].attributes["extractor"], "minimax.article")
+        self.assertIn("soup", by_name)
+        self.assertEqual(by_name["soup"].parent_id, by_name["extract"].span_id)
+
+
+class ChromeExportTests(unittest.TestCase):
+    @patch("src.jobs.runner.create_job")
+    def test_runner_spans_export_as_chrome_trace_events(self, create_job):
+        fake_job = MagicMock()
+        fake_job.name = "demo"
+        fake_job.run.return_value = JobResult(name="demo", success=True)
+        create_job.return_value = fake_job
+        tracer = Tracer()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with tracing_scope(tracer):
+                JobRunner(temp_dir).run_jobs([{"type": "demo"}])
+            payload = json.loads(tracer.write_chrome(Path(temp_dir) / "trace.json").read_text(encoding="utf-8"))
+
+        events = {event["name"]: event for event in payload["traceEvents"]}
+        self.assertEqual(events["job"]["ph"], "X")
+        self.assertEqual(events["job"]["args"]["job"], "demo")
+        self.assertTrue(events["job"]["args"]["success"])
+        self.assertEqual(events["job"]["args"]["parent_id"], events["run"]["args"]["span_id"])
+        self.assertGreaterEqual(events["job"]["ts"], events["run"]["ts"])
+        self.assertEqual(events["thread_name"]["ph"], "M")
+
+    def test_spans_over_the_limit_are_counted(self):
+        tracer = Tracer(max_spans=1)
+        with tracing_scope(tracer):
+            for _ in range(3):
+                with span("fetch"):
+                    pass
+
+        self.assertEqual((len(tracer.spans), tracer.dropped), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src import metrics
+from src.jobs.base import JobContext
+from src.jobs.waymo_blog import WaymoBlogTagsJob, index_posts_by_tag
+
+POSTS = {
+    "posts": [
+        {"title": "Lidar", "url": "/blog/lidar", "date": "2026-02-01", "tags": ["Technology"]},
+        {"title": "Safety report", "url": "/blog/safety", "date": "2026-02-03", "tags": ["Safety", "Technology"]},
+        {"title": "Phoenix", "url": "/blog/phoenix", "date": "2026-01-20", "tags": ["Community"]},
+    ]
+}
+
+
+def _response(status_code, payload=None, etag=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = json.dumps(payload) if payload is not None else ""
+    response.headers = {"ETag": etag} if etag else {}
+    return response
+
+
+class WaymoBlogTagsJobTests(unittest.TestCase):
+    config = {
+        "type": "waymo_blog_tags",
+        "name": "Waymo Blog",
+        "outputs": [
+            {"tag": "Technology", "output": "waymo_tech.xml", "title": "Waymo Technology"},
+            {"tag": "Safety", "output": "waymo_safety.xml", "title": "Waymo Safety"},
+        ],
+    }
+
+    def _run(self, temp_dir, session):
+        context = JobContext(feeds_dir=Path(temp_dir) / "feeds", state_dir=Path(temp_dir) / "state")
+        context.feeds_dir.mkdir(exist_ok=True)
+        with patch("src.jobs.waymo_blog._create_session", return_value=session):
+            return WaymoBlogTagsJob(self.config).run(context)
+
+    def test_index_posts_by_tag_only_tracks_requested_tags(self):
+        index = index_posts_by_tag(POSTS["posts"], ["Technology", "Safety"])
+        self.assertEqual([post["title"] for post in index["Technology"]], ["Lidar", "Safety report"])
+        self.assertEqual([post["title"] for post in index["Safety"]], ["Safety report"])
+        self.assertNotIn("Community", index)
+
+    def test_single_api_call_writes_one_feed_per_tag(self):
+        session = MagicMock()
+        session.get.return_value = _response(200, POSTS, etag='"v1"')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self._run(temp_dir, session)
+            feeds_dir = Path(temp_dir) / "feeds"
+            tech_links = [item.findtext("link") for item in ET.parse(feeds_dir / "waymo_tech.xml").iter("item")]
+            safety_links = [item.findtext("link") for item in ET.parse(feeds_dir / "waymo_safety.xml").iter("item")]
+
+        self.assertTrue(result.success)
+        session.get.assert_called_once()
+        self.assertEqual(
+            sorted(tech_links),
+            ["https://waymo.com/blog/lidar", "https://waymo.com/blog/safety"],
+        )
+        self.assertEqual(safety_links, ["https://waymo.com/blog/safety"])
+
+    def test_outputs_without_tag_are_reported_and_fail_the_job(self):
+        session = MagicMock()
+        session.get.return_value = _response(200, POSTS)
+        config = {**self.config, "outputs": [*self.config["outputs"], {"tga": "Community", "output": "waymo_community.xml"}]}
+
+        with tempfile.TemporaryDirectory() as temp_dir, self.assertLogs("src.jobs.waymo_blog", level="ERROR") as logs:
+            context = JobContext(feeds_dir=Path(temp_dir) / "feeds", state_dir=Path(temp_dir) / "state")
+            context.feeds_dir.mkdir()
+            with patch("src.jobs.waymo_blog._create_session", return_value=session):
+                result = WaymoBlogTagsJob(config).run(context)
+            written = sorted(path.name for path in context.feeds_dir.iterdir())
+
+        self.assertFalse(result.success)
+        self.assertIn("outputs[2] 缺少 tag", result.details)
+        self.assertIn("outputs[2] 缺少 tag", logs.output[0])
+        self.assertEqual(written, ["waymo_safety.xml", "waymo_tech.xml"])
+
+    def test_not_modified_response_skips_generation(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_session = MagicMock()
+            first_session.get.return_value = _response(200, POSTS, etag='"v1"')
+            self._run(temp_dir, first_session)
+
+            second_session = MagicMock()
+            second_session.get.return_value = _response(304)
+            result = self._run(temp_dir, second_session)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.details, "未变化")
+        self.assertEqual(second_session.get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+
+    def test_not_modified_response_records_freshness_of_published_feeds(self):
+        metrics.REGISTRY.clear()
+        self.addCleanup(metrics.REGISTRY.clear)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_session = MagicMock()
+            first_session.get.return_value = _response(200, POSTS, etag='"v1"')
+            self._run(temp_dir, first_session)
+            os.utime(Path(temp_dir) / "feeds" / "waymo_tech.xml", (1_700_000_000, 1_700_000_000))
+            # 新进程：之前生成时记录的指标不在。
+            metrics.REGISTRY.clear()
+
+            second_session = MagicMock()
+            second_session.get.return_value = _response(304)
+            self._run(temp_dir, second_session)
+
+        newest = int(datetime(2026, 2, 3, tzinfo=timezone.utc).timestamp())
+        text = metrics.REGISTRY.render()
+        self.assertIn(f'rss_feed_newest_item_timestamp_seconds{{feed="waymo_tech.xml"}} {newest}\n', text)
+        self.assertIn('rss_feed_last_build_timestamp_seconds{feed="waymo_tech.xml"} 1700000000\n', text)
+        self.assertIn('rss_feed_items{feed="waymo_safety.xml"} 1\n', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.work_queue import RedisWorkQueue, SQLiteWorkQueue, Worker, open_work_queue
+
+
+class FakeRedis:
+    """In-memory stand-in for the handful of redis-py commands the queue uses."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.data = {}
+        self.expires = {}
+
+    def _get(self, key, default):
+        if key in self.expires and self.expires[key] <= self.now:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.setdefault(key, default) if default is not None else self.data.get(key)
+
+    def sadd(self, key, member):
+        members = self._get(key, set())
+        added = member not in members
+        members.add(member)
+        return int(added)
+
+    def srem(self, key, member):
+        self._get(key, set()).discard(member)
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def hset(self, key, mapping):
+        self._get(key, {}).update({name: str(value) for name, value in mapping.items()})
+
+    def hgetall(self, key):
+        return dict(self.data.get(key) or {})
+
+    def hincrby(self, key, field, amount):
+        values = self._get(key, {})
+        values[field] = str(int(values.get(field, 0)) + amount)
+        return int(values[field])
+
+    def zadd(self, key, mapping, xx=False):
+        scores = self._get(key, {})
+        for member, score in mapping.items():
+            if not xx or member in scores:
+                scores[member] = score
+
+    def zrangebyscore(self, key, low, high, start=0, num=None):
+        members = sorted((score, member) for member, score in self._get(key, {}).items() if score <= high)
+        return [member for _, member in members][start : None if num is None else start + num]
+
+    def zrem(self, key, member):
+        self._get(key, {}).pop(member, None)
+
+    def zcard(self, key):
+        return len(self._get(key, {}))
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and self._get(key, None) is not None:
+            return None
+        self.data[key] = value
+        if px is not None:
+            self.expires[key] = self.now + px / 1000
+        return True
+
+    def get(self, key):
+        return self._get(key, None)
+
+    def pexpire(self, key, px):
+        self.expires[key] = self.now + px / 1000
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+
+    def rpush(self, key, value):
+        self._get(key, []).append(value)
+
+    def lpop(self, key):
+        values = self._get(key, [])
+        return values.pop(0) if values else None
+
+    def register_script(self, script):
+        assert "SADD" in script and "ZADD" in script
+        return self._enqueue
+
+    def _enqueue(self, keys, args):
+        # 与 _REDIS_ENQUEUE 相同的步骤；fake 单线程执行，天然原子。
+        active, seq, ready = keys
+        name, config, now, task_prefix = args
+        if not self.sadd(active, name):
+            return 0
+        task_id = str(self.incr(seq))
+        self.hset(task_prefix + task_id, mapping={"name": name, "config": config, "attempts": 0})
+        self.zadd(ready, {task_id: now})
+        return 1
+
+
+class QueueContract:
+    """Behaviour shared by every backend; subclasses provide ``make_queue`` and ``advance``."""
+
+    def make_queue(self, **options):
+        raise NotImplementedError
+
+    def advance(self, now):
+        pass
+
+    def test_enqueue_is_deduplicated_until_the_task_finishes(self):
+        queue = self.make_queue()
+        self.assertTrue(queue.enqueue("A", {"name": "A"}, now=0))
+        self.assertFalse(queue.enqueue("A", {"name": "A"}, now=1))
+
+        task = queue.lease("w1", now=1)
+        self.assertEqual((task.name, task.config, task.attempts), ("A", {"name": "A"}, 1))
+        self.assertIsNone(queue.lease("w2", now=1))
+        self.assertTrue(queue.complete(task, "w1", True, now=2))
+
+        self.assertEqual([(result.name, result.success, result.worker) for result in queue.drain_results()], [("A", True, "w1")])
+        self.assertEqual(queue.drain_results(), [])
+        self.assertEqual(queue.pending(), 0)
+        self.assertTrue(queue.enqueue("A", {"name": "A"}, now=3))
+
+    def test_expired_lease_is_taken_over_and_stale_result_ignored(self):
+        queue = self.make_queue(lease_seconds=10)
+        queue.enqueue("A", {}, now=0)
+        first = queue.lease("w1", now=0)
+
+        self.advance(5)
+        self.assertTrue(queue.heartbeat(first, "w1", now=5))
+        self.advance(12)
+        self.assertIsNone(queue.lease("w2", now=12))
+
+        self.advance(16)
+        second = queue.lease("w2", now=16)
+        self.assertEqual((second.name, second.attempts), ("A", 2))
+        self.assertFalse(queue.heartbeat(first, "w1", now=16))
+        self.assertFalse(queue.complete(first, "w1", True, now=17))
+        self.assertTrue(queue.complete(second, "w2", True, now=17))
+        self.assertEqual([result.worker for result in queue.drain_results()], ["w2"])
+
+    def test_failures_are_retried_with_backoff_then_reported(self):
+        queue = self.make_queue(max_attempts=2, retry_delay=30)
+        queue.enqueue("A", {}, now=0)
+
+        task = queue.lease("w1", now=0)
+        queue.complete(task, "w1", False, "boom", now=1)
+        self.assertIsNone(queue.lease("w1", now=20))
+        self.assertEqual(queue.drain_results(), [])
+
+        self.advance(31)
+        task = queue.lease("w1", now=31)
+        self.assertEqual(task.attempts, 2)
+        queue.complete(task, "w1", False, "boom", now=32)
+
+        results = queue.drain_results()
+        self.assertEqual([(result.success, result.details, result.attempts) for result in results], [(False, "boom", 2)])
+        self.assertEqual(queue.pending(), 0)
+
+
+class SQLiteWorkQueueTests(QueueContract, unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "queue.sqlite3"
+
+    def make_queue(self, **options):
+        queue = SQLiteWorkQueue(self.path, **options)
+        self.addCleanup(queue.close)
+        return queue
+
+    def test_queue_is_shared_between_connections(self):
+        producer, consumer = self.make_queue(), self.make_queue()
+        producer.enqueue("A", {"url": "https://example.com"}, now=0)
+
+        task = consumer.lease("w1", now=0)
+        self.assertEqual(task.config, {"url": "https://example.com"})
+        self.assertIsNone(producer.lease("w2", now=0))
+
+    def test_open_work_queue_defaults_to_state_dir(self):
+        queue = open_work_queue({"queue": {"lease_seconds": 60}}, self.path.parent)
+        self.addCleanup(queue.close)
+        self.assertEqual((queue.path, queue.lease_seconds), (self.path, 60))
+        with self.assertRaises(ValueError):
+            open_work_queue({"queue": {"backend": "kafka"}}, self.path.parent)
+
+
+class RedisWorkQueueTests(QueueContract, unittest.TestCase):
+    def make_queue(self, **options):
+        self.client = FakeRedis()
+        return RedisWorkQueue(self.client, **options)
+
+    def advance(self, now):
+        self.client.now = now
+
+    def test_enqueue_is_one_server_side_script(self):
+        client = MagicMock()
+        client.register_script.return_value.return_value = 1
+        queue = RedisWorkQueue(client, prefix="rss:queue")
+
+        self.assertTrue(queue.enqueue("A", {"name": "A"}, now=5))
+
+        client.register_script.return_value.assert_called_once_with(
+            keys=["rss:queue:active", "rss:queue:seq", "rss:queue:ready"],
+            args=["A", '{"name": "A"}', 5, "rss:queue:task:"],
+        )
+        for command in ("sadd", "incr", "hset", "zadd"):
+            getattr(client, command).assert_not_called()
+
+
+class WorkerTests(unittest.TestCase):
+    def test_worker_drains_queue_and_reports_results(self):
+        client = FakeRedis()
+        queue = RedisWorkQueue(client)
+        for name in ("A", "B"):
+            queue.enqueue(name, {"name": name}, now=0)
+        runs = []
+
+        def run_job(config):
+            runs.append(config["name"])
+            if config["name"] == "B":
+                raise RuntimeError("boom")
+            return True, ""
+
+        Worker(queue, run_job, worker_id="w1").run(drain=True)
+
+        self.assertEqual(runs, ["A", "B"])
+        self.assertEqual([result.name for result in queue.drain_results()], ["A"])
+        self.assertEqual(queue.pending(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()